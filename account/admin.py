@@ -97,6 +97,7 @@ class UserAdmin(BaseUserAdmin):
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ("user",)
+    list_select_related = ("user",)
     search_fields = ("user__email",)
     formfield_overrides = {
         models.TextField: {"widget": Textarea(attrs={"rows": 3})},
@@ -87,6 +87,8 @@ class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     address = models.TextField(blank=True)
     profile_picture = models.ImageField(upload_to="profiles/", null=True, blank=True)
+    # Precomputed URLs of profile_picture and its resized copies (see core.imaging)
+    profile_picture_sizes = models.JSONField(default=dict, blank=True, editable=False)
     
     # Attach optimized manager
     objects = ProfileManager()
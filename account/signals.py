@@ -1,5 +1,6 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from core.imaging import queue_derivatives
 from .models import Profile, User 
 
 @receiver(post_save, sender=User)
@@ -14,4 +15,10 @@ def save_user_profile(sender, instance, **kwargs):
         instance.profile.save()
     except Profile.DoesNotExist:
         # If the profile is missing, create it now
-        Profile.objects.create(user=instance)
\ No newline at end of file
+        Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Profile)
+def resize_profile_picture(sender, instance, **kwargs):
+    # Generates avatar-sized copies in the background after a new upload
+    queue_derivatives(instance, "profile_picture", "profile_picture_sizes")
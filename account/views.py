@@ -1,3 +1,5 @@
+import logging
+
 from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
@@ -17,6 +19,9 @@ from django.core.mail import send_mail
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from core.settings import get_env_variable
+from core.media import file_url
+
+logger = logging.getLogger(__name__)
 
 
 # In views.py
@@ -50,8 +55,11 @@ class SignInView(APIView):
                     "profile": {
                         "address": profile.address if profile else "",
                         "profile_picture": (
-                            profile.profile_picture.url
-                            if profile and profile.profile_picture
+                            file_url(
+                                profile.profile_picture,
+                                profile.profile_picture_sizes,
+                            )
+                            if profile
                             else None
                         ),
                     },
@@ -61,11 +69,16 @@ class SignInView(APIView):
             return Response(response_data, status=status.HTTP_200_OK)
 
         except Exception as e:
-            # 3. Print the actual failure reason
-            print(f"Login Failed: {e}")
-            # If it's a validation error, print the details
-            if hasattr(e, "detail"):
-                print(f"Error Detail: {e.detail}")
+            # 3. Log the actual failure reason (never the submitted password)
+            logger.warning(
+                "Login failed: %s",
+                e,
+                extra={
+                    "email": request.data.get("email"),
+                    "error_type": type(e).__name__,
+                    "detail": getattr(e, "detail", None),
+                },
+            )
 
             return Response(
                 {"error": "Invalid email or password"},
@@ -0,0 +1,358 @@
+import hashlib
+import hmac
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from importlib import import_module
+
+import django
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.settings import get_env_variable
+from documents.models import Document
+from investment import roi
+from investment.models import ClientInvestment, ProjectPricing
+from notification.models import Notification
+from payment.models import MonthlyCollection
+
+from .seed import PASSWORD, bench_staff, bench_users
+
+# -------------------------------------------------------------------------
+# Load Driver
+# -------------------------------------------------------------------------
+# Requests go through django.test.Client, i.e. the full middleware + view
+# stack in-process, with no network, so the numbers are reproducible offline.
+# Every route in ROUTE_MODULES must have a scenario; routes without one are
+# reported as "missing" so new endpoints don't silently escape the report.
+# A route may have several scenarios: keys after the first add a query
+# string to the route pattern ("reports/collections/?project=<id>").
+
+ROUTE_MODULES = [
+    "account.urls",
+    "investment.urls",
+    "payment.urls",
+    "notification.urls",
+    "documents.urls",
+]
+API_PREFIX = "/api/"
+
+# Small but valid PDF body for download scenarios
+SAMPLE_PDF = b"%PDF-1.4\n" + b"0" * (16 * 1024) + b"\n%%EOF\n"
+
+
+def discover_routes():
+    routes = []
+    for module in ROUTE_MODULES:
+        for pattern in import_module(module).urlpatterns:
+            routes.append(str(pattern.pattern))
+    return routes
+
+
+def scenario_route(key):
+    """Route pattern a SCENARIOS key belongs to (the key minus any query string)."""
+    return key.partition("?")[0]
+
+
+def scenarios_for(route):
+    """SCENARIOS keys for a route pattern, the plain one first."""
+    return [key for key in SCENARIOS if scenario_route(key) == route]
+
+
+class Context:
+    """Objects the scenarios need, resolved once from the seeded data."""
+
+    def __init__(self):
+        self.user = bench_users().order_by("pk").first()
+        self.access = str(RefreshToken.for_user(self.user).access_token)
+        self.refresh = str(RefreshToken.for_user(self.user))
+        # An investment with unpaid installments, so the webhook has work to do
+        self.investment = (
+            ClientInvestment.objects.filter(user=self.user)
+            .exclude(status="completed")
+            .order_by("pk")
+            .first()
+        )
+        # A fully paid investment for the ROI projection, preferably in a project
+        # that pays ROI (otherwise there is no payout series to compute)
+        settled = ClientInvestment.objects.filter(
+            user=self.user, status__in=roi.PROJECTABLE_STATUSES
+        ).order_by("pk")
+        self.settled_investment = (
+            settled.exclude(selected_option__project__investment_type__in=roi.NO_ROI_TYPES).first()
+            or settled.first()
+        )
+        self.pricing = ProjectPricing.objects.filter(project__active=True).first()
+        self.notification = Notification.objects.filter(user=self.user).first()
+        self.document = Document.objects.filter(user=self.user).first()
+        # A project with collection rollups, for the ?project= report filter
+        self.collection_project_id = (
+            MonthlyCollection.objects.order_by("pk").values_list("project_id", flat=True).first()
+        )
+        self.uid = urlsafe_base64_encode(force_bytes(self.user.pk))
+        self.webhook_secret = get_env_variable("PAYSTACK_SECRET_KEY", "fallback-secret")
+        self.staff_access = str(RefreshToken.for_user(bench_staff()).access_token)
+
+    def fresh_user(self):
+        return type(self.user).objects.get(pk=self.user.pk)
+
+    @property
+    def auth(self):
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+
+    @property
+    def staff_auth(self):
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.staff_access}"}
+
+
+def _webhook(ctx, i):
+    body = json.dumps(
+        {
+            "event": "charge.success",
+            "data": {
+                "reference": f"BENCH-WEBHOOK-{time.time_ns()}-{i}",
+                "amount": 100000,
+                "customer": {"email": ctx.user.email},
+                "metadata": {"investment_id": ctx.investment.pk},
+            },
+        }
+    ).encode()
+    signature = hmac.new(ctx.webhook_secret.encode(), body, hashlib.sha512).hexdigest()
+    return {
+        "data": body,
+        "content_type": "application/json",
+        "HTTP_X_PAYSTACK_SIGNATURE": signature,
+    }
+
+
+# route pattern -> (method, path builder, request kwargs builder)
+SCENARIOS = {
+    # account
+    "token/refresh/": ("post", lambda c, i: "token/refresh/", lambda c, i: {"data": {"refresh": c.refresh}}),
+    "token/": ("post", lambda c, i: "token/", lambda c, i: {"data": {"email": c.user.email, "password": PASSWORD}}),
+    "signup/": (
+        "post",
+        lambda c, i: "signup/",
+        lambda c, i: {
+            "data": {
+                "email": f"signup-{time.time_ns()}-{i}@bench.local",
+                "first_name": "Bench",
+                "last_name": "Signup",
+                "password": PASSWORD,
+                "password_confirm": PASSWORD,
+            }
+        },
+    ),
+    "signin/": ("post", lambda c, i: "signin/", lambda c, i: {"data": {"email": c.user.email, "password": PASSWORD}}),
+    "profile/": ("get", lambda c, i: "profile/", lambda c, i: c.auth),
+    "password-reset/": ("post", lambda c, i: "password-reset/", lambda c, i: {"data": {"email": c.user.email}}),
+    "reset-password/<uidb64>/<token>/": (
+        "post",
+        # Token must be built from the current password hash, which changes each run
+        lambda c, i: f"reset-password/{c.uid}/{default_token_generator.make_token(c.fresh_user())}/",
+        lambda c, i: {"data": {"password": PASSWORD, "password_confirm": PASSWORD}},
+    ),
+    # investment
+    "investments/": ("get", lambda c, i: "investments/", lambda c, i: {}),
+    "investments/create/": (
+        "post",
+        lambda c, i: "investments/create/",
+        lambda c, i: {"data": {"pricing_id": c.pricing.pk}, **c.auth},
+    ),
+    "client-investments/": ("get", lambda c, i: "client-investments/", lambda c, i: c.auth),
+    "client-investments/<int:pk>/": (
+        "get",
+        lambda c, i: f"client-investments/{c.investment.pk}/",
+        lambda c, i: c.auth,
+    ),
+    "client-investments/<int:pk>/roi/": (
+        "get",
+        lambda c, i: f"client-investments/{c.settled_investment.pk}/roi/",
+        lambda c, i: c.auth,
+    ),
+    "dashboard/summary/": ("get", lambda c, i: "dashboard/summary/", lambda c, i: c.auth),
+    "exports/client-investments.<str:fmt>": (
+        "get",
+        lambda c, i: "exports/client-investments.csv",
+        lambda c, i: c.staff_auth,
+    ),
+    "exports/payment-schedules.<str:fmt>": (
+        "get",
+        lambda c, i: "exports/payment-schedules.xlsx",
+        lambda c, i: c.staff_auth,
+    ),
+    # payment
+    "webhooks/paystack/": ("post", lambda c, i: "webhooks/paystack/", _webhook),
+    "transactions/": ("get", lambda c, i: "transactions/", lambda c, i: c.auth),
+    "transactions/stats/": ("get", lambda c, i: "transactions/stats/", lambda c, i: c.auth),
+    "reports/collections/": ("get", lambda c, i: "reports/collections/", lambda c, i: c.staff_auth),
+    "reports/collections/?project=<id>": (
+        "get",
+        lambda c, i: f"reports/collections/?project={c.collection_project_id}",
+        lambda c, i: c.staff_auth,
+    ),
+    "exports/transactions.<str:fmt>": (
+        "get",
+        lambda c, i: "exports/transactions.csv",
+        lambda c, i: c.staff_auth,
+    ),
+    # notification
+    "notifications/": ("get", lambda c, i: "notifications/", lambda c, i: c.auth),
+    "notifications/<int:pk>/read/": (
+        "post",
+        lambda c, i: f"notifications/{c.notification.pk}/read/",
+        lambda c, i: c.auth,
+    ),
+    "notifications/read-all/": ("post", lambda c, i: "notifications/read-all/", lambda c, i: c.auth),
+    "header-data/": ("get", lambda c, i: "header-data/", lambda c, i: c.auth),
+    # documents
+    "documents/": ("get", lambda c, i: "documents/", lambda c, i: c.auth),
+    "documents/stats/": ("get", lambda c, i: "documents/stats/", lambda c, i: c.auth),
+    "documents/<int:pk>/download/": (
+        "get",
+        lambda c, i: f"documents/{c.document.pk}/download/",
+        lambda c, i: c.auth,
+    ),
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile (no interpolation, stable across runs)."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _measure(client, ctx, key, iterations, warmup):
+    method, path_for, kwargs_for = SCENARIOS[key]
+    send = getattr(client, method)
+
+    timings, statuses = [], {}
+    for i in range(warmup + iterations):
+        path = API_PREFIX + path_for(ctx, i)
+        kwargs = kwargs_for(ctx, i)
+        started = time.perf_counter()
+        response = send(path, **kwargs)
+        # Drain streaming bodies so download time is included
+        if getattr(response, "streaming", False):
+            b"".join(response.streaming_content)
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            timings.append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    total = sum(timings)
+    ordered = sorted(timings)
+    ms = lambda seconds: round(seconds * 1000, 3)  # noqa: E731
+    return {
+        "method": method.upper(),
+        "requests": len(timings),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "p99_ms": ms(percentile(ordered, 99)),
+        "mean_ms": ms(statistics.fmean(ordered)),
+        "max_ms": ms(ordered[-1]),
+        "throughput_rps": round(len(timings) / total, 2) if total else None,
+    }
+
+
+def _write_sample_files(media_root, documents):
+    for document in documents:
+        path = os.path.join(media_root, document.file.name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as handle:
+            handle.write(SAMPLE_PDF)
+
+
+@contextmanager
+def offline_environment():
+    """
+    Local file storage, in-memory mail and no background threads, so runs
+    never touch the network. Yields the temporary MEDIA_ROOT.
+    """
+    with tempfile.TemporaryDirectory() as media_root, override_settings(
+        STORAGES={
+            **settings.STORAGES,
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        },
+        MEDIA_ROOT=media_root,
+        EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        IMAGE_DERIVATIVES_ASYNC=False,
+        ALLOWED_HOSTS=["*"],
+        DEBUG=False,
+    ):
+        yield media_root
+
+
+def prepare_context(media_root):
+    ctx = Context()
+    _write_sample_files(media_root, Document.objects.filter(user=ctx.user))
+    return ctx
+
+
+def run(iterations=50, warmup=5, only=None):
+    """
+    Runs every scenario and returns the report dict.
+    Each route runs inside a transaction that is rolled back afterwards, so
+    write endpoints don't change the dataset between routes or releases
+    (on_commit hooks therefore do not fire during the run).
+    """
+    routes = discover_routes()
+    if only:
+        routes = [route for route in routes if route in only]
+
+    with offline_environment() as media_root:
+        ctx = prepare_context(media_root)
+
+        results, missing = {}, []
+        for route in routes:
+            keys = scenarios_for(route)
+            if not keys:
+                missing.append(route)
+                continue
+            for key in keys:
+                client = Client()
+                with transaction.atomic():
+                    result = _measure(client, ctx, key, iterations, warmup)
+                    transaction.set_rollback(True)
+                results[f"{result['method']} {API_PREFIX}{key}"] = result
+
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "iterations": iterations,
+            "warmup": warmup,
+            "dataset": {
+                "users": bench_users().count(),
+                "investments": ClientInvestment.objects.filter(user__in=bench_users()).count(),
+            },
+        },
+        "missing_scenarios": missing,
+        "routes": results,
+    }
+
+
+def compare(report, baseline):
+    """Yields (route, metric, before, after, change %) for shared routes."""
+    for route, after in report["routes"].items():
+        before = baseline.get("routes", {}).get(route)
+        if not before:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            old, new = before.get(metric), after.get(metric)
+            if old and new is not None:
+                yield route, metric, old, new, round((new - old) / old * 100, 1)
@@ -0,0 +1,87 @@
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from benchmarks.seed import bench_users
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from investment.views import InvestorDashboardView
+from payment.models import Transaction
+from payment.serializers import TransactionSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's JSONRenderer/JSONParser with the orjson ones on dashboard and "
+        "transaction list payloads built from the seeded benchmark data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50, help="Dashboards to render.")
+        parser.add_argument("--rows", type=int, default=5000, help="Transactions in the list payload.")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        users = list(bench_users().order_by("pk")[: options["users"]])
+        if not users:
+            raise CommandError("No benchmark data: run seed_benchmark_data first.")
+
+        # 1. Payloads exactly as the views hand them to the renderer
+        factory = APIRequestFactory()
+        dashboards = []
+        for user in users:
+            request = factory.get("/api/dashboard/summary/")
+            force_authenticate(request, user=user)
+            dashboards.append(InvestorDashboardView.as_view()(request).data)
+
+        request = factory.get("/api/transactions/")
+        transactions = Transaction.objects.select_related(
+            "investment", "investment__selected_option__project"
+        ).order_by("pk")[: options["rows"]]
+        transaction_list = TransactionSerializer(
+            transactions, many=True, context={"request": request}
+        ).data
+
+        payloads = [
+            (f"dashboard x{len(dashboards)}", dashboards),
+            (f"transactions ({len(transaction_list)} rows)", [transaction_list]),
+        ]
+
+        # 2. Same document both ways, then best-of timings
+        self.stdout.write(f"Best of {options['repeat']}")
+        for label, items in payloads:
+            drf = [JSONRenderer().render(item) for item in items]
+            fast = [ORJSONRenderer().render(item) for item in items]
+            if [json.loads(body) for body in drf] != [json.loads(body) for body in fast]:
+                raise CommandError(f"{label}: orjson output differs from JSONRenderer")
+
+            size = sum(len(body) for body in fast)
+            self.stdout.write(f"  {label} ({size / 1024:.0f} KiB)")
+            for step, old, new, inputs in (
+                ("render", JSONRenderer(), ORJSONRenderer(), items),
+                ("parse", JSONParser(), ORJSONParser(), fast),
+            ):
+                old_time = self._best(step, old, inputs, options["repeat"])
+                new_time = self._best(step, new, inputs, options["repeat"])
+                self.stdout.write(
+                    f"    {step:<7} json {old_time * 1000:8.2f} ms   "
+                    f"orjson {new_time * 1000:8.2f} ms   x{old_time / new_time:.1f}"
+                )
+
+    @staticmethod
+    def _best(step, handler, inputs, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for item in inputs:
+                if step == "render":
+                    handler.render(item)
+                else:
+                    handler.parse(io.BytesIO(item))
+            best = min(best, time.perf_counter() - started)
+        return best
@@ -0,0 +1,96 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory
+
+from documents.models import Document
+from documents.serializers import DocumentProjection, DocumentSerializer
+from investment.models import ClientInvestment, PaymentSchedule
+from investment.serializers import (
+    ClientInvestmentProjection,
+    ClientInvestmentSerializer,
+    PaymentScheduleProjection,
+    PaymentScheduleSerializer,
+)
+from payment.models import Transaction
+from payment.serializers import TransactionProjection, TransactionSerializer
+
+# (label, serializer, projection, queryset as the serializer path reads it)
+CASES = [
+    (
+        "transactions",
+        TransactionSerializer,
+        TransactionProjection,
+        lambda: Transaction.objects.select_related(
+            "investment", "investment__selected_option__project"
+        ),
+    ),
+    ("payment schedules", PaymentScheduleSerializer, PaymentScheduleProjection, PaymentSchedule.objects.all),
+    ("documents", DocumentSerializer, DocumentProjection, Document.objects.all),
+    (
+        "client investments",
+        ClientInvestmentSerializer,
+        ClientInvestmentProjection,
+        # What the list view used to send: one next-payment query per row
+        ClientInvestment.objects.all,
+    ),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that every read projection returns exactly what its serializer "
+        "returns on the seeded rows, then time both per 10,000 rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="Rows per model (default: 10000).")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        request = APIRequestFactory().get("/api/")
+        context = {"request": request}
+        rows = options["rows"]
+
+        self.stdout.write(f"Best of {options['repeat']}, times per 10,000 rows")
+        for label, serializer_class, projection_class, queryset in CASES:
+            pks = list(queryset().order_by("pk").values_list("pk", flat=True)[:rows])
+            if not pks:
+                self.stdout.write(f"  {label:<20} no rows (run seed_benchmark_data)")
+                continue
+
+            def serialized():
+                return serializer_class(
+                    queryset().filter(pk__in=pks).order_by("pk"), many=True, context=context
+                ).data
+
+            def projected():
+                return projection_class(context=context).data(
+                    queryset().filter(pk__in=pks).order_by("pk")
+                )
+
+            # 1. Same dicts, same key order
+            expected, actual = serialized(), projected()
+            for old, new in zip(expected, actual):
+                if list(old.items()) != list(new.items()):
+                    raise CommandError(f"{label}: projection differs\n  {dict(old)}\n  {new}")
+            if len(expected) != len(actual):
+                raise CommandError(f"{label}: {len(expected)} serialized vs {len(actual)} projected rows")
+
+            # 2. Timings, scaled to 10k rows
+            scale = 10000 / len(pks)
+            old_time = self._best(serialized, options["repeat"]) * scale
+            new_time = self._best(projected, options["repeat"]) * scale
+            self.stdout.write(
+                f"  {label:<20} serializer {old_time * 1000:8.0f} ms   "
+                f"projection {new_time * 1000:8.0f} ms   x{old_time / new_time:.1f}"
+            )
+
+    @staticmethod
+    def _best(build, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            build()
+            best = min(best, time.perf_counter() - started)
+        return best
@@ -0,0 +1,67 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from benchmarks import querycount
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed data at several sizes in a throwaway test database and fail if any "
+        "API endpoint or admin changelist issues more queries as data grows. "
+        "The same check runs in the test suite (benchmarks.tests)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default=",".join(str(size) for size in querycount.SIZES),
+            help="Comma-separated dataset sizes (default: 1,10,100).",
+        )
+        parser.add_argument(
+            "--route",
+            action="append",
+            dest="routes",
+            help="Only check this API route pattern. Repeatable; skips the admin.",
+        )
+        parser.add_argument("--no-admin", action="store_true", help="Skip admin changelists.")
+        parser.add_argument("--output", help="Write query counts per size as JSON.")
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options["sizes"].split(","))
+
+        # Never seed into the real database
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = querycount.measure(
+                sizes=sizes,
+                only=options["routes"],
+                include_admin=not options["no_admin"],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        failures, report = [], {}
+        for target in sorted(results):
+            counts, grows, offenders = querycount.analyse(results[target])
+            report[target] = {"queries": counts, "constant": not grows}
+            summary = ", ".join(f"{size}->{count}" for size, count in counts.items())
+            if not grows:
+                self.stdout.write(f"  OK    {target:<52} {summary}")
+                continue
+
+            failures.append(target)
+            self.stdout.write(self.style.ERROR(f"  FAIL  {target:<52} {summary}"))
+            for line in querycount.describe(offenders, sql_limit=300):
+                self.stdout.write(f"        {line}")
+
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(report, handle, indent=2, sort_keys=True)
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} endpoint(s) issue more queries as data grows."
+            )
+        self.stdout.write(self.style.SUCCESS("All query counts are constant."))
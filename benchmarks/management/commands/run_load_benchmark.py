@@ -0,0 +1,56 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import driver
+from benchmarks.seed import bench_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure p50/p95/p99 latency and throughput for every API route against "
+        "the seeded benchmark data, and write a JSON report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+        parser.add_argument("--baseline", help="Previous report to compare against.")
+        parser.add_argument(
+            "--route",
+            action="append",
+            dest="routes",
+            help="Only run this route pattern (e.g. 'client-investments/'). Repeatable.",
+        )
+
+    def handle(self, *args, **options):
+        if not bench_users().exists():
+            raise CommandError("No benchmark data found. Run seed_benchmark_data first.")
+
+        report = driver.run(
+            iterations=options["iterations"],
+            warmup=options["warmup"],
+            only=options["routes"],
+        )
+
+        self.stdout.write(f"{'route':<48} {'p50':>9} {'p95':>9} {'p99':>9} {'rps':>9}")
+        for route, result in report["routes"].items():
+            self.stdout.write(
+                f"{route:<48} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                f"{result['p99_ms']:>9.2f} {result['throughput_rps']:>9.1f}"
+            )
+        for route in report["missing_scenarios"]:
+            self.stderr.write(f"No scenario for route '{route}'.")
+
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(report, handle, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
+
+        if options["baseline"]:
+            with open(options["baseline"]) as handle:
+                baseline = json.load(handle)
+            self.stdout.write("\nChange vs baseline:")
+            for route, metric, before, after, change in driver.compare(report, baseline):
+                self.stdout.write(f"  {route:<48} {metric:<15} {before:>9} -> {after:<9} ({change:+}%)")
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from benchmarks import seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-insert a synthetic dataset (users, projects, pricings, investments, "
+        "schedules, transactions, notifications, documents) for benchmarking."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--projects", type=int, default=10)
+        parser.add_argument("--investments-per-user", type=int, default=3)
+        parser.add_argument("--notifications-per-user", type=int, default=10)
+        parser.add_argument("--documents-per-user", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42).")
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Delete previously seeded benchmark data first.",
+        )
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            seed.flush()
+            self.stdout.write("Removed previous benchmark data.")
+        elif seed.bench_users().exists():
+            self.stderr.write("Benchmark data already exists; pass --flush to reseed.")
+            return
+
+        started = time.perf_counter()
+        counts = seed.seed(
+            users=options["users"],
+            projects=options["projects"],
+            investments_per_user=options["investments_per_user"],
+            notifications_per_user=options["notifications_per_user"],
+            documents_per_user=options["documents_per_user"],
+            rng_seed=options["seed"],
+        )
+        elapsed = time.perf_counter() - started
+
+        for model, count in counts.items():
+            self.stdout.write(f"  {model:<14} {count:>10,}")
+        self.stdout.write(self.style.SUCCESS(f"Seeded in {elapsed:.2f}s."))
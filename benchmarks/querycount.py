@@ -0,0 +1,164 @@
+from collections import Counter, defaultdict
+
+from django.contrib import admin
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from account.models import User
+from core.db import app_frame, caller_frame, fingerprint
+
+from . import driver
+from .seed import EMAIL_DOMAIN, PASSWORD, seed
+
+# -------------------------------------------------------------------------
+# Query-Count Scaling Harness
+# -------------------------------------------------------------------------
+# Seeds the same shape of data at several sizes, replays every API scenario
+# and every admin changelist, and records each SQL statement together with
+# the project stack frame that issued it. An endpoint passes only if its
+# query count stays flat as the data grows (i.e. it is O(1) in queries).
+
+SIZES = (1, 10, 100)
+# Frames that drive the requests; never the culprit
+HARNESS_PATHS = ("benchmarks/", "observability/", "manage.py")
+
+
+class QueryRecorder:
+    """connection.execute_wrapper that keeps (sql, originating frame)."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        # depth=2 skips the frame helper and this wrapper; the harness's own
+        # frames are never the culprit, so fall back to the framework frame
+        frame = app_frame(depth=2, ignore=HARNESS_PATHS) or caller_frame(
+            depth=2, ignore=HARNESS_PATHS
+        )
+        self.queries.append((sql, frame))
+        return execute(sql, params, many, context)
+
+
+def _consume(response):
+    if getattr(response, "streaming", False):
+        b"".join(response.streaming_content)
+    return response
+
+
+def _capture(send):
+    """
+    Runs `send` once to warm caches, then records the queries of a second run.
+    Both runs start from the same data: the warm-up's writes are rolled back.
+    """
+    with transaction.atomic():
+        with transaction.atomic():
+            _consume(send(0))
+            transaction.set_rollback(True)
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            _consume(send(1))
+        transaction.set_rollback(True)
+    return recorder.queries
+
+
+def _api_targets(ctx, only):
+    client = Client()
+    for route, (method, path_for, kwargs_for) in driver.SCENARIOS.items():
+        if only and driver.scenario_route(route) not in only:
+            continue
+
+        def send(i, method=method, path_for=path_for, kwargs_for=kwargs_for):
+            return getattr(client, method)(
+                driver.API_PREFIX + path_for(ctx, i), **kwargs_for(ctx, i)
+            )
+
+        yield f"{method.upper()} {driver.API_PREFIX}{route}", send
+
+
+def _admin_targets(staff_user):
+    client = Client()
+    client.force_login(staff_user)
+    for model in admin.site._registry:
+        meta = model._meta
+        url = reverse(f"admin:{meta.app_label}_{meta.model_name}_changelist")
+        yield f"admin {meta.app_label}.{meta.model_name}", lambda i, url=url: client.get(url)
+
+
+def measure(sizes=SIZES, only=None, include_admin=True):
+    """Returns {target: {size: [(sql, frame), ...]}}."""
+    results = defaultdict(dict)
+    # A random funding shard may need creating first (investment.funding); one
+    # shard, created by the seed, keeps the count the same on every run
+    with driver.offline_environment() as media_root, override_settings(FUNDING_COUNTER_SHARDS=1):
+        for size in sizes:
+            with transaction.atomic():
+                seed(
+                    users=2,
+                    projects=size,
+                    # One more, so every size has a completed investment (ROI)
+                    investments_per_user=size + 1,
+                    notifications_per_user=size,
+                    documents_per_user=size,
+                )
+                ctx = driver.prepare_context(media_root)
+                targets = list(_api_targets(ctx, only))
+                if include_admin and not only:
+                    staff_user = User.objects.create_superuser(
+                        email=f"querycount-admin@{EMAIL_DOMAIN}",
+                        password=PASSWORD,
+                        first_name="Query",
+                        last_name="Count",
+                    )
+                    targets += list(_admin_targets(staff_user))
+
+                for target, send in targets:
+                    results[target][size] = _capture(send)
+                transaction.set_rollback(True)
+    return results
+
+
+def analyse(per_size):
+    """
+    Returns (counts by size, grows?, offenders). Offenders are the statement
+    fingerprints that ran more often at the largest size than the smallest.
+    Only the two ends are compared: a middle size may take a one-off branch
+    its seeded rows happen to trigger (e.g. a payer's first payment of the
+    month), while a per-row query always shows at the largest size.
+    """
+    sizes = sorted(per_size)
+    counts = {size: len(per_size[size]) for size in sizes}
+    grows = counts[sizes[-1]] > counts[sizes[0]]
+
+    offenders = []
+    if grows:
+        baseline = Counter(fingerprint(sql) for sql, _ in per_size[sizes[0]])
+        largest = defaultdict(list)
+        for sql, frame in per_size[sizes[-1]]:
+            largest[fingerprint(sql)].append((sql, frame))
+        for key, items in largest.items():
+            if len(items) > baseline.get(key, 0):
+                # The frame that repeats is the N+1, not e.g. a one-off session lookup
+                frame = Counter(frame for _, frame in items).most_common(1)[0][0]
+                offenders.append(
+                    {
+                        "smallest": baseline.get(key, 0),
+                        "largest": len(items),
+                        "sql": items[0][0],
+                        "frame": frame,
+                    }
+                )
+        offenders.sort(key=lambda offender: -offender["largest"])
+    return counts, grows, offenders
+
+
+def describe(offenders, sql_limit=None):
+    """Report lines for analyse()'s offenders: growth, issuing frame, then the SQL."""
+    lines = []
+    for offender in offenders:
+        lines.append(
+            f"x{offender['smallest']} -> x{offender['largest']}  "
+            f"at {offender['frame'] or '<framework>'}"
+        )
+        lines.append(f"    {offender['sql'][:sql_limit]}")
+    return lines
@@ -0,0 +1,273 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils.timezone import now
+
+from account.models import Profile, User
+from documents.models import Document
+from investment import funding, schedules
+from investment.models import (
+    ClientInvestment,
+    InvestmentPlan,
+    InvestmentProject,
+    PaymentSchedule,
+    ProjectPricing,
+)
+from notification.models import Notification
+from payment import rollups
+from payment.models import Transaction
+
+# -------------------------------------------------------------------------
+# Benchmark Data Seeding
+# -------------------------------------------------------------------------
+# Everything is inserted with bulk_create (no save(), no signals), so the
+# derived fields save() would normally fill in are computed here instead, and
+# the monthly collection rollups and project funding counters are rebuilt
+# afterwards.
+
+EMAIL_DOMAIN = "bench.local"
+PASSWORD = "bench-password"
+
+PLANS = [
+    ("Bench Weekly", 84, "weekly"),
+    ("Bench Monthly", 180, "monthly"),
+    ("Bench One Time", 30, "one_time"),
+]
+
+BATCH_SIZE = 1000
+
+
+def bench_users():
+    return User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}", is_staff=False)
+
+
+def bench_staff():
+    """Staff account for the staff-only endpoints, created on first use."""
+    staff = User.objects.filter(email=f"staff@{EMAIL_DOMAIN}").first()
+    if staff is None:
+        staff = User.objects.create_user(
+            email=f"staff@{EMAIL_DOMAIN}",
+            password=PASSWORD,
+            first_name="Bench",
+            last_name="Staff",
+            is_staff=True,
+        )
+    return staff
+
+
+def bench_projects():
+    return InvestmentProject.objects.filter(name__startswith="Bench Project")
+
+
+def flush():
+    """Deletes everything a previous seed created (cascades to child rows)."""
+    with transaction.atomic():
+        User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").delete()
+        ProjectPricing.objects.filter(project__in=bench_projects()).delete()
+        bench_projects().delete()
+        InvestmentPlan.objects.filter(name__startswith="Bench ").delete()
+        rollups.rebuild()
+        funding.rebuild()
+
+
+def _cycles(plan):
+    return schedules.cycles(plan.payment_mode, plan.duration_days)
+
+
+def seed(
+    users=100,
+    projects=10,
+    investments_per_user=3,
+    notifications_per_user=10,
+    documents_per_user=3,
+    rng_seed=42,
+):
+    rng = random.Random(rng_seed)
+    today = now().date()
+    counts = {}
+
+    with transaction.atomic():
+        # 1. Users + Profiles (hash the password once, not per user)
+        password = make_password(PASSWORD)
+        user_rows = User.objects.bulk_create(
+            [
+                User(
+                    email=f"user{i}@{EMAIL_DOMAIN}",
+                    first_name="Bench",
+                    last_name=f"User {i}",
+                    phone_number=f"080{i:08d}",
+                    password=password,
+                    is_approved=True,
+                )
+                for i in range(users)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Profile.objects.bulk_create(
+            [Profile(user=user, address=f"{i} Bench Street") for i, user in enumerate(user_rows)],
+            batch_size=BATCH_SIZE,
+        )
+        counts["users"] = len(user_rows)
+
+        # 2. Plans, Projects and one Pricing per (project, plan)
+        plans = InvestmentPlan.objects.bulk_create(
+            [InvestmentPlan(name=n, duration_days=d, payment_mode=m) for n, d, m in PLANS]
+        )
+        project_rows = InvestmentProject.objects.bulk_create(
+            [
+                InvestmentProject(
+                    name=f"Bench Project {i}",
+                    investment_type=rng.choice(["agriculture", "real-estate"]),
+                    asset_type=rng.choice(["terrace", "farmland"]),
+                    location=rng.choice(["Lagos", "Abuja", "Enugu", "Kano"]),
+                    investment_detail="Seeded for benchmarking.",
+                    roi_start_after_days=rng.choice([30, 90, 180]),
+                    project_img=f"project_img/bench_{i}.png",
+                    expected_roi_percent=Decimal(rng.randint(5, 30)),
+                )
+                for i in range(projects)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        pricing_rows = []
+        for project in project_rows:
+            for plan in plans:
+                total = Decimal(rng.randrange(500_000, 20_000_000, 50_000))
+                template = schedules.build_template(total, plan.payment_mode, plan.duration_days)
+                pricing_rows.append(
+                    ProjectPricing(
+                        project=project,
+                        plan=plan,
+                        total_price=total,
+                        minimum_deposit=schedules.first_amount(template),
+                        schedule_template=template,
+                    )
+                )
+        pricing_rows = ProjectPricing.objects.bulk_create(pricing_rows, batch_size=BATCH_SIZE)
+        counts["projects"] = len(project_rows)
+        counts["pricings"] = len(pricing_rows)
+        plans_by_id = {plan.pk: plan for plan in plans}
+
+        # 3. Investments, decide up-front how many installments are paid
+        investment_rows, paid_counts = [], []
+        for user in user_rows:
+            for n in range(investments_per_user):
+                pricing = rng.choice(pricing_rows)
+                plan = plans_by_id[pricing.plan_id]
+                cycles, interval = _cycles(plan)
+                # Every user keeps one open investment so payment paths run,
+                # and (with two or more) one completed for the ROI projection
+                paid = rng.randint(0, cycles - 1 if n == 0 else cycles)
+                if n == 1:
+                    paid = cycles
+                amounts = [Decimal(amount) for amount in pricing.schedule_template["amounts"]]
+                amount_paid = sum(amounts[:paid], Decimal("0.00"))
+
+                if paid == 0:
+                    status = "pending"
+                elif paid < cycles:
+                    status = "paying"
+                else:
+                    status = "completed"
+
+                start_date = today - timedelta(days=rng.randint(0, plan.duration_days))
+                # Completed when the last installment (paid on its due date) came in
+                completed_at = None
+                if status == "completed":
+                    last_due = start_date + timedelta(days=interval * (cycles - 1))
+                    completed_at = now() - timedelta(days=(today - last_due).days)
+
+                investment_rows.append(
+                    ClientInvestment(
+                        user=user,
+                        selected_option=pricing,
+                        agreed_amount=pricing.total_price,
+                        installment_amount=amounts[0],
+                        amount_paid=amount_paid,
+                        start_date=start_date,
+                        status=status,
+                        completed_at=completed_at,
+                    )
+                )
+                paid_counts.append(paid)
+        investment_rows = ClientInvestment.objects.bulk_create(
+            investment_rows, batch_size=BATCH_SIZE
+        )
+        counts["investments"] = len(investment_rows)
+
+        # 4. Schedules + one Transaction per paid installment
+        pricing_by_id = {pricing.pk: pricing for pricing in pricing_rows}
+        project_by_id = {project.pk: project for project in project_rows}
+        schedule_rows, transaction_rows = [], []
+        for investment, paid in zip(investment_rows, paid_counts):
+            pricing = pricing_by_id[investment.selected_option_id]
+            installments = schedules.instantiate(pricing.schedule_template, investment.start_date)
+
+            for i, title, due, amount in installments:
+                is_paid = i <= paid
+                schedule_rows.append(
+                    PaymentSchedule(
+                        investment=investment,
+                        installment_number=i,
+                        title=title,
+                        due_date=due,
+                        amount=amount,
+                        status="paid" if is_paid else ("overdue" if due < today else "upcoming"),
+                        date_paid=due if is_paid else None,
+                    )
+                )
+                if is_paid:
+                    transaction_rows.append(
+                        Transaction(
+                            user_id=investment.user_id,
+                            investment=investment,
+                            location=project_by_id[pricing.project_id].location,
+                            amount=amount,
+                            installment_number=i,
+                            timestamp=now() - timedelta(days=(today - due).days),
+                            payment_reference=f"BENCH-{investment.pk}-{i}",
+                        )
+                    )
+        PaymentSchedule.objects.bulk_create(schedule_rows, batch_size=BATCH_SIZE)
+        Transaction.objects.bulk_create(transaction_rows, batch_size=BATCH_SIZE)
+        counts["schedules"] = len(schedule_rows)
+        counts["transactions"] = len(transaction_rows)
+
+        # 5. Notifications + Documents
+        notification_rows = [
+            Notification(
+                user=user,
+                title=f"Bench notice {n}",
+                message="Seeded for benchmarking.",
+                notification_type=rng.choice(["info", "success", "warning", "alert"]),
+                is_read=rng.random() < 0.5,
+            )
+            for user in user_rows
+            for n in range(notifications_per_user)
+        ]
+        Notification.objects.bulk_create(notification_rows, batch_size=BATCH_SIZE)
+        counts["notifications"] = len(notification_rows)
+
+        document_rows = [
+            Document(
+                user=user,
+                title=f"Bench document {n}",
+                file=f"secure_vault/bench/user{user.pk}_doc{n}.pdf",
+                category=rng.choice(["agreement", "deed", "report", "other"]),
+                file_size="16.0 KB",
+                file_type="PDF",
+            )
+            for user in user_rows
+            for n in range(documents_per_user)
+        ]
+        Document.objects.bulk_create(document_rows, batch_size=BATCH_SIZE)
+        counts["documents"] = len(document_rows)
+
+        # 6. Rollups and funding counters (bulk_create skipped the signals)
+        counts["rollups"] = rollups.rebuild()
+        funding.rebuild()
+
+    return counts
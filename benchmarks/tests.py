@@ -0,0 +1,83 @@
+from django.test import Client, TestCase
+
+from investment import roi
+from . import driver, querycount, seed
+
+
+class QueryScalingTests(TestCase):
+    """
+    Every API scenario and admin changelist issues the same number of queries
+    with 1, 10 and 100 rows per user (see benchmarks.querycount).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Seeding each size is the slow part: measure every target once
+        cls.results = querycount.measure()
+
+    def assertConstantQueries(self, target):
+        counts, grows, offenders = querycount.analyse(self.results[target])
+        if grows:
+            summary = ", ".join(f"{size}->{count}" for size, count in counts.items())
+            self.fail(
+                "\n".join(
+                    [f"{target} issues more queries as data grows ({summary}):"]
+                    + querycount.describe(offenders)
+                )
+            )
+
+    def test_api_routes(self):
+        targets = [target for target in self.results if not target.startswith("admin ")]
+        self.assertEqual(len(targets), len(driver.SCENARIOS))
+        for target in sorted(targets):
+            with self.subTest(target=target):
+                self.assertConstantQueries(target)
+
+    def test_admin_changelists(self):
+        targets = [target for target in self.results if target.startswith("admin ")]
+        self.assertTrue(targets)
+        for target in sorted(targets):
+            with self.subTest(target=target):
+                self.assertConstantQueries(target)
+
+
+class ScenarioTests(TestCase):
+    """Scenarios that need particular rows hit them (see driver.Context)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed.seed(
+            users=2, projects=2, investments_per_user=2, notifications_per_user=1, documents_per_user=1
+        )
+
+    def send(self, route):
+        method, path_for, kwargs_for = driver.SCENARIOS[route]
+        with driver.offline_environment() as media_root:
+            ctx = driver.prepare_context(media_root)
+            response = getattr(Client(), method)(
+                driver.API_PREFIX + path_for(ctx, 0), **kwargs_for(ctx, 0)
+            )
+        return ctx, response
+
+    def test_roi(self):
+        ctx, response = self.send("client-investments/<int:pk>/roi/")
+        self.assertIn(ctx.settled_investment.status, roi.PROJECTABLE_STATUSES)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["investment_id"], ctx.settled_investment.pk)
+
+    def test_collections(self):
+        _, everything = self.send("reports/collections/")
+        ctx, filtered = self.send("reports/collections/?project=<id>")
+        self.assertEqual(everything.status_code, 200)
+        self.assertEqual(filtered.status_code, 200)
+        self.assertIsNotNone(ctx.collection_project_id)
+        self.assertTrue(filtered.json())
+        self.assertNotEqual(filtered.json(), everything.json())
+
+    def test_every_route_has_a_scenario(self):
+        routes = driver.discover_routes()
+        self.assertEqual([route for route in routes if not driver.scenarios_for(route)], [])
+        self.assertEqual(
+            [key for key in driver.SCENARIOS if driver.scenario_route(key) not in routes], []
+        )
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core import checks
+
+from . import data_version
+
+# Backends whose entries exist only inside the process that wrote them
+PROCESS_LOCAL_CACHES = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+@checks.register(checks.Tags.caches)
+def check_data_version_cache(app_configs, **kwargs):
+    """DataVersionMiddleware needs version tokens every worker can see."""
+    if "core.middleware.DataVersionMiddleware" not in settings.MIDDLEWARE:
+        return []
+    config = settings.CACHES.get(data_version.CACHE_ALIAS)
+    if config is None:
+        return [
+            checks.Error(
+                f"CACHES has no {data_version.CACHE_ALIAS!r} alias for the data version tokens.",
+                hint="Add a DatabaseCache (or Redis/Memcached) entry, or remove DataVersionMiddleware.",
+                id="core.E001",
+            )
+        ]
+    if config["BACKEND"] in PROCESS_LOCAL_CACHES:
+        return [
+            checks.Warning(
+                f"CACHES[{data_version.CACHE_ALIAS!r}] is local to each process: with "
+                "several workers, DataVersionMiddleware answers 304 with stale data.",
+                hint="Use a DatabaseCache, Redis or Memcached backend for this alias.",
+                id="core.W001",
+            )
+        ]
+    return []
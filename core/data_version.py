@@ -0,0 +1,88 @@
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+# -------------------------------------------------------------------------
+# Data Versions (conditional GETs)
+# -------------------------------------------------------------------------
+# Every user has a version token in the cache, replaced with a new random
+# token whenever one of their ClientInvestment, PaymentSchedule, Transaction,
+# Document or Notification rows is saved or deleted. A shared token does the
+# same for the project catalogue (projects, plans, pricing), which the
+# investment pages also show.
+#
+# DataVersionMiddleware (core.middleware) turns the tokens into an ETag for
+# the polled endpoints in DATA_VERSION_PATHS and answers a matching
+# If-None-Match with 304 before the view runs: one cache read, and no
+# queries against the app's tables.
+#
+#   ETag = hash(user token, shared token, today, path + query string)
+#
+# Tokens are random rather than counters, so a token that was evicted (or
+# expired after DATA_VERSION_TIMEOUT) can never come back with an old value
+# and match a stale ETag. They are replaced after the writing transaction
+# commits; replacing them earlier would let a concurrent poll tag the old
+# rows with the new token. The date is part of the ETag because "days left"
+# figures change at midnight without any write.
+#
+# Bulk writes (QuerySet.update(), bulk_create()) send no signals and must
+# call bump() themselves.
+#
+# The tokens must be visible to every process, otherwise a worker that
+# missed a write keeps answering 304 with its own old token for up to
+# DATA_VERSION_TIMEOUT. They live in their own cache alias (CACHE_ALIAS),
+# a DatabaseCache by default (Redis or Memcached work as well); a
+# process-local backend there fails the core.W001 system check (core.checks).
+
+CACHE_ALIAS = "data_versions"
+SHARED = "shared"
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _key(scope):
+    return f"data-version:{scope}"
+
+
+def _replace(scopes):
+    tokens = {_key(scope): secrets.token_hex(8) for scope in scopes}
+    _cache().set_many(tokens, timeout=settings.DATA_VERSION_TIMEOUT)
+
+
+def bump(*user_ids):
+    """New version tokens for these users, once the current transaction commits."""
+    scopes = {user_id for user_id in user_ids if user_id is not None}
+    if scopes:
+        transaction.on_commit(lambda: _replace(scopes))
+
+
+def bump_shared():
+    """New shared token (project catalogue changed), once the transaction commits."""
+    transaction.on_commit(lambda: _replace([SHARED]))
+
+
+def current(user_id):
+    """'<user token>.<shared token>', creating whichever is missing."""
+    cache = _cache()
+    keys = [_key(user_id), _key(SHARED)]
+    tokens = cache.get_many(keys)
+    for key in keys:
+        if key not in tokens:
+            token = secrets.token_hex(8)
+            # Another request may have created it meanwhile; theirs wins
+            if not cache.add(key, token, timeout=settings.DATA_VERSION_TIMEOUT):
+                token = cache.get(key, token)
+            tokens[key] = token
+    return ".".join(tokens[key] for key in keys)
+
+
+def etag(user_id, request):
+    """Quoted ETag for this user's view of request's URL."""
+    source = f"{current(user_id)}:{timezone.localdate()}:{request.get_full_path()}"
+    return '"%s"' % hashlib.md5(source.encode()).hexdigest()
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import re
+import sys
+
+from django.conf import settings
+
+# -------------------------------------------------------------------------
+# SQL Helpers (shared by the query instrumentation)
+# -------------------------------------------------------------------------
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%s|\?")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+# Savepoint ids ("s<thread>_x<counter>") change with every atomic block
+_SAVEPOINT_RE = re.compile(r'"?s\d+_x\d+"?')
+
+APP_ROOT = str(settings.BASE_DIR) + os.sep
+
+
+def normalize_sql(sql):
+    """
+    Replaces literals and placeholders with "?" and collapses IN (...) lists,
+    so the same ORM call always produces the same text whatever its params.
+    """
+    sql = _SAVEPOINT_RE.sub("?", sql)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def fingerprint(sql):
+    """Short stable id for a normalized statement."""
+    return hashlib.md5(normalize_sql(sql).encode()).hexdigest()[:16]
+
+
+def _format_frame(frame):
+    filename = frame.f_code.co_filename
+    if filename.startswith(APP_ROOT):
+        filename = filename[len(APP_ROOT):]
+    return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+def app_frame(depth=1, ignore=()):
+    """
+    Innermost stack frame that belongs to this project (not Django, DRF or
+    other installed packages), formatted as "path.py:line in function".
+    `ignore` holds path prefixes (relative to BASE_DIR) to skip as well.
+    Walks frame objects directly; much cheaper than traceback.extract_stack().
+    """
+    frame = sys._getframe(depth)
+    this_file = __file__
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(APP_ROOT)
+            and filename != this_file
+            and "site-packages" not in filename
+            and not filename[len(APP_ROOT):].startswith(ignore)
+        ):
+            return _format_frame(frame)
+        frame = frame.f_back
+    return None
+
+
+def caller_frame(depth=1, ignore=()):
+    """
+    Innermost frame outside Django's database layer. Used when the query was
+    issued by framework code (e.g. the admin) rather than by this project.
+    `ignore` works as in app_frame() (e.g. to skip other execute wrappers).
+    """
+    frame = sys._getframe(depth)
+    db_layer = os.path.join("django", "db") + os.sep
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename != __file__
+            and db_layer not in filename
+            and not (filename.startswith(APP_ROOT) and filename[len(APP_ROOT):].startswith(ignore))
+        ):
+            return _format_frame(frame)
+        frame = frame.f_back
+    return None
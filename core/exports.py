@@ -0,0 +1,269 @@
+import csv
+import datetime
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+# -------------------------------------------------------------------------
+# Streaming Exports (CSV / XLSX)
+# -------------------------------------------------------------------------
+# Rows are read with queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE) and
+# encoded one at a time into a StreamingHttpResponse, so memory stays flat
+# however many rows are exported.
+#
+# XLSX is a zip of XML parts. The sheet is written row by row through
+# zipfile's streaming writer (inline strings, no shared-string table), and
+# every compressed chunk is yielded as soon as zlib emits it. The zip's
+# central directory, written at the end, is the only part that grows, by a
+# few dozen bytes per part rather than per row.
+#
+# Text values (names, emails, references) come from users. Spreadsheet apps
+# run a cell starting with "=", "+", "-" or "@" as a formula, so such text is
+# written with a leading "'" in both formats (CSV injection). Numbers and
+# dates are written as they are.
+
+# Rows are grouped into ~64 KiB pieces before being handed to the server,
+# rather than one tiny write per row
+FLUSH_BYTES = 64 * 1024
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+class Column:
+    """
+    One export column: a header and either a dotted attribute path
+    ("investment.selected_option.project.name") or a callable(obj).
+    """
+
+    def __init__(self, header, source):
+        self.header = header
+        self.source = source
+        self._path = source.split(".") if isinstance(source, str) else None
+
+    def value(self, obj):
+        if self._path is None:
+            return self.source(obj)
+        for attr in self._path:
+            if obj is None:
+                return None
+            obj = getattr(obj, attr)
+        return obj
+
+
+def _rows(columns, queryset):
+    for obj in queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        yield [column.value(obj) for column in columns]
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.isoformat(sep=" ", timespec="seconds")
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)
+
+
+# Characters that make Excel / LibreOffice read a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _cell_text(value):
+    """_text() for a data cell: user text that could run as a formula is quoted."""
+    text = _text(value)
+    if isinstance(value, str) and text.startswith(FORMULA_PREFIXES):
+        return "'" + text
+    return text
+
+
+# --- CSV ---
+
+
+class _Echo:
+    """File-like object whose write() just returns the data (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(columns, queryset):
+    writer = csv.writer(_Echo())
+    # BOM so Excel opens the file as UTF-8 (names, "₦")
+    buffer = ["\ufeff" + writer.writerow([column.header for column in columns])]
+    size = 0
+    for row in _rows(columns, queryset):
+        line = writer.writerow([_cell_text(value) for value in row])
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    yield "".join(buffer)
+
+
+# --- XLSX ---
+
+
+class _Drain:
+    """Unseekable sink for ZipFile: collects bytes until they are yielded."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data):
+        if data:
+            self.chunks.append(bytes(data))
+            self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        self.size = 0
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = "</sheetData></worksheet>"
+
+
+def _cell(value):
+    # Numbers stay numeric so finance can sum them; everything else is text
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_cell_text(value))}</t></is></c>'
+
+
+def _xml_row(values):
+    return "<row>" + "".join(_cell(value) for value in values) + "</row>"
+
+
+def stream_xlsx(columns, queryset, sheet_name="Export"):
+    sink = _Drain()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(sheet_name[:31])))
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        yield sink.take()
+
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(_SHEET_START.encode())
+            sheet.write(_xml_row([column.header for column in columns]).encode())
+            for row in _rows(columns, queryset):
+                sheet.write(_xml_row(row).encode())
+                if sink.size >= FLUSH_BYTES:
+                    yield sink.take()
+            sheet.write(_SHEET_END.encode())
+    yield sink.take()
+
+
+# --- Responses ---
+
+
+def export_response(queryset, columns, fmt, basename):
+    if fmt not in FORMATS:
+        raise Http404(f"Unsupported export format: {fmt}")
+    if fmt == "csv":
+        content = stream_csv(columns, queryset)
+    else:
+        content = stream_xlsx(columns, queryset, sheet_name=basename)
+
+    filename = f"{basename}-{timezone.localdate():%Y%m%d}.{fmt}"
+    response = StreamingHttpResponse(content, content_type=FORMATS[fmt])
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    response["Cache-Control"] = "private, no-store"
+    return response
+
+
+def export_actions(columns, basename):
+    """CSV and XLSX admin actions exporting the selected rows."""
+
+    def make(fmt):
+        def action(modeladmin, request, queryset):
+            return export_response(queryset, columns, fmt, basename)
+
+        action.__name__ = f"export_{fmt}"
+        action.short_description = f"⬇ Export selected as {fmt.upper()}"
+        return action
+
+    return [make(fmt) for fmt in FORMATS]
+
+
+class StaffExportView(APIView):
+    """
+    GET .../<name>.csv or .xlsx for staff. Subclasses set `columns`,
+    `basename` and `date_lookup` (e.g. "timestamp__date") and implement
+    get_queryset(); ?from= and ?to= (YYYY-MM-DD) filter on date_lookup.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    columns = ()
+    basename = "export"
+    date_lookup = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get(self, request, fmt):
+        queryset = self.get_queryset()
+        if self.date_lookup:
+            for param, lookup in (("from", "gte"), ("to", "lte")):
+                value = request.query_params.get(param)
+                if not value:
+                    continue
+                try:
+                    day = datetime.date.fromisoformat(value)
+                except ValueError:
+                    raise ValidationError({param: "Use YYYY-MM-DD."})
+                queryset = queryset.filter(**{f"{self.date_lookup}__{lookup}": day})
+        return export_response(queryset, self.columns, fmt, self.basename)
@@ -0,0 +1,189 @@
+import datetime
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+# -------------------------------------------------------------------------
+# Idempotent Writes
+# -------------------------------------------------------------------------
+# A write that may be repeated (a client retrying after a timeout, Paystack
+# re-sending a webhook) is keyed by (scope, key). The first request inserts
+# the IdempotencyKey row before doing any work; the unique constraint makes
+# that insert the lock, so of two concurrent requests only one runs. When it
+# finishes, its response is stored on the row, and every repeat within
+# IDEMPOTENCY_KEY_TTL costs a single lookup and gets the same response back.
+#
+#   first request : lookup -> insert (claim) -> work -> store response
+#   repeat        : lookup -> replay
+#   concurrent    : lookup/insert -> InProgress (409 for API clients)
+#
+# A failed request (an exception or a 5xx) releases its claim so the retry
+# can run. A claim older than IDEMPOTENCY_LOCK_TIMEOUT is taken over, so a
+# crashed worker can't block a key until it expires.
+# Expired rows are removed by `manage.py prune_idempotency_keys`.
+
+HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+class InProgress(Exception):
+    """Another request with the same key has not finished yet."""
+
+
+class KeyReused(Exception):
+    """The key was already used for a request with a different payload."""
+
+
+def fingerprint(*parts):
+    """Stable hash of the request payload, so a key can't be reused for another one."""
+    payload = json.dumps(parts, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def begin(scope, key, fingerprint=""):
+    """
+    Claims (scope, key) for a new request, or finds the finished one to replay.
+    Returns (record, replay). Raises InProgress or KeyReused.
+    """
+    moment = timezone.now()
+    ttl = datetime.timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+    # 1. Repeats: one lookup
+    record = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+    if record is None:
+        # 2. First request: the insert is the lock
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    scope=scope,
+                    key=key,
+                    fingerprint=fingerprint,
+                    started_at=moment,
+                    expires_at=moment + ttl,
+                )
+            return record, False
+        except IntegrityError:
+            # A concurrent request with the same key got there first
+            record = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+            if record is None:
+                raise InProgress
+
+    # 3. Live key: replay it, or wait for the request holding it
+    if record.expires_at > moment:
+        if record.fingerprint != fingerprint:
+            raise KeyReused
+        if record.finished:
+            return record, True
+        lock_timeout = datetime.timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+        if record.started_at > moment - lock_timeout:
+            raise InProgress
+
+    # 4. Expired, or abandoned mid-request: take it over (unless another
+    # request just did; started_at is compared so only one update wins)
+    taken = IdempotencyKey.objects.filter(pk=record.pk, started_at=record.started_at).update(
+        fingerprint=fingerprint,
+        started_at=moment,
+        expires_at=moment + ttl,
+        status_code=None,
+        response_body=None,
+    )
+    if not taken:
+        raise InProgress
+    record.fingerprint = fingerprint
+    record.started_at = moment
+    record.expires_at = moment + ttl
+    record.status_code = None
+    record.response_body = None
+    return record, False
+
+
+def finish(record, status_code, body=None):
+    """Stores the response of a claimed request, to be replayed from now on."""
+    record.status_code = status_code
+    record.response_body = body
+    IdempotencyKey.objects.filter(pk=record.pk, started_at=record.started_at).update(
+        status_code=status_code, response_body=body
+    )
+
+
+def abandon(record):
+    """Releases a claim without a response, so the next attempt runs again."""
+    IdempotencyKey.objects.filter(pk=record.pk, started_at=record.started_at).delete()
+
+
+def prune(moment=None):
+    """Deletes expired keys. Returns the number deleted."""
+    moment = moment or timezone.now()
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=moment).delete()
+    return deleted
+
+
+def idempotent(scope):
+    """
+    Decorator for DRF view methods (post/create/...). Requests carrying an
+    Idempotency-Key header run once per user and key; repeats get the stored
+    response with an "Idempotent-Replayed: true" header. Requests without the
+    header are handled as before.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key:
+                return method(view, request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return Response(
+                    {"error": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            # 1. Claim the key (or find the response to replay)
+            try:
+                record, replay = begin(
+                    f"{scope}:{request.user.pk}",
+                    key,
+                    fingerprint(request.method, request.path, request.data),
+                )
+            except InProgress:
+                return Response(
+                    {"error": f"A request with this {HEADER} is still being processed."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            except KeyReused:
+                return Response(
+                    {"error": f"This {HEADER} was already used for a different request."},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            if replay:
+                return Response(
+                    record.response_body,
+                    status=record.status_code,
+                    headers={REPLAY_HEADER: "true"},
+                )
+
+            # 2. Run the view; keep its response unless it failed
+            try:
+                response = method(view, request, *args, **kwargs)
+            except BaseException:
+                abandon(record)
+                raise
+            if response.status_code >= 500:
+                abandon(record)
+            else:
+                finish(record, response.status_code, response.data)
+            return response
+
+        return wrapper
+
+    return decorator
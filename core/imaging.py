@@ -0,0 +1,150 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from .media import has_precomputed_url
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------------------------
+# Responsive Image Derivatives
+# -------------------------------------------------------------------------
+# Every uploaded image gets resized WebP + JPEG copies (see
+# IMAGE_DERIVATIVE_SIZES). Their public URLs, and the original's, are kept in a
+# JSONField next to the image so serializers never call storage.url():
+#   {"source": "project_img/farm.png",
+#    "url": "https://.../project_img/farm.png",
+#    "thumb": {"webp": "https://.../farm_thumb.webp", "jpeg": ...}}
+# "source" lets us detect when the original was replaced and the map is stale.
+
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# One small pool per process: resizing is CPU/IO bound and must never block
+# the request that uploaded the image.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_DERIVATIVE_WORKERS, thread_name_prefix="imaging"
+)
+
+
+def is_stale(field_file, sizes):
+    """True when the stored map does not belong to the current upload."""
+    if not field_file:
+        return False
+    return not has_precomputed_url(field_file, sizes)
+
+
+def needs_derivatives(field_file, sizes):
+    """True when any configured size is missing for the current upload."""
+    if not field_file:
+        return False
+    if is_stale(field_file, sizes):
+        return True
+    return any(label not in sizes for label in settings.IMAGE_DERIVATIVE_SIZES)
+
+
+def render_derivatives(field_file):
+    """
+    Resizes the original into every configured size/format and saves the
+    results next to it. Returns the size map to store on the model.
+    """
+    storage = field_file.storage
+    folder, filename = os.path.split(field_file.name)
+    stem = os.path.splitext(filename)[0]
+
+    with field_file.open("rb") as handle:
+        original = Image.open(handle)
+        original = ImageOps.exif_transpose(original)
+        # WebP handles alpha, JPEG does not: flatten once for both
+        if original.mode not in ("RGB", "L"):
+            original = original.convert("RGB")
+        original.load()
+
+    sizes = {"source": field_file.name, "url": storage.url(field_file.name)}
+    for label, max_edge in settings.IMAGE_DERIVATIVE_SIZES.items():
+        resized = original.copy()
+        # thumbnail() keeps aspect ratio and never upscales
+        resized.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+        sizes[label] = {}
+        for ext, (pil_format, options) in FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, **options)
+            name = f"{folder}/derivatives/{stem}_{label}.{ext}"
+            # Overwrite instead of piling up farm_thumb_abc123.webp copies
+            if storage.exists(name):
+                storage.delete(name)
+            name = storage.save(name, ContentFile(buffer.getvalue()))
+            sizes[label][ext] = storage.url(name)
+
+    return sizes
+
+
+def refresh_derivatives(model, pk, image_field, sizes_field, force=False):
+    """
+    Regenerates derivatives for a single row.
+    Uses a filtered UPDATE so a newer upload that landed meanwhile is never
+    overwritten by results for the old file (and no save() signals fire).
+    """
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return None
+
+    field_file = getattr(instance, image_field)
+    if not field_file:
+        return None
+    if not force and not needs_derivatives(field_file, getattr(instance, sizes_field)):
+        return None
+
+    sizes = render_derivatives(field_file)
+    model._default_manager.filter(pk=pk, **{image_field: field_file.name}).update(
+        **{sizes_field: sizes}
+    )
+    return sizes
+
+
+def _run_in_background(model, pk, image_field, sizes_field):
+    try:
+        refresh_derivatives(model, pk, image_field, sizes_field)
+    except Exception:
+        logger.exception(
+            "Image derivative generation failed for %s #%s", model.__name__, pk
+        )
+    finally:
+        # Worker threads get their own DB connection; don't leak it
+        close_old_connections()
+
+
+def queue_derivatives(instance, image_field, sizes_field):
+    """
+    Called from post_save.
+    Stores the original's URL right away (one cheap UPDATE) so list endpoints
+    can use it immediately, then schedules resizing once the upload commits.
+    """
+    field_file = getattr(instance, image_field)
+    sizes = getattr(instance, sizes_field)
+
+    if is_stale(field_file, sizes):
+        sizes = {"source": field_file.name, "url": field_file.storage.url(field_file.name)}
+        type(instance)._default_manager.filter(
+            pk=instance.pk, **{image_field: field_file.name}
+        ).update(**{sizes_field: sizes})
+        setattr(instance, sizes_field, sizes)
+
+    if not needs_derivatives(field_file, sizes):
+        return
+
+    args = (type(instance), instance.pk, image_field, sizes_field)
+    if settings.IMAGE_DERIVATIVES_ASYNC:
+        transaction.on_commit(lambda: _executor.submit(_run_in_background, *args))
+    else:
+        transaction.on_commit(lambda: _run_in_background(*args))
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+
+from account.models import Profile
+from core.imaging import needs_derivatives, refresh_derivatives
+from investment.models import InvestmentProject
+
+# (model, image field, size-map field) for every image we resize
+TARGETS = {
+    "projects": (InvestmentProject, "project_img", "project_img_sizes"),
+    "profiles": (Profile, "profile_picture", "profile_picture_sizes"),
+}
+
+
+class Command(BaseCommand):
+    help = "Generate resized WebP/JPEG derivatives for existing project and profile images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            choices=sorted(TARGETS),
+            help="Limit the backfill to one image type.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate even when derivatives already exist for the current file.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Rows fetched per query while scanning (default: 200).",
+        )
+
+    def handle(self, *args, **options):
+        targets = [options["only"]] if options["only"] else sorted(TARGETS)
+
+        for key in targets:
+            model, image_field, sizes_field = TARGETS[key]
+            rows = (
+                model._default_manager.exclude(**{image_field: ""})
+                .exclude(**{f"{image_field}__isnull": True})
+                .select_related(None)
+                .only("pk", image_field, sizes_field)
+                .order_by("pk")
+            )
+
+            done = failed = 0
+            for row in rows.iterator(chunk_size=options["batch_size"]):
+                field_file = getattr(row, image_field)
+                if not options["force"] and not needs_derivatives(field_file, getattr(row, sizes_field)):
+                    continue
+                try:
+                    refresh_derivatives(
+                        model, row.pk, image_field, sizes_field, force=options["force"]
+                    )
+                    done += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"{key} #{row.pk}: {exc}")
+
+            self.stdout.write(
+                self.style.SUCCESS(f"{key}: {done} resized, {failed} failed.")
+            )
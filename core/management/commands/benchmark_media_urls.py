@@ -0,0 +1,66 @@
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework import serializers
+
+from core.media import MediaURLField
+from investment.models import InvestmentProject
+
+
+class LegacyProjectImageSerializer(serializers.Serializer):
+    """What the list serializers did before: storage.url() + build_absolute_uri() per row."""
+
+    project_img = serializers.ImageField(read_only=True)
+
+
+class CachedProjectImageSerializer(serializers.Serializer):
+    project_img = MediaURLField(sizes_source="project_img_sizes")
+
+
+class Command(BaseCommand):
+    help = "Compare per-row media URL cost of the legacy and cached serializer paths."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        request = RequestFactory().get("/api/investments/")
+
+        # In-memory rows: we only want to time URL resolution, not the DB
+        precomputed, not_precomputed = [], []
+        for i in range(rows):
+            name = f"project_img/bench_{i}.png"
+            precomputed.append(
+                InvestmentProject(
+                    pk=i,
+                    project_img=name,
+                    project_img_sizes={"source": name, "url": default_storage.url(name)},
+                )
+            )
+            not_precomputed.append(InvestmentProject(pk=i, project_img=name))
+
+        scenarios = [
+            ("legacy (storage.url per row)", LegacyProjectImageSerializer, not_precomputed),
+            ("cache fallback (warm)", CachedProjectImageSerializer, not_precomputed),
+            ("precomputed column", CachedProjectImageSerializer, precomputed),
+        ]
+
+        # Warm the URL cache so the fallback scenario measures steady state
+        CachedProjectImageSerializer(not_precomputed, many=True, context={"request": request}).data
+
+        storage_name = type(default_storage).__name__
+        self.stdout.write(f"Storage: {storage_name}, rows: {rows}, best of {options['repeat']}")
+        for label, serializer_class, objects in scenarios:
+            best = float("inf")
+            for _ in range(options["repeat"]):
+                # New request each run so the per-request URL prefix is recomputed
+                request = RequestFactory().get("/api/investments/")
+                started = time.perf_counter()
+                serializer_class(objects, many=True, context={"request": request}).data
+                best = min(best, time.perf_counter() - started)
+            per_thousand = best * 1000 / rows * 1000
+            self.stdout.write(f"  {label:<32} {per_thousand:8.2f} ms / 1,000 rows")
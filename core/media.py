@@ -0,0 +1,147 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import serializers
+from rest_framework.fields import get_attribute
+
+
+# -------------------------------------------------------------------------
+# Media URL Resolution
+# -------------------------------------------------------------------------
+# storage.url() is not free: the Cloudinary backend builds the URL in Python on
+# every call, and DRF then runs build_absolute_uri() on the result, once per
+# row per image. Instead:
+#   1. URLs are precomputed when the file is uploaded and stored in the
+#      model's size-map column ({"source": name, "url": ..., "thumb": {...}}),
+#      see core.imaging.
+#   2. Rows that have not been precomputed yet fall back to a cached
+#      storage.url(), keyed by (storage class, file name).
+#   3. Relative URLs are made absolute with a prefix computed once per request.
+
+
+def _cache_key(storage, name):
+    storage_id = f"{type(storage).__module__}.{type(storage).__qualname__}"
+    digest = hashlib.md5(f"{storage_id}:{name}".encode()).hexdigest()
+    return f"media-url:{digest}"
+
+
+def cached_url(storage, name):
+    """storage.url(name), memoized in the cache."""
+    key = _cache_key(storage, name)
+    url = cache.get(key)
+    if url is None:
+        url = storage.url(name)
+        cache.set(key, url, settings.MEDIA_URL_CACHE_TIMEOUT)
+    return url
+
+
+def absolute_url(request, url):
+    """
+    Same result as request.build_absolute_uri(url) for media URLs, but the
+    scheme/host prefix is only worked out once per request.
+    """
+    if not url or request is None or "://" in url or url.startswith("//"):
+        return url
+    base = getattr(request, "_media_url_base", None)
+    if base is None:
+        base = request.build_absolute_uri("/")[:-1]
+        request._media_url_base = base
+    return base + url
+
+
+def has_precomputed_url(field_file, sizes):
+    return _is_precomputed(field_file.name, sizes)
+
+
+def _is_precomputed(name, sizes):
+    return bool(sizes) and sizes.get("source") == name and "url" in sizes
+
+
+def file_url(field_file, sizes=None, request=None):
+    """
+    Public URL of a FileField/ImageField value.
+    Uses the precomputed URL when it belongs to the current file.
+    """
+    if not field_file:
+        return None
+    return stored_file_url(field_file.storage, field_file.name, sizes, request)
+
+
+def stored_file_url(storage, name, sizes=None, request=None):
+    """file_url() from the stored file name, for rows read with values()."""
+    if not name:
+        return None
+    if _is_precomputed(name, sizes):
+        url = sizes["url"]
+    else:
+        url = cached_url(storage, name)
+    return absolute_url(request, url)
+
+
+def size_urls(field_file, sizes, request=None):
+    """
+    Turns a stored size map into {"thumb": {"webp": url, "jpeg": url}, ...}.
+    Only sizes that have already been rendered for the current file are listed.
+    """
+    return stored_size_urls(field_file.name if field_file else None, sizes, request)
+
+
+def stored_size_urls(name, sizes, request=None):
+    """size_urls() from the stored file name, for rows read with values()."""
+    if not name or not _is_precomputed(name, sizes):
+        return {}
+
+    urls = {}
+    for label in settings.IMAGE_DERIVATIVE_SIZES:
+        formats = sizes.get(label)
+        if formats:
+            urls[label] = {
+                ext: absolute_url(request, url) for ext, url in formats.items()
+            }
+    return urls
+
+
+# -------------------------------------------------------------------------
+# Serializer Fields
+# -------------------------------------------------------------------------
+
+
+class _SizeMapMixin:
+    """
+    Reads the file (via `source`) together with its size-map column
+    (via `sizes_source`) so the URL can come from the precomputed map.
+    """
+
+    def __init__(self, sizes_source=None, **kwargs):
+        kwargs["read_only"] = True
+        self.sizes_source = sizes_source.split(".") if sizes_source else None
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        field_file = super().get_attribute(instance)
+        sizes = None
+        if self.sizes_source and field_file:
+            sizes = get_attribute(instance, self.sizes_source)
+        return (field_file, sizes)
+
+
+class MediaURLField(_SizeMapMixin, serializers.Field):
+    """
+    Read-only replacement for ImageField/FileField output on list endpoints.
+    """
+
+    def to_representation(self, value):
+        field_file, sizes = value
+        return file_url(field_file, sizes, self.context.get("request"))
+
+
+class ImageSizesField(_SizeMapMixin, serializers.Field):
+    """
+    Read-only size map: {"thumb": {"webp": url, "jpeg": url}, ...}.
+    `source` points at the ImageField, `sizes_source` at its JSON column.
+    """
+
+    def to_representation(self, value):
+        field_file, sizes = value
+        return size_urls(field_file, sizes, self.context.get("request"))
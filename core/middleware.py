@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from . import data_version
+
+
+class DataVersionMiddleware:
+    """
+    Conditional GETs for the polled endpoints in DATA_VERSION_PATHS (see
+    core.data_version). A request whose If-None-Match still matches the
+    user's data version gets 304 without running the view; any other
+    successful response is tagged with the current ETag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = frozenset(settings.DATA_VERSION_PATHS)
+        self.auth = JWTAuthentication()
+
+    def __call__(self, request):
+        if request.method not in ("GET", "HEAD") or request.path not in self.paths:
+            return self.get_response(request)
+        user_id = self.user_id(request)
+        if user_id is None:
+            return self.get_response(request)
+
+        # Read the version before the view reads any rows, so a write landing
+        # in between makes the tag older than the body, never newer
+        etag = data_version.etag(user_id, request)
+        if self.matches(request, etag):
+            response = HttpResponseNotModified()
+        else:
+            response = self.get_response(request)
+            if response.status_code != 200 or response.has_header("ETag"):
+                return response
+        response["ETag"] = etag
+        # Per user (by token), and always revalidated
+        patch_vary_headers(response, ("Authorization",))
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def user_id(self, request):
+        """User id from the JWT (signature and expiry checked, no user query)."""
+        header = self.auth.get_header(request)
+        raw_token = self.auth.get_raw_token(header) if header else None
+        if raw_token is None:
+            return None
+        try:
+            token = self.auth.get_validated_token(raw_token)
+        except (InvalidToken, TokenError):
+            return None
+        return token.get(api_settings.USER_ID_CLAIM)
+
+    @staticmethod
+    def matches(request, etag):
+        header = request.headers.get("If-None-Match")
+        if not header:
+            return False
+        # Weak comparison: a proxy may have marked the tag W/
+        etags = [tag.removeprefix("W/") for tag in parse_etags(header)]
+        return etag in etags or "*" in etags
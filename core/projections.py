@@ -0,0 +1,216 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .media import ImageSizesField, MediaURLField, stored_file_url, stored_size_urls
+
+# -------------------------------------------------------------------------
+# Read Projections
+# -------------------------------------------------------------------------
+# A Projection is the read-only twin of a ModelSerializer for list
+# endpoints. It reads only the columns the serializer outputs with values()
+# (related fields through joins) and builds the same dicts from the plain
+# rows: no model instances, no select_related object graphs, no per-field
+# get_attribute() walk.
+#
+# The output fields and their order come from the serializer itself:
+#   - plain fields read the column named by their source ("a.b" -> "a__b");
+#     their value goes through the field's own to_representation(), except
+#     for types that would return it unchanged (strings, ints, booleans, pks)
+#   - MediaURLField / ImageSizesField read the file name and its size map
+#   - everything else (SerializerMethodField, properties) needs a
+#     get_<field>(row) method on the projection; the columns and annotations
+#     (see annotations()) it reads are listed in `requires`
+#
+# Sparse fieldsets: `?fields=a,b` keeps only those fields, and only their
+# columns are selected, so the joins and subqueries of the skipped fields
+# are never part of the query. `?expand=x` adds the related object(s) named
+# in `expandable`, fetched by an expand_<x>(rows) method in one query for
+# the whole page.
+#
+# `manage.py benchmark_projections` compares every projection with its
+# serializer on real rows and times both.
+
+# to_representation() returns database values of these unchanged
+PASSTHROUGH = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def lookup(source):
+    """Serializer source path -> values() path."""
+    return source.replace(".", "__")
+
+
+def model_field(model, source_attrs):
+    """Model field at the end of a dotted serializer source."""
+    for attr in source_attrs[:-1]:
+        model = model._meta.get_field(attr).related_model
+    return model._meta.get_field(source_attrs[-1])
+
+
+def query_list(request, param):
+    """Comma-separated query parameter as a list; None when it is absent."""
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def check_names(param, names, available):
+    """400 for names a `fields`/`expand` parameter doesn't offer."""
+    unknown = [name for name in names or () if name not in available]
+    if unknown:
+        raise ValidationError(
+            {param: f"Unknown: {', '.join(unknown)}. Available: {', '.join(available) or 'none'}."}
+        )
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin for ?fields= on endpoints that still serialize model
+    instances: with context["fields"], only those top-level fields are kept.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = self.context.get("fields")
+        if wanted:
+            for name in [name for name in self.fields if name not in wanted]:
+                self.fields.pop(name)
+
+
+class Projection:
+    serializer_class = None
+    # get_<field>() / expand_<name>() -> the columns or annotations it reads
+    requires = {}
+    # Names accepted by ?expand=
+    expandable = ()
+
+    def __init__(self, context=None, fields=None, expand=None):
+        serializer = self.serializer_class(context=context or {})
+        self.context = serializer.context
+        self.request = self.context.get("request")
+        model = serializer.Meta.model
+
+        readable = [name for name, field in serializer.fields.items() if not field.write_only]
+        check_names("fields", fields, readable)
+        check_names("expand", expand, self.expandable)
+        self.expand = list(dict.fromkeys(expand or ()))
+
+        # One (name, builder) per output field, in serializer order; a builder
+        # takes the row and returns the field's value
+        self.plan = []
+        self.values = set()
+        for name in readable:
+            if fields and name not in fields:
+                continue
+            field = serializer.fields[name]
+            getter = getattr(self, f"get_{name}", None)
+            if getter is not None:
+                self.values.update(self.requires.get(name, ()))
+                self.plan.append((name, getter))
+            elif isinstance(field, (MediaURLField, ImageSizesField)):
+                self.plan.append((name, self._media_builder(model, field)))
+            elif isinstance(field, (serializers.SerializerMethodField, serializers.ReadOnlyField)):
+                raise ImproperlyConfigured(
+                    f"{type(self).__name__} needs a get_{name}(row) method."
+                )
+            else:
+                self.plan.append((name, self._column_builder(field)))
+        for name in self.expand:
+            self.values.update(self.requires.get(name, ()))
+
+    def _column_builder(self, field):
+        column = lookup(field.source)
+        self.values.add(column)
+        if isinstance(field, PASSTHROUGH):
+            return lambda row: row[column]
+        represent = field.to_representation
+        return lambda row: None if row[column] is None else represent(row[column])
+
+    def _media_builder(self, model, field):
+        column = lookup(field.source)
+        sizes = "__".join(field.sizes_source) if field.sizes_source else None
+        self.values.update(filter(None, (column, sizes)))
+        request = self.request
+        if isinstance(field, ImageSizesField):
+            return lambda row: stored_size_urls(row[column], row[sizes] if sizes else None, request)
+        storage = model_field(model, field.source_attrs).storage
+        return lambda row: stored_file_url(
+            storage, row[column], row[sizes] if sizes else None, request
+        )
+
+    def annotations(self):
+        """Subqueries/expressions the get_<field>() methods may read."""
+        return {}
+
+    def fetch(self, queryset, *extra):
+        """
+        queryset as plain rows holding just what the output needs (plus the
+        `extra` columns). Annotations nobody asked for are left out.
+        """
+        annotations = {
+            name: expression
+            for name, expression in self.annotations().items()
+            if name in self.values
+        }
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        columns = self.values.difference(annotations).union(extra)
+        return queryset.values(*columns, *annotations)
+
+    def represent(self, rows):
+        plan = self.plan
+        data = [{name: build(row) for name, build in plan} for row in rows]
+        for name in self.expand:
+            for item, value in zip(data, getattr(self, f"expand_{name}")(rows)):
+                item[name] = value
+        return data
+
+    def data(self, queryset):
+        return self.represent(list(self.fetch(queryset)))
+
+    def by(self, queryset, key):
+        """{row[key]: output} for the rows of queryset (key: any column)."""
+        rows = list(self.fetch(queryset, key))
+        return {row[key]: item for row, item in zip(rows, self.represent(rows))}
+
+    def grouped(self, queryset, key):
+        """{row[key]: [output, ...]} for the rows of queryset, in queryset order."""
+        rows = list(self.fetch(queryset, key))
+        groups = {}
+        for row, item in zip(rows, self.represent(rows)):
+            groups.setdefault(row[key], []).append(item)
+        return groups
+
+
+class ProjectedListMixin:
+    """
+    For generic list views: list() serves `projection_class` rows instead of
+    serializing model instances, honouring ?fields= and ?expand=. Filtering,
+    ordering and pagination are unchanged; writes still go through
+    serializer_class.
+    """
+
+    projection_class = None
+
+    def get_projection(self):
+        return self.projection_class(
+            context=self.get_serializer_context(),
+            fields=query_list(self.request, "fields"),
+            expand=query_list(self.request, "expand"),
+        )
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_projection()
+        rows = projection.fetch(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(projection.represent(list(page)))
+        return Response(projection.represent(list(rows)))
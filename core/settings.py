@@ -3,6 +3,7 @@ import cloudinary
 from pathlib import Path
 from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -52,12 +53,15 @@ INSTALLED_APPS = [
     "cloudinary_storage",  # Keep below staticfiles to avoid hijacking collectstatic
     "cloudinary",
     # Custom Apps
+    "core",
     "account",
     "investment",
     "portfolio",
     "documents",
     "notification",
     "payment",
+    "benchmarks",
+    "observability",
     # Third Party Apps
     "rest_framework",
     "corsheaders",
@@ -66,13 +70,22 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so every log line of the request carries its ID
+    "observability.middleware.RequestIdMiddleware",
+    # Early, so latency covers the whole stack
+    "observability.middleware.MetricsMiddleware",
+    "observability.middleware.TracingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
+    # Answers If-None-Match polls with 304 before session auth and the view
+    "core.middleware.DataVersionMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # After auth, so staff sessions can switch profiling on
+    "observability.middleware.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -107,6 +120,27 @@ DATABASES = {
     }
 }
 
+# =========================================================
+#  Cache
+# =========================================================
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "bugaking-default",
+        # Media URLs are cached per file; the default of 300 entries thrashes
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
+    # Data version tokens (core.data_version) must be the same in every
+    # worker, so they live in the database, not in process memory. The table
+    # is created by core's migrations (or `manage.py createcachetable`).
+    "data_versions": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "core_data_version_cache",
+        # One token per active user, plus the shared one
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+}
+
 # =========================================================
 #  Authentication & API
 # =========================================================
@@ -115,12 +149,43 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    # orjson instead of the json module (see core.renderers); same output
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
+# Idempotent writes (core.idempotency): a request repeated with the same
+# Idempotency-Key (or a re-sent webhook) gets the stored response for
+# IDEMPOTENCY_KEY_TTL seconds. A key whose first request has not finished
+# within IDEMPOTENCY_LOCK_TIMEOUT seconds is assumed abandoned.
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+
+# Conditional GETs (core.data_version): these polled endpoints get an ETag
+# from the user's data version, and a matching If-None-Match is answered
+# with 304 without running the view
+DATA_VERSION_PATHS = (
+    "/api/client-investments/",
+    "/api/transactions/",
+    "/api/dashboard/summary/",
+    "/api/documents/",
+    "/api/notifications/",
+)
+DATA_VERSION_TIMEOUT = 60 * 60 * 24 * 7
+
 # =========================================================
 #  Email Configuration
 # =========================================================
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Mail goes through the tracing wrapper, which delivers via TRACED_EMAIL_BACKEND
+EMAIL_BACKEND = "observability.mail.TracedEmailBackend"
+TRACED_EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = get_env_variable("EMAIL_HOST", "smtp.gmail.com")
 EMAIL_PORT = int(get_env_variable("EMAIL_PORT", "465"))
 EMAIL_USE_SSL = get_env_variable("EMAIL_USE_SSL", "True").lower() == "true"
@@ -168,13 +233,57 @@ STORAGES = {
         "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
     },
     "default": {
-        "BACKEND": "cloudinary_storage.storage.MediaCloudinaryStorage",
+        # MediaCloudinaryStorage with tracing spans around its network calls
+        "BACKEND": "observability.storage.TracedMediaCloudinaryStorage",
     },
 }
 
 # Legacy support for older packages
 STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
+# 5. Responsive Images
+# Max edge (px) of each derivative generated for project/profile images.
+# "thumb" covers 40px avatars on 2x screens.
+IMAGE_DERIVATIVE_SIZES = {
+    "thumb": 80,
+    "small": 320,
+    "medium": 768,
+    "large": 1280,
+}
+IMAGE_DERIVATIVE_WORKERS = 2
+# Set to False to resize inline (e.g. in management commands or tests)
+IMAGE_DERIVATIVES_ASYNC = True
+# How long a computed storage URL is reused for files without a precomputed one
+MEDIA_URL_CACHE_TIMEOUT = 60 * 60 * 24
+
+# 6. Document Downloads
+# "x-accel-redirect" (nginx) or "x-sendfile" (Apache) hands local files to the
+# web server. Leave empty to stream from Django in chunks.
+DOCUMENT_DOWNLOAD_OFFLOAD = get_env_variable("DOCUMENT_DOWNLOAD_OFFLOAD", "").lower()
+DOCUMENT_DOWNLOAD_ACCEL_PREFIX = "/protected-media/"
+DOCUMENT_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Lifetime (seconds) of signed URLs handed out for remote storage backends
+DOCUMENT_DOWNLOAD_URL_TTL = 300
+
+# 7. Data Exports
+# Rows fetched per query by the streaming CSV/XLSX exports (core.exports)
+EXPORT_CHUNK_SIZE = 2000
+
+# =========================================================
+#  Investments
+# =========================================================
+# Per-project funding counters (committed / collected / investors) are spread
+# over this many rows, so concurrent investments in one project don't all
+# queue on the same row lock (see investment.funding)
+FUNDING_COUNTER_SHARDS = 8
+
+# ROI projections (investment.roi): expected_roi_percent is yearly, paid out
+# every ROI_PAYOUT_INTERVAL_DAYS; projections cover ROI_PROJECTION_PERIODS
+# payouts and are cached per investment
+ROI_PAYOUT_INTERVAL_DAYS = 30
+ROI_PROJECTION_PERIODS = 12
+ROI_CACHE_TIMEOUT = 60 * 60 * 24
+
 # =========================================================
 #  CORS & Security
 # =========================================================
@@ -182,6 +291,8 @@ STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
 
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+CORS_EXPOSE_HEADERS = ["ETag"]
 CORS_ALLOWED_ORIGINS = [
     "https://bugaking.vercel.app",
     "http://127.0.0.1:3000",
@@ -197,4 +308,105 @@ CORS_ALLOWED_ORIGIN_REGEXES = [
 CSRF_TRUSTED_ORIGINS = [
     "https://31d3954f598a.ngrok-free.app",
     "https://bugaking.vercel.app",
-]
\ No newline at end of file
+]
+
+# =========================================================
+#  Observability
+# =========================================================
+# Optional bearer token so Prometheus can scrape /metrics without a staff login
+METRICS_TOKEN = get_env_variable("METRICS_TOKEN", "")
+
+# Per-request profiling. Staff send "X-Profile: 1" or "?_profile=1"; a random
+# PROFILING_SAMPLE_RATE fraction of all requests is profiled too.
+PROFILING_ENABLED = get_env_variable("PROFILING_ENABLED", "True") == "True"
+PROFILING_SAMPLE_RATE = float(get_env_variable("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_HEADER = "X-Profile"
+PROFILING_QUERY_PARAM = "_profile"
+PROFILING_DIR = BASE_DIR / "var" / "profiles"
+PROFILING_MAX_ARTIFACTS = 200
+PROFILING_REPORT_LINES = 40
+PROFILING_TRACEMALLOC_FRAMES = 1
+
+# Statements slower than this are kept in a ring buffer and flushed to the
+# SlowQuery table (see the admin)
+SLOW_QUERY_THRESHOLD_MS = float(get_env_variable("SLOW_QUERY_THRESHOLD_MS", "100"))
+SLOW_QUERY_BUFFER_SIZE = 500
+SLOW_QUERY_FLUSH_INTERVAL = 30
+SLOW_QUERY_RETENTION_DAYS = 14
+
+# Tracing: every request gets a trace ID (X-Trace-Id, and trace_id in logs);
+# spans are recorded for TRACING_SAMPLE_RATE of them and exported by
+# TRACING_EXPORTER: "jsonl" (TRACING_FILE, rotated), "otlp"
+# (TRACING_OTLP_ENDPOINT) or "" (the default) to disable.
+TRACING_EXPORTER = get_env_variable("TRACING_EXPORTER", "")
+TRACING_SAMPLE_RATE = float(get_env_variable("TRACING_SAMPLE_RATE", "0.01"))
+TRACING_FILE = BASE_DIR / "var" / "traces.jsonl"
+TRACING_FILE_MAX_BYTES = 50 * 1024 * 1024
+TRACING_FILE_BACKUPS = 5
+TRACING_OTLP_ENDPOINT = get_env_variable(
+    "TRACING_OTLP_ENDPOINT", "http://127.0.0.1:4318/v1/traces"
+)
+TRACING_SERVICE_NAME = "bugaking-api"
+TRACING_QUEUE_SIZE = 1000
+
+# =========================================================
+#  Logging
+# =========================================================
+# JSON lines on stderr, written by a background thread (QueuedHandler) so
+# request threads never wait on I/O. Levels: LOG_LEVEL for everything, plus
+# per-logger overrides, e.g. LOG_LEVELS="payment=DEBUG,django.db.backends=DEBUG".
+LOG_LEVEL = get_env_variable("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = {
+    name.strip(): level.strip().upper()
+    for name, _, level in (
+        item.partition("=")
+        for item in get_env_variable("LOG_LEVELS", "").split(",")
+        if "=" in item
+    )
+}
+LOG_FORMAT = get_env_variable("LOG_FORMAT", "json")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "filters": {
+        "request_context": {"()": "observability.log.RequestContextFilter"},
+    },
+    "formatters": {
+        "json": {"()": "observability.log.JsonFormatter"},
+        "text": {
+            "format": "{asctime} {levelname} {name} [req={request_id} trace={trace_id}] {message}",
+            "style": "{",
+        },
+    },
+    "handlers": {
+        "queue": {
+            # A factory, not "class": see make_queued_handler()
+            "()": "observability.log.make_queued_handler",
+            "filters": ["request_context"],
+            "formatter": LOG_FORMAT,
+        },
+    },
+    "root": {"handlers": ["queue"], "level": LOG_LEVEL},
+    "loggers": {
+        # Django's own console handler would print these a second time
+        "django": {"handlers": ["queue"], "level": LOG_LEVEL, "propagate": False},
+        # One entry per statement: opt in with LOG_LEVELS="django.db.backends=DEBUG"
+        "django.db.backends": {"level": "INFO"},
+        **{
+            app: {"level": LOG_LEVEL}
+            for app in (
+                "account",
+                "benchmarks",
+                "core",
+                "documents",
+                "investment",
+                "notification",
+                "observability",
+                "payment",
+                "portfolio",
+            )
+        },
+        **{name: {"level": level} for name, level in LOG_LEVELS.items()},
+    },
+}
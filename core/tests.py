@@ -0,0 +1,225 @@
+import datetime
+
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from benchmarks import seed
+from investment.models import ClientInvestment, ProjectPricing
+from . import data_version, idempotency
+from .checks import check_data_version_cache
+from .models import IdempotencyKey
+
+
+class IdempotencyTests(TestCase):
+    """begin() / finish() / abandon() (see core.idempotency)."""
+
+    scope = "test"
+
+    def test_first_request_claims_the_key(self):
+        record, replay = idempotency.begin(self.scope, "k1", "body")
+        self.assertFalse(replay)
+        self.assertFalse(record.finished)
+        self.assertTrue(IdempotencyKey.objects.filter(scope=self.scope, key="k1").exists())
+
+    def test_finished_key_replays_the_stored_response(self):
+        record, _ = idempotency.begin(self.scope, "k1", "body")
+        idempotency.finish(record, 201, {"id": 7})
+
+        record, replay = idempotency.begin(self.scope, "k1", "body")
+        self.assertTrue(replay)
+        self.assertEqual((record.status_code, record.response_body), (201, {"id": 7}))
+
+    def test_unfinished_key_is_in_progress(self):
+        idempotency.begin(self.scope, "k1", "body")
+        with self.assertRaises(idempotency.InProgress):
+            idempotency.begin(self.scope, "k1", "body")
+
+    def test_key_reused_for_another_payload(self):
+        record, _ = idempotency.begin(self.scope, "k1", "body")
+        idempotency.finish(record, 201, {"id": 7})
+        with self.assertRaises(idempotency.KeyReused):
+            idempotency.begin(self.scope, "k1", "other body")
+
+    def test_scopes_are_separate(self):
+        idempotency.begin("user:1", "k1", "body")
+        _, replay = idempotency.begin("user:2", "k1", "body")
+        self.assertFalse(replay)
+
+    def test_abandoned_claim_is_taken_over_after_the_lock_timeout(self):
+        stale, _ = idempotency.begin(self.scope, "k1", "body")
+        timeout = datetime.timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+
+        # Still inside the lock timeout: the first request may be running
+        IdempotencyKey.objects.filter(pk=stale.pk).update(
+            started_at=timezone.now() - timeout + datetime.timedelta(seconds=5)
+        )
+        with self.assertRaises(idempotency.InProgress):
+            idempotency.begin(self.scope, "k1", "body")
+
+        # Past it: the next request takes the key over...
+        IdempotencyKey.objects.filter(pk=stale.pk).update(
+            started_at=timezone.now() - timeout - datetime.timedelta(seconds=1)
+        )
+        stale.refresh_from_db()
+        record, replay = idempotency.begin(self.scope, "k1", "body")
+        self.assertFalse(replay)
+        self.assertGreater(record.started_at, stale.started_at)
+
+        # ...and the crashed one can no longer store or release it
+        idempotency.finish(stale, 500, {"error": "late"})
+        idempotency.abandon(stale)
+        idempotency.finish(record, 201, {"id": 8})
+        record, replay = idempotency.begin(self.scope, "k1", "body")
+        self.assertTrue(replay)
+        self.assertEqual(record.response_body, {"id": 8})
+
+    def test_abandoned_key_runs_again(self):
+        record, _ = idempotency.begin(self.scope, "k1", "body")
+        idempotency.abandon(record)
+        _, replay = idempotency.begin(self.scope, "k1", "body")
+        self.assertFalse(replay)
+
+    def test_expired_key_runs_again(self):
+        record, _ = idempotency.begin(self.scope, "k1", "body")
+        idempotency.finish(record, 201, {"id": 7})
+        IdempotencyKey.objects.filter(pk=record.pk).update(expires_at=timezone.now())
+        _, replay = idempotency.begin(self.scope, "k1", "other body")
+        self.assertFalse(replay)
+
+    def test_prune_deletes_expired_keys(self):
+        record, _ = idempotency.begin(self.scope, "k1", "body")
+        idempotency.begin(self.scope, "k2", "body")
+        IdempotencyKey.objects.filter(pk=record.pk).update(expires_at=timezone.now())
+        self.assertEqual(idempotency.prune(), 1)
+        self.assertEqual(list(IdempotencyKey.objects.values_list("key", flat=True)), ["k2"])
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+)
+class IdempotentCreateTests(TestCase):
+    """The @idempotent decorator on POST /api/investments/create/."""
+
+    path = "/api/investments/create/"
+
+    @classmethod
+    def setUpTestData(cls):
+        seed.seed(
+            users=1, projects=1, investments_per_user=1, notifications_per_user=0, documents_per_user=0
+        )
+        cls.user = seed.bench_users().get()
+        cls.pricing = ProjectPricing.objects.order_by("pk").first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create(self, key, pricing=None):
+        return self.client.post(
+            self.path,
+            {"pricing_id": (pricing or self.pricing).pk},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def investments(self):
+        return ClientInvestment.objects.filter(user=self.user).count()
+
+    def test_repeat_replays_the_first_response(self):
+        before = self.investments()
+        first = self.create("retry-1")
+        second = self.create("retry-1")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(self.investments(), before + 1)
+
+    def test_request_still_running_gets_409(self):
+        body = {"pricing_id": self.pricing.pk}
+        idempotency.begin(
+            f"investment-create:{self.user.pk}",
+            "busy",
+            idempotency.fingerprint("POST", self.path, body),
+        )
+        before = self.investments()
+        self.assertEqual(self.create("busy").status_code, 409)
+        self.assertEqual(self.investments(), before)
+
+    def test_key_reused_with_another_body_gets_422(self):
+        other = ProjectPricing.objects.exclude(pk=self.pricing.pk).order_by("pk").first()
+        self.assertEqual(self.create("reused").status_code, 201)
+        before = self.investments()
+        self.assertEqual(self.create("reused", pricing=other).status_code, 422)
+        self.assertEqual(self.investments(), before)
+
+    def test_keys_are_per_user(self):
+        other_user = seed.bench_staff()
+        self.assertEqual(self.create("shared").status_code, 201)
+        self.client.force_authenticate(other_user)
+        response = self.create("shared")
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+
+    def test_without_a_key_every_request_runs(self):
+        before = self.investments()
+        self.client.post(self.path, {"pricing_id": self.pricing.pk}, format="json")
+        self.client.post(self.path, {"pricing_id": self.pricing.pk}, format="json")
+        self.assertEqual(self.investments(), before + 2)
+
+
+class DataVersionCacheTests(TestCase):
+    """Version tokens are kept where every worker reads them (see core.data_version)."""
+
+    def test_tokens_are_stored_in_the_database(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            data_version.bump(1)
+        table = settings.CACHES[data_version.CACHE_ALIAS]["LOCATION"]
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT cache_key FROM {table}")
+            keys = [key for (key,) in cursor.fetchall()]
+        self.assertIn(":1:data-version:1", keys)
+
+    def test_bump_replaces_the_token(self):
+        before = data_version.current(1)
+        self.assertEqual(data_version.current(1), before)
+        with self.captureOnCommitCallbacks(execute=True):
+            data_version.bump(1)
+        self.assertNotEqual(data_version.current(1), before)
+
+
+class DataVersionCacheCheckTests(SimpleTestCase):
+    """core.checks.check_data_version_cache"""
+
+    def test_shared_backend_passes(self):
+        self.assertEqual(check_data_version_cache(None), [])
+
+    def test_process_local_backend_warns(self):
+        caches = {
+            **settings.CACHES,
+            "data_versions": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        }
+        with override_settings(CACHES=caches):
+            (warning,) = check_data_version_cache(None)
+        self.assertEqual(warning.id, "core.W001")
+
+    def test_missing_alias_is_an_error(self):
+        caches = {"default": settings.CACHES["default"]}
+        with override_settings(CACHES=caches):
+            (error,) = check_data_version_cache(None)
+        self.assertEqual(error.id, "core.E001")
+
+    def test_nothing_to_check_without_the_middleware(self):
+        middleware = [
+            name for name in settings.MIDDLEWARE if name != "core.middleware.DataVersionMiddleware"
+        ]
+        caches = {"default": settings.CACHES["default"]}
+        with override_settings(MIDDLEWARE=middleware, CACHES=caches):
+            self.assertEqual(check_data_version_cache(None), [])
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from observability.views import metrics_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -10,6 +11,7 @@ urlpatterns = [
     path("api/", include("documents.urls")),
     path("api/", include("notification.urls")),
     path("api/", include("payment.urls")),
+    path("metrics", metrics_view, name="metrics"),
     # other paths
 ]
 if settings.DEBUG:
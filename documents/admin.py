@@ -20,10 +20,13 @@ class DocumentAdmin(admin.ModelAdmin):
     # 3. Search box functionality (searches title and the user's email)
     search_fields = ("title", "user__email", "user__first_name", "user__last_name")
 
-    # 4. Fields that cannot be edited manually (since they are auto-calculated)
+    # 4. user_email reads the user on every row
+    list_select_related = ("user",)
+
+    # 5. Fields that cannot be edited manually (since they are auto-calculated)
     readonly_fields = ("file_size", "file_type", "created_at", "updated_at")
 
-    # 5. Organize the edit form into neat sections
+    # 6. Organize the edit form into neat sections
     fieldsets = (
         ("Ownership & File", {"fields": ("user", "title", "file", "category")}),
         (
@@ -1,4 +1,7 @@
 from rest_framework import serializers
+from django.urls import reverse
+from core.media import absolute_url
+from core.projections import Projection
 from .models import Document
 
 class DocumentSerializer(serializers.ModelSerializer):
@@ -24,7 +27,26 @@ class DocumentSerializer(serializers.ModelSerializer):
         return obj.created_at.strftime("%b %d, %Y")
 
     def get_file_url(self, obj):
+        # Point at the owner-checked download endpoint, never the raw storage URL
         request = self.context.get('request')
         if obj.file and request:
-            return request.build_absolute_uri(obj.file.url)
-        return None
\ No newline at end of file
+            return absolute_url(request, reverse('document-download', args=[obj.pk]))
+        return None
+
+
+class DocumentProjection(Projection):
+    """DocumentSerializer output from values() rows (list endpoint)."""
+
+    serializer_class = DocumentSerializer
+    requires = {
+        "upload_date": ("created_at",),
+        "file_url": ("id", "file"),
+    }
+
+    def get_upload_date(self, row):
+        return row["created_at"].strftime("%b %d, %Y")
+
+    def get_file_url(self, row):
+        if row["file"] and self.request:
+            return absolute_url(self.request, reverse('document-download', args=[row["id"]]))
+        return None
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import data_version
+from .models import Document
+
+
+# --- SIGNAL 1: DATA VERSIONS FOR CONDITIONAL GETS ---
+@receiver(post_save, sender=Document)
+@receiver(post_delete, sender=Document)
+def bump_document_version(sender, instance, **kwargs):
+    data_version.bump(instance.user_id)
@@ -0,0 +1,224 @@
+import mimetypes
+import os
+import re
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+
+# -------------------------------------------------------------------------
+# Document Download Helpers
+# -------------------------------------------------------------------------
+# Three strategies, tried in this order by build_download_response():
+#   1. Hand the file to the web server (X-Accel-Redirect / X-Sendfile).
+#   2. Stream it from local disk in chunks, honouring HTTP Range.
+#   3. Redirect to a short-lived signed URL on the remote storage backend.
+# None of them read the whole file into Python memory.
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _local_path(field_file):
+    """
+    Returns the absolute path when the storage keeps files on local disk,
+    otherwise None (e.g. Cloudinary or S3).
+    """
+    try:
+        return field_file.storage.path(field_file.name)
+    except NotImplementedError:
+        return None
+
+
+def _validators(document, size):
+    """
+    ETag + Last-Modified for conditional requests.
+    The ETag changes whenever the row is saved or the file is swapped.
+    """
+    last_modified = int(document.updated_at.timestamp())
+    etag = f'"doc-{document.pk}-{last_modified}-{size}"'
+    return etag, last_modified
+
+
+def _parse_range(header, size):
+    """
+    Parses a single "bytes=start-end" range.
+    Returns (start, end) inclusive, None if the header should be ignored
+    (absent, malformed or multi-range), or False if unsatisfiable.
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        # Multi-range requests are allowed to fall back to a full 200 response
+        return None
+
+    start, end = match.groups()
+    if start == "" and end == "":
+        return None
+
+    if start == "":
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(request, etag, last_modified):
+    """
+    If-Range lets a client resume only if the file has not changed.
+    """
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _file_chunks(path, start, length, chunk_size):
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _base_headers(response, filename, etag, last_modified):
+    response["Content-Disposition"] = content_disposition_header(
+        as_attachment=False, filename=filename
+    )
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _offload_response(path, document, content_type):
+    mode = settings.DOCUMENT_DOWNLOAD_OFFLOAD
+    response = HttpResponse(content_type=content_type)
+
+    if mode == "x-accel-redirect":
+        # Nginx maps this prefix to MEDIA_ROOT in an "internal" location
+        prefix = settings.DOCUMENT_DOWNLOAD_ACCEL_PREFIX.rstrip("/")
+        response["X-Accel-Redirect"] = quote(f"{prefix}/{document.file.name}")
+    else:
+        response["X-Sendfile"] = path
+    return response
+
+
+def _stream_response(request, path, size, content_type, etag, last_modified):
+    chunk_size = settings.DOCUMENT_DOWNLOAD_CHUNK_SIZE
+    byte_range = None
+    if _if_range_matches(request, etag, last_modified):
+        byte_range = _parse_range(request.META.get("HTTP_RANGE"), size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        (start, end), status_code = byte_range, 206
+
+    length = end - start + 1 if size else 0
+    response = StreamingHttpResponse(
+        _file_chunks(path, start, length, chunk_size),
+        status=status_code,
+        content_type=content_type,
+    )
+    response["Content-Length"] = str(length)
+    response["Accept-Ranges"] = "bytes"
+    if status_code == 206:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
+
+
+def signed_storage_url(field_file, ttl):
+    """
+    Builds a URL for a remote backend that stops working after `ttl` seconds.
+    """
+    storage = field_file.storage
+    name = field_file.name
+
+    # Cloudinary: signed API download URL with an expiry timestamp
+    if hasattr(storage, "_get_resource_type"):
+        import cloudinary.utils
+
+        public_id, extension = os.path.splitext(storage._prepend_prefix(name))
+        resource_type = storage._get_resource_type(name)
+        if resource_type == "raw":
+            # Raw assets keep their extension as part of the public id
+            public_id, extension = public_id + extension, ""
+        return cloudinary.utils.private_download_url(
+            public_id,
+            extension.lstrip("."),
+            resource_type=resource_type,
+            type="upload",
+            expires_at=int(time.time()) + ttl,
+        )
+
+    # S3 / R2 via django-storages: pre-signed query string
+    try:
+        return storage.url(name, expire=ttl)
+    except TypeError:
+        return storage.url(name)
+
+
+def build_download_response(request, document):
+    field_file = document.file
+    filename = os.path.basename(field_file.name)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    path = _local_path(field_file)
+
+    try:
+        size = os.path.getsize(path) if path else 0
+    except FileNotFoundError:
+        # The row outlived its file (deleted or never synced to this host)
+        raise Http404("Document file not found.")
+    etag, last_modified = _validators(document, size)
+
+    # 1. 304 / 412 before touching the file at all
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if not_modified is not None:
+        return _base_headers(not_modified, filename, etag, last_modified)
+
+    # 2. Remote storage: never proxy the bytes through this worker
+    if path is None:
+        response = HttpResponseRedirect(
+            signed_storage_url(field_file, settings.DOCUMENT_DOWNLOAD_URL_TTL)
+        )
+        response["Cache-Control"] = "private, no-store"
+        return response
+
+    # 3. Local storage: let the web server send it if it can, else stream
+    if settings.DOCUMENT_DOWNLOAD_OFFLOAD:
+        response = _offload_response(path, document, content_type)
+    else:
+        response = _stream_response(
+            request, path, size, content_type, etag, last_modified
+        )
+    return _base_headers(response, filename, etag, last_modified)
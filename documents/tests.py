@@ -1,3 +1,43 @@
-from django.test import TestCase
+from django.test import override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from investment.tests import LOCAL_STORAGES, ProjectionTestCase, seed_rows
+from .models import Document
+from .serializers import DocumentProjection, DocumentSerializer
+
+
+@override_settings(STORAGES=LOCAL_STORAGES, MEDIA_URL="/media/")
+class DocumentProjectionTests(ProjectionTestCase):
+    """DocumentProjection against DocumentSerializer (see investment.tests)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = seed_rows()
+        # A row whose file was cleared: no download URL
+        missing = rng.choice(list(Document.objects.order_by("pk").values_list("pk", flat=True)))
+        Document.objects.filter(pk=missing).update(file="")
+
+    def documents(self):
+        return Document.objects.order_by("pk")
+
+    def test_matches_serializer(self):
+        self.assertMatchesSerializer(DocumentProjection, DocumentSerializer, self.documents())
+
+    def test_without_request(self):
+        # No request in the context: file_url is None, as in the serializer
+        self.context = {}
+        self.assertMatchesSerializer(DocumentProjection, DocumentSerializer, self.documents())
+
+    def test_missing_file_has_no_url(self):
+        data = DocumentProjection(context=self.context).data(self.documents())
+        self.assertIn(None, [row["file_url"] for row in data])
+
+    def test_list_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.documents().first().user)
+        response = client.get("/api/documents/", {"fields": "id,title"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()[0]), ["id", "title"])
+        # Nothing to expand on documents
+        self.assertEqual(client.get("/api/documents/", {"expand": "user"}).status_code, 400)
+        self.assertEqual(client.get("/api/documents/", {"fields": "file"}).status_code, 400)
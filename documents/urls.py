@@ -1,7 +1,12 @@
 from django.urls import path
-from .views import DocumentListView, DocumentStatsView
+from .views import DocumentDownloadView, DocumentListView, DocumentStatsView
 
 urlpatterns = [
     path("documents/", DocumentListView.as_view(), name="document-list"),
     path("documents/stats/", DocumentStatsView.as_view(), name="document-stats"),
+    path(
+        "documents/<int:pk>/download/",
+        DocumentDownloadView.as_view(),
+        name="document-download",
+    ),
 ]
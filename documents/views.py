@@ -1,12 +1,17 @@
 from rest_framework import generics, permissions, filters
+from django.shortcuts import get_object_or_404
 from .models import Document
-from .serializers import DocumentSerializer
+from core.projections import ProjectedListMixin
+from .serializers import DocumentProjection, DocumentSerializer
+from .streaming import build_download_response
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
 
-class DocumentListView(generics.ListCreateAPIView):
+class DocumentListView(ProjectedListMixin, generics.ListCreateAPIView):
     serializer_class = DocumentSerializer
+    # Optimization: the list is read with values() (see DocumentProjection)
+    projection_class = DocumentProjection
     permission_classes = [permissions.IsAuthenticated]
 
     # Enable search and filtering functionality
@@ -42,3 +47,17 @@ class DocumentStatsView(APIView):
                 "reports": user_docs.filter(category="report").count(),
             }
         )
+
+
+class DocumentDownloadView(APIView):
+    """
+    GET: Download a document the current user owns.
+    Supports Range / If-Range / If-None-Match so large PDFs can resume.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        # Strictly filter by owner so document IDs cannot be guessed
+        document = get_object_or_404(Document, pk=pk, user=request.user)
+        return build_download_response(request, document)
@@ -1,8 +1,8 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.utils.html import format_html
 from django.utils.timezone import now
 from django.db import IntegrityError, transaction
-from django.db import models
+from django.db.models import Count, Q
 from .models import (
     InvestmentPlan,
     InvestmentProject,
@@ -10,6 +10,9 @@ from .models import (
     ClientInvestment,
     PaymentSchedule,
 )
+from .services import recalculate
+from .exports import CLIENT_INVESTMENT_COLUMNS, PAYMENT_SCHEDULE_COLUMNS
+from core.exports import export_actions
 
 
 
@@ -37,6 +40,8 @@ class ProjectPricingAdmin(admin.ModelAdmin):
     )
     list_filter = ("plan", "project__investment_type")
     autocomplete_fields = ["project", "plan"]
+    # __str__ of both FKs is rendered per row
+    list_select_related = ("project", "plan")
 
     @admin.display(description="Total Price")
     def formatted_total_price(self, obj):
@@ -174,6 +179,7 @@ class ClientInvestmentAdmin(admin.ModelAdmin):
     )
     autocomplete_fields = ["user", "selected_option"]
     inlines = [PaymentScheduleInline]
+    list_select_related = ("user", "selected_option__project")
 
     readonly_fields = (
         "formatted_balance",
@@ -207,7 +213,19 @@ class ClientInvestmentAdmin(admin.ModelAdmin):
         ),
     )
 
-    actions = ["regenerate_schedules_action", "mark_as_completed"]
+    actions = [
+        "regenerate_schedules_action",
+        "mark_as_completed",
+        *export_actions(CLIENT_INVESTMENT_COLUMNS, "client-investments"),
+    ]
+
+    def get_queryset(self, request):
+        # Optimization: installment counts for the whole page in the main query
+        # (conditional COUNT) instead of two count() queries per row
+        return super().get_queryset(request).annotate(
+            schedules_total=Count("schedules"),
+            schedules_paid=Count("schedules", filter=Q(schedules__status="paid")),
+        )
 
     @admin.display(description="Project")
     def get_project_name(self, obj):
@@ -231,9 +249,7 @@ class ClientInvestmentAdmin(admin.ModelAdmin):
 
     @admin.display(description="Installments")
     def schedule_count(self, obj):
-        total = obj.schedules.count()
-        paid = obj.schedules.filter(status="paid").count()
-        return f"{paid}/{total}"
+        return f"{obj.schedules_paid}/{obj.schedules_total}"
 
     @admin.display(description="Status")
     def status_badge(self, obj):
@@ -253,19 +269,31 @@ class ClientInvestmentAdmin(admin.ModelAdmin):
 
     @admin.action(description="🔄 Refresh Schedule Status")
     def regenerate_schedules_action(self, request, queryset):
-        for investment in queryset:
-            # We trigger the signal logic manually for older records
-            stats = investment.schedules.filter(status='paid').aggregate(total=models.Sum('amount'))
-            investment.amount_paid = stats['total'] or 0
-            investment.save()
+        # One UPDATE per chunk instead of a save() (and its signals) per row
+        changed = recalculate(queryset)
         self.message_user(
-            request, f"Recalculated financials for {queryset.count()} investment(s)."
+            request,
+            f"Recalculated financials for {queryset.count()} investment(s); {changed} changed.",
         )
 
-    @admin.action(description="✅ Mark as Completed")
+    @admin.action(description="✅ Mark as Completed (fully paid only)")
     def mark_as_completed(self, request, queryset):
-        queryset.update(status="completed", next_payment_date=None)
-        self.message_user(request, "Selected investments marked as completed.")
+        # Status only: completion is derived from the paid installments (see
+        # recalculate), so only fully paid investments can be completed here.
+        # Installments are never marked paid from admin, because no
+        # Transaction would back that money.
+        recalculate(queryset)
+        unpaid = queryset.filter(status__in=("pending", "paying")).count()
+        self.message_user(
+            request, f"{queryset.count() - unpaid} fully paid investment(s) are completed."
+        )
+        if unpaid:
+            self.message_user(
+                request,
+                f"{unpaid} investment(s) still have unpaid installments and were left "
+                "as they are; record their payments first.",
+                level=messages.WARNING,
+            )
 
     def save_model(self, request, obj, form, change):
         """
@@ -316,6 +344,7 @@ class PaymentScheduleAdmin(admin.ModelAdmin):
         "investment__user",
         "investment__selected_option__project",
     )
+    actions = export_actions(PAYMENT_SCHEDULE_COLUMNS, "payment-schedules")
 
     @admin.display(description="User")
     def get_investment_user(self, obj):
@@ -0,0 +1,36 @@
+from core.exports import Column
+
+# Columns of the CSV/XLSX exports (admin actions and staff API)
+
+CLIENT_INVESTMENT_COLUMNS = (
+    Column("Investment ID", "pk"),
+    Column("Created", "created_at"),
+    Column("Email", "user.email"),
+    Column("First Name", "user.first_name"),
+    Column("Last Name", "user.last_name"),
+    Column("Project", "selected_option.project.name"),
+    Column("Investment Type", "selected_option.project.investment_type"),
+    Column("Plan", "selected_option.plan.name"),
+    Column("Payment Mode", "selected_option.plan.payment_mode"),
+    Column("Start Date", "start_date"),
+    Column("Agreed Amount (NGN)", "agreed_amount"),
+    Column("Installment Amount (NGN)", "installment_amount"),
+    Column("Amount Paid (NGN)", "amount_paid"),
+    Column("Balance (NGN)", "balance"),
+    Column("Status", "status"),
+    Column("Next Payment", "next_payment_date"),
+)
+CLIENT_INVESTMENT_RELATED = ("user", "selected_option__project", "selected_option__plan")
+
+PAYMENT_SCHEDULE_COLUMNS = (
+    Column("Investment ID", "investment_id"),
+    Column("Email", "investment.user.email"),
+    Column("Project", "investment.selected_option.project.name"),
+    Column("Installment", "installment_number"),
+    Column("Title", "title"),
+    Column("Due Date", "due_date"),
+    Column("Amount (NGN)", "amount"),
+    Column("Status", "status"),
+    Column("Date Paid", "date_paid"),
+)
+PAYMENT_SCHEDULE_RELATED = ("investment__user", "investment__selected_option__project")
@@ -0,0 +1,193 @@
+import random
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import ClientInvestment, ProjectFundingShard, ProjectPricing
+
+# -------------------------------------------------------------------------
+# Project Funding Counters
+# -------------------------------------------------------------------------
+# "₦X committed / ₦Y collected / N investors" per InvestmentProject, kept in
+# ProjectFundingShard rows so the catalog never aggregates ClientInvestment.
+#
+# Every change adds a delta to ONE randomly chosen shard of the project
+# (UPDATE ... SET committed = committed + %s), inside the caller's
+# transaction. During a funding rush concurrent investments mostly hit
+# different rows instead of all waiting on a single project row lock.
+# Readers sum the shards (annotate()).
+#
+#   created:    committed += agreed_amount, collected += amount_paid,
+#               investors += 1 if it is the user's first in the project
+#   paid:       collected += change in amount_paid (save() or recalculate())
+#   cancelled:  the reverse of created (the investment row is deleted)
+#
+# rebuild() recomputes everything from ClientInvestment (after bulk loads).
+
+MONEY = DecimalField(max_digits=16, decimal_places=2)
+ZERO = Decimal("0.00")
+
+
+def add(project_id, committed=ZERO, collected=ZERO, investors=0):
+    """Adds the deltas to a random shard of the project."""
+    if not (committed or collected or investors):
+        return
+    shard = random.randrange(settings.FUNDING_COUNTER_SHARDS)
+    rows = ProjectFundingShard.objects.filter(project_id=project_id, shard=shard)
+    changes = {
+        "committed": F("committed") + committed,
+        "collected": F("collected") + collected,
+        "investors": F("investors") + investors,
+    }
+    # No savepoint of our own: the UPDATE is atomic, and get_or_create()
+    # handles a concurrent first write to the same shard
+    if not rows.update(**changes):
+        ProjectFundingShard.objects.get_or_create(project_id=project_id, shard=shard)
+        rows.update(**changes)
+
+
+ANNOTATIONS = ("funding_committed", "funding_collected", "funding_investors")
+
+
+def annotate(queryset, names=ANNOTATIONS):
+    """
+    Adds funding_committed, funding_collected and funding_investors (or just
+    `names`) to an InvestmentProject queryset (subqueries, so still a single
+    query).
+    """
+    shards = ProjectFundingShard.objects.filter(project=OuterRef("pk")).order_by().values("project")
+
+    def total(field, output_field, zero):
+        return Coalesce(
+            Subquery(shards.annotate(total=Sum(field)).values("total"), output_field=output_field),
+            Value(zero),
+            output_field=output_field,
+        )
+
+    totals = {
+        "funding_committed": lambda: total("committed", MONEY, ZERO),
+        "funding_collected": lambda: total("collected", MONEY, ZERO),
+        "funding_investors": lambda: total("investors", IntegerField(), 0),
+    }
+    return queryset.annotate(**{name: totals[name]() for name in names})
+
+
+def _project_id(investment, pricing_id):
+    if pricing_id == investment.selected_option_id:
+        # Already joined by ClientInvestmentManager on most paths
+        return investment.selected_option.project_id
+    return ProjectPricing.objects.values_list("project_id", flat=True).get(pk=pricing_id)
+
+
+def _has_other(user_id, project_id, investment_pk):
+    return (
+        ClientInvestment.objects.select_related(None)
+        .filter(user_id=user_id, selected_option__project_id=project_id)
+        .exclude(pk=investment_pk)
+        .exists()
+    )
+
+
+# --- Hooks (investment.signals) ---
+
+
+def investment_saved(investment, created):
+    old = None if created else getattr(investment, "_funding_snapshot", None)
+    investment.remember_funding()
+    new = investment._funding_snapshot
+
+    if created:
+        user_id, pricing_id, agreed, paid = new
+        project_id = _project_id(investment, pricing_id)
+        joined = not _has_other(user_id, project_id, investment.pk)
+        add(project_id, agreed, paid, int(joined))
+        return
+    if old is None or new is None or old == new:
+        # Nothing changed, or loaded with deferred fields: nothing to diff against
+        return
+
+    user_id, pricing_id, agreed, paid = new
+    old_user_id, old_pricing_id, old_agreed, old_paid = old
+    if (old_user_id, old_pricing_id) == (user_id, pricing_id):
+        add(_project_id(investment, pricing_id), agreed - old_agreed, paid - old_paid)
+        return
+
+    # Moved to another user or pricing: leave the old project, join the new one
+    old_project_id = _project_id(investment, old_pricing_id)
+    left = not _has_other(old_user_id, old_project_id, investment.pk)
+    add(old_project_id, -old_agreed, -old_paid, -int(left))
+    project_id = _project_id(investment, pricing_id)
+    joined = not _has_other(user_id, project_id, investment.pk)
+    add(project_id, agreed, paid, int(joined))
+
+
+def investment_deleting(investment):
+    # The instance being deleted may be stale (e.g. paid since it was loaded):
+    # take what the counters include from the row itself
+    investment._funding_snapshot = (
+        ClientInvestment.objects.select_related(None)
+        .values_list(*ClientInvestment.FUNDING_FIELDS)
+        .get(pk=investment.pk)
+    )
+
+
+def investment_deleted(investment, origin=None):
+    user_id, pricing_id, agreed, paid = investment._funding_snapshot
+    project_id = _project_id(investment, pricing_id)
+    key = (user_id, project_id)
+
+    # A cascade (e.g. deleting a user) removes all of the batch's rows before
+    # post_delete runs, so every one of them would look like the user's last
+    # investment. Count each (user, project) once per delete() call.
+    seen = getattr(origin, "_funding_left", None)
+    if seen is None:
+        seen = set()
+        if origin is not None:
+            origin._funding_left = seen
+    left = key not in seen and not _has_other(*key, investment.pk)
+    if left:
+        seen.add(key)
+    add(project_id, -agreed, -paid, -int(left))
+
+
+def record_collected(deltas):
+    """{project_id: change in collected} from a set-based amount_paid UPDATE."""
+    for project_id, delta in deltas.items():
+        add(project_id, collected=delta)
+
+
+# --- Rebuild ---
+
+
+def rebuild():
+    """Recomputes every project's counters from ClientInvestment (one shard each)."""
+    with transaction.atomic():
+        ProjectFundingShard.objects.all().delete()
+        totals = (
+            ClientInvestment.objects.select_related(None)
+            .order_by()
+            .values("selected_option__project_id")
+            .annotate(
+                committed=Sum("agreed_amount"),
+                collected=Sum("amount_paid"),
+                investors=Count("user", distinct=True),
+            )
+        )
+        rows = ProjectFundingShard.objects.bulk_create(
+            [
+                ProjectFundingShard(
+                    project_id=row["selected_option__project_id"],
+                    shard=0,
+                    # SQLite sums decimals as floats
+                    committed=Decimal(row["committed"]).quantize(ZERO),
+                    collected=Decimal(row["collected"]).quantize(ZERO),
+                    investors=row["investors"],
+                )
+                for row in totals
+            ]
+        )
+    return len(rows)
+
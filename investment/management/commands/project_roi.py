@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from investment import roi
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the ROI projections of every completed/earning investment in "
+        "NumPy batches and store them in the cache (the ROI endpoint reads them)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Investments projected per batch (default: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = roi.project_book(chunk_size=options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Projected {count} investment(s) in {time.monotonic() - started:.2f}s."
+            )
+        )
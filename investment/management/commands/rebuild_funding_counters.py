@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from investment import funding
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the per-project funding counters (committed, collected, "
+        "investors) from the client investments."
+    )
+
+    def handle(self, *args, **options):
+        projects = funding.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt funding counters for {projects} project(s)."))
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from investment import services
+from investment.models import ClientInvestment
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate amount_paid and status of client investments from their "
+        "paid payment schedules (one UPDATE per chunk)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list the investments that would change, with old -> new values.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=services.DEFAULT_CHUNK_SIZE,
+            help=f"Investments per UPDATE statement (default: {services.DEFAULT_CHUNK_SIZE}).",
+        )
+        parser.add_argument(
+            "--status",
+            action="append",
+            choices=[choice for choice, _ in ClientInvestment.STATUS_CHOICES],
+            help="Only investments currently in this status (repeatable).",
+        )
+        parser.add_argument(
+            "--id", dest="ids", type=int, action="append", help="Only this investment (repeatable)."
+        )
+
+    def handle(self, *args, **options):
+        queryset = ClientInvestment.objects.all()
+        if options["status"]:
+            queryset = queryset.filter(status__in=options["status"])
+        if options["ids"]:
+            queryset = queryset.filter(pk__in=options["ids"])
+
+        if not options["dry_run"]:
+            changed = services.recalculate(queryset, chunk_size=options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS(f"Recalculated: {changed} investment(s) changed."))
+            return
+
+        count = 0
+        for pk, email, (old_amount, new_amount), (old_status, new_status) in services.diff(
+            queryset, chunk_size=options["chunk_size"]
+        ):
+            count += 1
+            changes = []
+            if old_amount != new_amount:
+                changes.append(f"amount_paid {old_amount} -> {new_amount}")
+            if old_status != new_status:
+                changes.append(f"status {old_status} -> {new_status}")
+            self.stdout.write(f"  #{pk:<7} {email:<35} {', '.join(changes)}")
+        self.stdout.write(f"Dry run: {count} investment(s) would change.")
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from investment import services
+
+
+class Command(BaseCommand):
+    help = (
+        "Move completed investments to \"earning\" once completed_at + the project's "
+        "roi_start_after_days has passed, and notify their owners. Safe to run hourly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=services.DEFAULT_CHUNK_SIZE,
+            help=f"Investments per UPDATE statement (default: {services.DEFAULT_CHUNK_SIZE}).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the investments that are due.",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            due = services.due_for_earning().count()
+            self.stdout.write(f"Dry run: {due} investment(s) due to start earning.")
+            return
+
+        moved = services.start_earning(batch_size=options["batch_size"])
+        notifications = services.notify_earning(moved) if moved else []
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Started earning: {len(moved)} investment(s), "
+                f"{len(notifications)} notification(s) sent."
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment', '0007_alter_investmentplan_duration_days'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='investmentproject',
+            name='project_img_sizes',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment', '0008_investmentproject_project_img_sizes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectFundingShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('committed', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('collected', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('investors', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='funding_shards', to='investment.investmentproject')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('project', 'shard'), name='unique_project_funding_shard')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:00
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import Max, Q
+from django.utils import timezone
+
+
+def backfill_completed_at(apps, schema_editor):
+    # Already-settled investments: completed on the day of their last payment
+    # (or when last updated, if no schedule was marked paid)
+    ClientInvestment = apps.get_model("investment", "ClientInvestment")
+    settled = (
+        ClientInvestment.objects.filter(status__in=["completed", "earning"], completed_at__isnull=True)
+        .annotate(last_paid=Max("schedules__date_paid", filter=Q(schedules__status="paid")))
+        .only("pk", "updated_at")
+    )
+    batch = []
+    for investment in settled.iterator(chunk_size=1000):
+        if investment.last_paid:
+            investment.completed_at = timezone.make_aware(
+                datetime.datetime.combine(investment.last_paid, datetime.time.min)
+            )
+        else:
+            investment.completed_at = investment.updated_at
+        batch.append(investment)
+        if len(batch) >= 1000:
+            ClientInvestment.objects.bulk_update(batch, ["completed_at"])
+            batch = []
+    ClientInvestment.objects.bulk_update(batch, ["completed_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment', '0009_projectfundingshard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientinvestment',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+    ]
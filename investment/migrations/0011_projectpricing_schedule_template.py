@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+from investment import schedules
+
+
+def build_templates(apps, schema_editor):
+    ProjectPricing = apps.get_model("investment", "ProjectPricing")
+    pricings = list(ProjectPricing.objects.select_related("plan"))
+    for pricing in pricings:
+        pricing.schedule_template = schedules.build_template(
+            pricing.total_price, pricing.plan.payment_mode, pricing.plan.duration_days
+        )
+    ProjectPricing.objects.bulk_update(pricings, ["schedule_template"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment', '0010_clientinvestment_completed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectpricing',
+            name='schedule_template',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(build_templates, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
+import datetime
+
 from django.db import models
-from django.utils.timezone import now
+from django.utils.timezone import localdate, now
 from account.models import User
+from . import schedules
 
 # -------------------------------------------------------------------------
 # Investment Plan
@@ -53,6 +56,8 @@ class InvestmentProject(models.Model):
         help_text="Days after completion before ROI starts"
     )
     project_img = models.ImageField(upload_to="project_img/", null=True, blank=True)
+    # Precomputed URLs of project_img and its resized copies (see core.imaging)
+    project_img_sizes = models.JSONField(default=dict, blank=True, editable=False)
     expected_roi_percent = models.DecimalField(max_digits=5, decimal_places=2)
     # Indexed to quickly filter valid projects
     active = models.BooleanField(default=True, db_index=True)
@@ -61,6 +66,29 @@ class InvestmentProject(models.Model):
         return self.name
 
 
+class ProjectFundingShard(models.Model):
+    """
+    One slice of a project's funding counters. The project's totals are the
+    sum over its shards; writers add to a random shard (see investment.funding).
+    """
+    project = models.ForeignKey(
+        InvestmentProject, related_name="funding_shards", on_delete=models.CASCADE
+    )
+    shard = models.PositiveSmallIntegerField()
+    # Deltas land on random shards, so a single shard may go negative
+    committed = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    collected = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    investors = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["project", "shard"], name="unique_project_funding_shard")
+        ]
+
+    def __str__(self):
+        return f"{self.project_id}#{self.shard}"
+
+
 # -------------------------------------------------------------------------
 # Project Pricing
 # -------------------------------------------------------------------------
@@ -75,6 +103,9 @@ class ProjectPricing(models.Model):
     plan = models.ForeignKey(InvestmentPlan, on_delete=models.CASCADE)
     total_price = models.DecimalField(max_digits=12, decimal_places=2)
     minimum_deposit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Installment day offsets and amounts for this price and plan (see
+    # investment.schedules); rebuilt on save and when the plan changes
+    schedule_template = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         # Optimization: Prevent duplicate pricing for the same project/plan combo
@@ -83,19 +114,21 @@ class ProjectPricing(models.Model):
             models.UniqueConstraint(fields=['project', 'plan'], name='unique_project_plan')
         ]
 
+    def build_schedule_template(self):
+        self.schedule_template = schedules.build_template(
+            self.total_price, self.plan.payment_mode, self.plan.duration_days
+        )
+
+    def template_for(self, amount):
+        """The schedule template for `amount` (the cached one for total_price)."""
+        if schedules.is_for(self.schedule_template, amount):
+            return self.schedule_template
+        return schedules.build_template(amount, self.plan.payment_mode, self.plan.duration_days)
+
     def save(self, *args, **kwargs):
+        self.build_schedule_template()
         if self.minimum_deposit == 0:
-            if self.plan.payment_mode == "one_time":
-                self.minimum_deposit = self.total_price
-            else:
-                cycles = 1
-                if self.plan.payment_mode == "weekly":
-                    cycles = self.plan.duration_days // 7
-                elif self.plan.payment_mode == "monthly":
-                    cycles = self.plan.duration_days // 30
-
-                cycles = max(cycles, 1)
-                self.minimum_deposit = round(self.total_price / cycles, 2)
+            self.minimum_deposit = schedules.first_amount(self.schedule_template)
 
         super().save(*args, **kwargs)
 
@@ -145,6 +178,9 @@ class ClientInvestment(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending", db_index=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True) # Indexed for sorting
     updated_at = models.DateTimeField(auto_now=True)
+    # When it was fully paid; ROI starts project.roi_start_after_days later
+    # (the start_earning command then moves it to "earning")
+    completed_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     objects = ClientInvestmentManager() # Attach the optimized manager
 
@@ -155,6 +191,23 @@ class ClientInvestment(models.Model):
         # but if you rely on it for UI, keep it. Since we indexed created_at, this is fast.
         ordering = ["-created_at"] 
 
+    # What the project funding counters currently include for this row
+    # (investment.funding diffs against it on save)
+    FUNDING_FIELDS = ("user_id", "selected_option_id", "agreed_amount", "amount_paid")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_funding()
+        return instance
+
+    def remember_funding(self):
+        loaded = self.__dict__
+        if all(field in loaded for field in self.FUNDING_FIELDS):
+            self._funding_snapshot = tuple(loaded[field] for field in self.FUNDING_FIELDS)
+        else:
+            self._funding_snapshot = None
+
     @property
     def balance(self):
         return max((self.agreed_amount or 0) - self.amount_paid, 0)
@@ -171,24 +224,42 @@ class ClientInvestment(models.Model):
             self.agreed_amount = self.selected_option.total_price
 
         if not self.installment_amount:
-            plan = self.selected_option.plan
-            if plan.payment_mode == "one_time":
-                self.installment_amount = self.agreed_amount
-            else:
-                # Use simple division, ensure no ZeroDivisionError
-                divider = 7 if plan.payment_mode == "weekly" else 30
-                cycles = max(plan.duration_days // divider, 1)
-                self.installment_amount = round(self.agreed_amount / cycles, 2)
+            template = self.selected_option.template_for(self.agreed_amount)
+            self.installment_amount = schedules.first_amount(template)
 
-        # 2. Status & Next Payment Logic
+        # 2. Status & Next Payment Logic ("earning" is only ever set by start_earning)
         if self.amount_paid >= self.agreed_amount:
-            self.status = "completed"
+            if self.status != "earning":
+                self.status = "completed"
             self.next_payment_date = None
-        elif self.amount_paid > 0:
-            self.status = "paying"
+            if self.completed_at is None:
+                self.completed_at = now()
+        else:
+            self.completed_at = None
+            if self.amount_paid > 0:
+                self.status = "paying"
 
         super().save(*args, **kwargs)
 
+    def build_schedules(self):
+        """Unsaved PaymentSchedule rows, instantiated from the pricing's template."""
+        start_date = self.start_date
+        if isinstance(start_date, datetime.datetime):
+            # The `now` default gives a datetime until the row is reloaded
+            start_date = localdate(start_date)
+        template = self.selected_option.template_for(self.agreed_amount)
+        return [
+            PaymentSchedule(
+                investment=self,
+                installment_number=number,
+                title=title,
+                due_date=due_date,
+                amount=amount,
+                status="upcoming",
+            )
+            for number, title, due_date, amount in schedules.instantiate(template, start_date)
+        ]
+
     def update_schedule_statuses(self):
         """
         OPTIMIZED: Uses bulk_update to reduce DB writes from O(N) to O(1).
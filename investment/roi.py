@@ -0,0 +1,178 @@
+import datetime
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, Q
+from django.db.models.functions import Coalesce, TruncDate
+
+from .models import ClientInvestment
+
+# -------------------------------------------------------------------------
+# ROI Projection Engine
+# -------------------------------------------------------------------------
+# expected_roi_percent is treated as a yearly return on the amount paid,
+# paid out every ROI_PAYOUT_INTERVAL_DAYS once the ROI starts:
+#
+#   roi_start = completed_at (date) + project.roi_start_after_days
+#   payout    = amount_paid * rate * interval / 365        (per period)
+#   period k  = roi_start + k * interval, for k = 1..ROI_PROJECTION_PERIODS
+#
+# The whole book (or any chunk of it) is projected at once: one row per
+# investment, one column per period, computed with NumPy broadcasting.
+# Money is never a float: the payout is rounded to kobo with Decimal (one
+# value per investment), the n x periods matrices are int64 kobo, and every
+# amount goes back to Decimal for output.
+# Agriculture projects have no ROI (as in ClientInvestmentDetailSerializer).
+#
+# Projections are cached per investment under a key built from their
+# inputs, so a payment or a project rate change simply misses the cache.
+
+PROJECTABLE_STATUSES = ("completed", "earning")
+CENTS = Decimal("0.01")
+NO_ROI_TYPES = ("agriculture",)
+
+_INPUT_FIELDS = (
+    "pk",
+    "amount_paid",
+    "start_date",
+    "selected_option__project__expected_roi_percent",
+    "selected_option__project__roi_start_after_days",
+    "selected_option__project__investment_type",
+)
+
+
+def book_queryset():
+    """Investments the engine projects, with their completion date."""
+    return (
+        ClientInvestment.objects.select_related(None)
+        .filter(status__in=PROJECTABLE_STATUSES)
+        .annotate(
+            completed_on=Coalesce(
+                TruncDate("completed_at"),
+                # Fallback for rows settled outside save()/recalculate()
+                Max("schedules__date_paid", filter=Q(schedules__status="paid")),
+            )
+        )
+        .order_by("pk")
+    )
+
+
+def _rows(queryset):
+    return queryset.values_list(*_INPUT_FIELDS, "completed_on")
+
+
+def cache_key(row):
+    pk, amount_paid, start_date, rate, roi_days, investment_type, completed_on = row
+    return (
+        f"roi:{pk}:{amount_paid}:{rate}:{roi_days}:{investment_type}:"
+        f"{completed_on or start_date}:{settings.ROI_PAYOUT_INTERVAL_DAYS}:"
+        f"{settings.ROI_PROJECTION_PERIODS}"
+    )
+
+
+def _naira(kobo):
+    return str(Decimal(kobo).scaleb(-2))
+
+
+def project(rows):
+    """
+    Projections for a list of input rows (see _rows), computed together.
+    Returns {investment pk: projection dict}.
+    """
+    if not rows:
+        return {}
+    interval = settings.ROI_PAYOUT_INTERVAL_DAYS
+    periods = settings.ROI_PROJECTION_PERIODS
+    pks, amount_paid, start_date, rate, roi_days, investment_type, completed_on = zip(*rows)
+
+    # 1. Payouts in Decimal, rounded to kobo (n values)
+    has_roi = [kind not in NO_ROI_TYPES for kind in investment_type]
+    payout = [
+        (paid * percent / 100 * interval / 365).quantize(CENTS) if roi else Decimal("0.00")
+        for paid, percent, roi in zip(amount_paid, rate, has_roi)
+    ]
+
+    # 2. One array per input (n investments), amounts as int64 kobo
+    principal_kobo = np.array([int(paid * 100) for paid in amount_paid], dtype=np.int64)
+    payout_kobo = np.array([int(amount * 100) for amount in payout], dtype=np.int64)
+    completed = np.array(
+        [done or start for done, start in zip(completed_on, start_date)], dtype="datetime64[D]"
+    )
+    roi_start = completed + np.array(roi_days, dtype="timedelta64[D]")
+
+    # 3. n x periods matrices by broadcasting against the period numbers
+    k = np.arange(1, periods + 1, dtype=np.int64)
+    dates = roi_start[:, None] + (k * interval).astype("timedelta64[D]")
+    cumulative = payout_kobo[:, None] * k
+    value = principal_kobo[:, None] + cumulative
+
+    # 4. Plain Python structures for the cache / JSON (kobo -> Decimal naira)
+    dates = dates.astype(datetime.date).tolist()
+    roi_start = roi_start.astype(datetime.date).tolist()
+    cumulative = cumulative.tolist()
+    value = value.tolist()
+    projections = {}
+    for i, pk in enumerate(pks):
+        series = []
+        if has_roi[i]:
+            series = [
+                {
+                    "period": period,
+                    "date": dates[i][period - 1].isoformat(),
+                    "earning": str(payout[i]),
+                    "cumulative_earnings": _naira(cumulative[i][period - 1]),
+                    "value": _naira(value[i][period - 1]),
+                }
+                for period in range(1, periods + 1)
+            ]
+        projections[pk] = {
+            "investment_id": pk,
+            "principal": str(amount_paid[i].quantize(CENTS)),
+            "roi_percent": str(rate[i]) if has_roi[i] else None,
+            "roi_start_date": roi_start[i].isoformat(),
+            "payout_interval_days": interval,
+            "periodic_earning": str(payout[i]) if has_roi[i] else None,
+            "total_return": series[-1]["cumulative_earnings"] if series else "0.00",
+            "series": series,
+        }
+    return projections
+
+
+def project_book(queryset=None, chunk_size=5000):
+    """
+    Projects and caches every completed/earning investment, chunk_size rows
+    per NumPy batch. Returns the number of investments projected.
+    """
+    queryset = queryset if queryset is not None else book_queryset()
+    count = 0
+    chunk = []
+    for row in _rows(queryset).iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            count += _cache_chunk(chunk)
+            chunk = []
+    return count + _cache_chunk(chunk)
+
+
+def _cache_chunk(rows):
+    projections = project(rows)
+    cache.set_many(
+        {cache_key(row): projections[row[0]] for row in rows},
+        timeout=settings.ROI_CACHE_TIMEOUT,
+    )
+    return len(rows)
+
+
+def projection_for(investment_pk):
+    """Cached projection of one investment (None if it is not completed/earning)."""
+    row = _rows(book_queryset().filter(pk=investment_pk)).first()
+    if row is None:
+        return None
+    key = cache_key(row)
+    projection = cache.get(key)
+    if projection is None:
+        projection = project([row])[investment_pk]
+        cache.set(key, projection, timeout=settings.ROI_CACHE_TIMEOUT)
+    return projection
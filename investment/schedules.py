@@ -0,0 +1,66 @@
+from datetime import timedelta
+from decimal import Decimal
+
+# -------------------------------------------------------------------------
+# Schedule Templates
+# -------------------------------------------------------------------------
+# The ONE place the installment math lives. A template is what every
+# investment in a ProjectPricing pays, relative to its start date:
+#
+#   {"total": "1650000.04", "offsets": [0, 7, 14, ...],
+#    "amounts": ["137500.00", ..., "137500.04"]}
+#
+# Equal installments of total / cycles (to the kobo); the last one absorbs the
+# rounding so the amounts always add up to the total. ProjectPricing caches
+# its template (ProjectPricing.schedule_template); ClientInvestment takes its
+# installment amount from it and instantiate() turns it into schedule rows.
+#
+# Plain values only (no models), so migrations can use it too.
+
+CENTS = Decimal("0.01")
+
+
+def cycles(payment_mode, duration_days):
+    """(number of installments, days between them)."""
+    if payment_mode == "one_time":
+        return 1, 0
+    if payment_mode == "weekly":
+        return max(duration_days // 7, 1), 7
+    return max(duration_days // 30, 1), 30
+
+
+def build_template(total_price, payment_mode, duration_days):
+    count, interval = cycles(payment_mode, duration_days)
+    total = Decimal(total_price).quantize(CENTS)
+    base = (total / count).quantize(CENTS)
+    amounts = [base] * (count - 1) + [total - base * (count - 1)]
+    return {
+        "total": str(total),
+        "offsets": [interval * i for i in range(count)],
+        "amounts": [str(amount) for amount in amounts],
+    }
+
+
+def is_for(template, total_price):
+    """True when `template` was built for this total."""
+    return template.get("total") == str(Decimal(total_price).quantize(CENTS))
+
+
+def first_amount(template):
+    return Decimal(template["amounts"][0])
+
+
+def instantiate(template, start_date):
+    """[(installment number, title, due date, amount), ...] for one investment."""
+    count = len(template["offsets"])
+    return [
+        (
+            number,
+            f"Installment {number}" if count > 1 else "Full Payment",
+            start_date + timedelta(days=offset),
+            Decimal(amount),
+        )
+        for number, (offset, amount) in enumerate(
+            zip(template["offsets"], template["amounts"]), start=1
+        )
+    ]
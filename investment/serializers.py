@@ -1,5 +1,8 @@
 from rest_framework import serializers
+from core.media import ImageSizesField, MediaURLField
+from core.projections import Projection, SparseFieldsMixin
 from .models import InvestmentProject, PaymentSchedule, ProjectPricing, ClientInvestment
+from django.db.models import OuterRef, Subquery
 from django.utils.timezone import now
 
 
@@ -24,33 +27,48 @@ class ProjectPricingSerializer(serializers.ModelSerializer):
         ]
 
     def get_roi_start_display(self, obj):
-        """
-        Calculates when ROI starts relative to the plan.
-        One-time = Project ROI start days.
-        Installment = Plan duration + Project ROI start days.
-        """
-        base_wait = obj.project.roi_start_after_days
+        return roi_start_display(
+            obj.project.roi_start_after_days, obj.plan.payment_mode, obj.plan.duration_days
+        )
 
-        if obj.plan.payment_mode == "one_time":
-            days_wait = base_wait
-        else:
-            days_wait = obj.plan.duration_days + base_wait
 
-        if days_wait <= 0:
-            return "Immediate"
-        elif days_wait < 30:
-            return f"{days_wait} Days"
-        else:
-            months = round(days_wait / 30)
-            return f"Month {months}"
+def roi_start_display(roi_start_after_days, payment_mode, duration_days):
+    """
+    Calculates when ROI starts relative to the plan.
+    One-time = Project ROI start days.
+    Installment = Plan duration + Project ROI start days.
+    """
+    base_wait = roi_start_after_days
 
+    if payment_mode == "one_time":
+        days_wait = base_wait
+    else:
+        days_wait = duration_days + base_wait
 
-class InvestmentProjectSerializer(serializers.ModelSerializer):
+    if days_wait <= 0:
+        return "Immediate"
+    elif days_wait < 30:
+        return f"{days_wait} Days"
+    else:
+        months = round(days_wait / 30)
+        return f"Month {months}"
+
+
+class InvestmentProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     pricing_options = ProjectPricingSerializer(many=True, read_only=True)
+    project_img = MediaURLField(sizes_source="project_img_sizes")
+    project_img_sizes = ImageSizesField(
+        source="project_img", sizes_source="project_img_sizes"
+    )
 
     # Pre-formatted string for the frontend header "Real Estate • Lagos, NG"
     category_display = serializers.SerializerMethodField()
 
+    # Funding counters, annotated onto the queryset by investment.funding.annotate()
+    funding_committed = serializers.DecimalField(max_digits=16, decimal_places=2, read_only=True)
+    funding_collected = serializers.DecimalField(max_digits=16, decimal_places=2, read_only=True)
+    funding_investors = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = InvestmentProject
         fields = [
@@ -63,8 +81,12 @@ class InvestmentProjectSerializer(serializers.ModelSerializer):
             "investment_detail",
             "roi_start_after_days",
             "project_img",
+            "project_img_sizes",
             "expected_roi_percent",
             "active",
+            "funding_committed",
+            "funding_collected",
+            "funding_investors",
             "pricing_options",
         ]
 
@@ -88,8 +110,13 @@ class ClientInvestmentSerializer(serializers.ModelSerializer):
     project_name = serializers.CharField(
         source="selected_option.project.name", read_only=True
     )
-    project_image = serializers.ImageField(
-        source="selected_option.project.project_img", read_only=True
+    project_image = MediaURLField(
+        source="selected_option.project.project_img",
+        sizes_source="selected_option.project.project_img_sizes",
+    )
+    project_image_sizes = ImageSizesField(
+        source="selected_option.project.project_img",
+        sizes_source="selected_option.project.project_img_sizes",
     )
     location = serializers.CharField(
         source="selected_option.project.location", read_only=True
@@ -110,6 +137,7 @@ class ClientInvestmentSerializer(serializers.ModelSerializer):
             "project_name",
             "selected_option",
             "project_image",
+            "project_image_sizes",
             "agreed_amount",
             "location",
             "amount_paid",
@@ -145,12 +173,16 @@ class ClientInvestmentDetailSerializer(ClientInvestmentSerializer):
     Detailed view including full payment history/schedules.
     """
 
-    schedules = PaymentScheduleSerializer(many=True, read_only=True)
+    schedules = serializers.SerializerMethodField()
     roi = serializers.SerializerMethodField()
 
     class Meta(ClientInvestmentSerializer.Meta):
         fields = ClientInvestmentSerializer.Meta.fields + ["schedules", "roi"]
 
+    def get_schedules(self, obj):
+        # Optimization: PaymentScheduleSerializer output built from plain rows
+        return PaymentScheduleProjection(context=self.context).data(obj.schedules.all())
+
     def get_roi(self, obj):
         # Agriculture has no ROI based on your previous requirement
         if obj.selected_option.project.investment_type == "agriculture":
@@ -158,10 +190,111 @@ class ClientInvestmentDetailSerializer(ClientInvestmentSerializer):
         return obj.selected_option.project.expected_roi_percent
 
 
+# -------------------------------------------------------------------------
+# Read Projections (see core.projections)
+# -------------------------------------------------------------------------
+
+
+class ProjectPricingProjection(Projection):
+    serializer_class = ProjectPricingSerializer
+    requires = {
+        "roi_start_display": (
+            "project__roi_start_after_days",
+            "plan__payment_mode",
+            "plan__duration_days",
+        ),
+    }
+
+    def get_roi_start_display(self, row):
+        return roi_start_display(
+            row["project__roi_start_after_days"],
+            row["plan__payment_mode"],
+            row["plan__duration_days"],
+        )
+
+
+class PaymentScheduleProjection(Projection):
+    serializer_class = PaymentScheduleSerializer
+    requires = {"formatted_date": ("due_date",)}
+
+    def get_formatted_date(self, row):
+        return row["due_date"].strftime("%b %d, %Y")
+
+
+class ClientInvestmentProjection(Projection):
+    """
+    ClientInvestmentSerializer output for the investment list. The next
+    unpaid installment comes from subqueries in the same query, instead of
+    one query per investment. ?expand=selected_option gives the pricing
+    option instead of its id, ?expand=schedules adds the installments.
+    """
+
+    serializer_class = ClientInvestmentSerializer
+    requires = {
+        "balance": ("agreed_amount", "amount_paid"),
+        "percentage_completion": ("agreed_amount", "amount_paid"),
+        "next_payment_data": ("next_title", "next_amount", "next_due_date"),
+        "selected_option": ("selected_option",),
+        "schedules": ("id",),
+    }
+    expandable = ("selected_option", "schedules")
+
+    def __init__(self, context=None, fields=None, expand=None):
+        super().__init__(context, fields, expand)
+        self.today = now().date()
+
+    def annotations(self):
+        upcoming = (
+            PaymentSchedule.objects.filter(investment=OuterRef("pk"))
+            .exclude(status="paid")
+            .order_by("installment_number")
+        )
+        return {
+            f"next_{field}": Subquery(upcoming.values(field)[:1])
+            for field in ("title", "amount", "due_date")
+        }
+
+    def get_balance(self, row):
+        return max((row["agreed_amount"] or 0) - row["amount_paid"], 0)
+
+    def get_percentage_completion(self, row):
+        if not row["agreed_amount"] or row["agreed_amount"] == 0:
+            return 0
+        return round((row["amount_paid"] / row["agreed_amount"]) * 100, 2)
+
+    def get_next_payment_data(self, row):
+        if row["next_due_date"] is None:
+            return None
+        return {
+            "title": row["next_title"],
+            "amount": row["next_amount"],
+            "due_date": row["next_due_date"],
+            "days_left": (row["next_due_date"] - self.today).days,
+        }
+
+    def expand_selected_option(self, rows):
+        pricing = ProjectPricingProjection(context=self.context).by(
+            ProjectPricing.objects.filter(pk__in={row["selected_option"] for row in rows}),
+            "pk",
+        )
+        return [pricing.get(row["selected_option"]) for row in rows]
+
+    def expand_schedules(self, rows):
+        schedules = PaymentScheduleProjection(context=self.context).grouped(
+            PaymentSchedule.objects.filter(investment__in=[row["id"] for row in rows]),
+            "investment",
+        )
+        return [schedules.get(row["id"], []) for row in rows]
+
+
 class CreateInvestmentSerializer(serializers.ModelSerializer):
     # We map the frontend's 'pricing_id' directly to the model's 'selected_option'
+    # Optimization: pricing, project and plan in one query; validation,
+    # ClientInvestment.save() and the schedule template all read from it
     pricing_id = serializers.PrimaryKeyRelatedField(
-        queryset=ProjectPricing.objects.all(), source="selected_option", write_only=True
+        queryset=ProjectPricing.objects.select_related("project", "plan"),
+        source="selected_option",
+        write_only=True,
     )
 
     class Meta:
@@ -221,8 +354,13 @@ class PortfolioItemSerializer(serializers.ModelSerializer):
     location = serializers.CharField(
         source="selected_option.project.location", read_only=True
     )
-    project_image = serializers.ImageField(
-        source="selected_option.project.project_img", read_only=True
+    project_image = MediaURLField(
+        source="selected_option.project.project_img",
+        sizes_source="selected_option.project.project_img_sizes",
+    )
+    project_image_sizes = ImageSizesField(
+        source="selected_option.project.project_img",
+        sizes_source="selected_option.project.project_img_sizes",
     )
     expected_roi = serializers.DecimalField(
         source="selected_option.project.expected_roi_percent",
@@ -239,6 +377,7 @@ class PortfolioItemSerializer(serializers.ModelSerializer):
             "project_name",
             "location",
             "project_image",
+            "project_image_sizes",
             "expected_roi",
             "equity_held",
             "status",
@@ -0,0 +1,247 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    DateTimeField,
+    DecimalField,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Now, Round
+from django.db.models.lookups import Exact, GreaterThan, GreaterThanOrEqual
+from django.utils.timezone import now
+
+from core import data_version
+from notification.models import Notification
+from . import funding
+from .models import ClientInvestment, InvestmentProject, PaymentSchedule
+
+# -------------------------------------------------------------------------
+# Set-based Recalculation
+# -------------------------------------------------------------------------
+# Brings ClientInvestment.amount_paid / status back in line with the paid
+# PaymentSchedule rows, for any number of investments, without loading them
+# into Python or firing save() signals. Each chunk is ONE statement:
+#
+#   UPDATE investment_clientinvestment
+#   SET amount_paid = (SELECT SUM(amount) FROM schedules WHERE paid AND investment_id = id),
+#       status = CASE ... END, next_payment_date = CASE ... END,
+#       completed_at = CASE ... END
+#   WHERE id IN (...) AND (amount_paid <> ... OR status <> ...)
+#
+# Status rules match the payment signal: fully paid -> "completed" (an
+# investment that is already "earning" stays so), partly paid -> "paying",
+# nothing paid -> "pending".
+
+DEFAULT_CHUNK_SIZE = 500
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+CENTS = Decimal("0.01")
+
+
+def _paid_total():
+    paid = (
+        PaymentSchedule.objects.filter(investment=OuterRef("pk"), status="paid")
+        .order_by()
+        .values("investment")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    total = Coalesce(Subquery(paid, output_field=MONEY), Value(Decimal("0.00")), output_field=MONEY)
+    # SQLite sums decimals as floats; round so equal amounts compare equal
+    return Round(total, 2, output_field=MONEY)
+
+
+def _expected_status(paid_total):
+    return Case(
+        When(
+            GreaterThanOrEqual(paid_total, F("agreed_amount")),
+            then=Case(
+                When(status="earning", then=Value("earning")),
+                default=Value("completed"),
+            ),
+        ),
+        When(GreaterThan(paid_total, Value(Decimal("0.00"))), then=Value("paying")),
+        default=Value("pending"),
+    )
+
+
+def _expected_next_payment_date(paid_total):
+    # Settled investments have nothing left to pay
+    return Case(
+        When(GreaterThanOrEqual(paid_total, F("agreed_amount")), then=Value(None)),
+        default=F("next_payment_date"),
+    )
+
+
+def _expected_completed_at(paid_total):
+    # Keep the original completion time; clear it if no longer fully paid
+    return Case(
+        When(
+            GreaterThanOrEqual(paid_total, F("agreed_amount")),
+            then=Coalesce(F("completed_at"), Now()),
+        ),
+        default=Value(None),
+        output_field=DateTimeField(),
+    )
+
+
+def _out_of_sync(paid_total, status):
+    return ~Exact(F("amount_paid"), paid_total) | ~Exact(F("status"), status)
+
+
+def _chunks(queryset, chunk_size):
+    ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(ids), chunk_size):
+        yield ids[start:start + chunk_size]
+
+
+def recalculate(queryset=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Recalculates the given investments (all when queryset is None).
+    Returns the number of rows that actually changed.
+    """
+    if queryset is None:
+        queryset = ClientInvestment.objects.all()
+    queryset = queryset.select_related(None)
+
+    changed = 0
+    for ids in _chunks(queryset, chunk_size):
+        paid_total = _paid_total()
+        status = _expected_status(paid_total)
+        with transaction.atomic():
+            # amount_paid changes feed the project funding counters (no save()
+            # signals here): lock the rows about to change and total the deltas
+            deltas = defaultdict(Decimal)
+            owners = set()
+            for project_id, user_id, old, new in (
+                ClientInvestment.objects.select_related(None)
+                .select_for_update(of=("self",))
+                .filter(pk__in=ids)
+                .filter(_out_of_sync(paid_total, status))
+                .values_list("selected_option__project_id", "user_id", "amount_paid", paid_total)
+            ):
+                deltas[project_id] += Decimal(new).quantize(CENTS) - old
+                owners.add(user_id)
+            changed += (
+                ClientInvestment.objects.filter(pk__in=ids)
+                .filter(_out_of_sync(paid_total, status))
+                .update(
+                    amount_paid=paid_total,
+                    status=status,
+                    next_payment_date=_expected_next_payment_date(paid_total),
+                    completed_at=_expected_completed_at(paid_total),
+                )
+            )
+            funding.record_collected(deltas)
+            data_version.bump(*owners)
+    return changed
+
+
+def diff(queryset=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Dry run: yields (pk, user email, (old amount, new amount), (old status,
+    new status)) for every investment recalculate() would change.
+    """
+    if queryset is None:
+        queryset = ClientInvestment.objects.all()
+    queryset = queryset.select_related(None)
+
+    for ids in _chunks(queryset, chunk_size):
+        paid_total = _paid_total()
+        status = _expected_status(paid_total)
+        rows = (
+            ClientInvestment.objects.select_related(None)
+            .filter(pk__in=ids)
+            .annotate(new_amount_paid=paid_total, new_status=status)
+            .filter(_out_of_sync(paid_total, status))
+            .order_by("pk")
+            .values_list("pk", "user__email", "amount_paid", "new_amount_paid", "status", "new_status")
+        )
+        for pk, email, old_amount, new_amount, old_status, new_status in rows:
+            new_amount = Decimal(new_amount).quantize(CENTS)
+            yield pk, email, (old_amount, new_amount), (old_status, new_status)
+
+
+# -------------------------------------------------------------------------
+# Completed -> Earning
+# -------------------------------------------------------------------------
+# A completed investment starts earning roi_start_after_days (of its project)
+# after completed_at. Due investments are found per distinct
+# roi_start_after_days value (a handful of projects), so the cut-off is a
+# plain "completed_at <= now - N days" comparison on every database, and
+# moved in UPDATE batches. Rows are locked with SKIP LOCKED, so overlapping
+# runs never transition (or notify) the same investment twice.
+
+
+def due_for_earning(moment=None):
+    """Completed investments whose ROI start date has passed."""
+    moment = moment or now()
+    delays = (
+        InvestmentProject.objects.order_by()
+        .values_list("roi_start_after_days", flat=True)
+        .distinct()
+    )
+    due = Q()
+    for days in delays:
+        due |= Q(
+            selected_option__project__roi_start_after_days=days,
+            completed_at__lte=moment - timedelta(days=days),
+        )
+    if not due:
+        return ClientInvestment.objects.none()
+    return ClientInvestment.objects.select_related(None).filter(due, status="completed")
+
+
+def start_earning(moment=None, batch_size=DEFAULT_CHUNK_SIZE):
+    """
+    Moves every due investment to "earning", batch_size rows per UPDATE.
+    Returns [(investment pk, user pk, project name), ...] of those moved.
+    """
+    moment = moment or now()
+    moved = []
+    while True:
+        with transaction.atomic():
+            batch = list(
+                due_for_earning(moment)
+                .select_for_update(skip_locked=True, of=("self",))
+                .order_by("pk")
+                .values_list("pk", "user_id", "selected_option__project__name")[:batch_size]
+            )
+            if not batch:
+                return moved
+            ClientInvestment.objects.filter(
+                pk__in=[pk for pk, _, _ in batch], status="completed"
+            ).update(status="earning", updated_at=moment)
+            data_version.bump(*{user_id for _, user_id, _ in batch})
+        moved.extend(batch)
+
+
+def notify_earning(moved):
+    """One bulk insert of "your investment is earning" notifications."""
+    # bump() waits for the commit, so inside atomic() it can't tag the
+    # rows from before the insert (it would fire at once in autocommit)
+    with transaction.atomic():
+        created = Notification.objects.bulk_create(
+            [
+                Notification(
+                    user_id=user_id,
+                    title="Your investment is now earning",
+                    message=f"Your investment in {project_name} has started earning returns.",
+                    notification_type="success",
+                )
+                for _, user_id, project_name in moved
+            ],
+            batch_size=1000,
+        )
+        data_version.bump(*{user_id for _, user_id, _ in moved})
+    return created
+
@@ -83,58 +83,39 @@
 
 
 
-from django.db import transaction, models
-from django.db.models.signals import post_save
+from django.db import models
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from decimal import Decimal
-from datetime import timedelta
-from .models import ClientInvestment, PaymentSchedule
+from core import data_version
+from core.imaging import queue_derivatives
+from observability.tracing import traced
+from . import funding
+from .models import (
+    ClientInvestment,
+    InvestmentPlan,
+    InvestmentProject,
+    PaymentSchedule,
+    ProjectPricing,
+)
 
 # --- SIGNAL 1: GENERATE SCHEDULES ON CREATION ---
 @receiver(post_save, sender=ClientInvestment)
-def handle_investment_creation(sender, instance, created, **kwargs):
-    if created:
-        transaction.on_commit(lambda: generate_schedules(instance))
+def handle_investment_creation(sender, instance, created, raw=False, **kwargs):
+    # In the creating transaction: the investment never exists without its
+    # schedules, and a failed insert rolls both back
+    if created and not raw:
+        generate_schedules(instance)
 
 def generate_schedules(instance):
-    if instance.schedules.exists():
-        return
-
-    plan = instance.selected_option.plan
-    total_amount = float(instance.agreed_amount)
-    
-    if plan.payment_mode == "one_time":
-        cycles, interval = 1, 0
-    elif plan.payment_mode == "weekly":
-        cycles, interval = max(plan.duration_days // 7, 1), 7
-    else: # monthly
-        cycles, interval = max(plan.duration_days // 30, 1), 30
-
-    schedules = []
-    base_amt = round(total_amount / cycles, 2)
-    
-    for i in range(1, cycles + 1):
-        due = instance.start_date + timedelta(days=interval * (i - 1))
-        
-        # Handle rounding errors on the last cycle
-        if i == cycles:
-            amt = round(total_amount - (base_amt * (cycles - 1)), 2)
-        else:
-            amt = base_amt
-        
-        schedules.append(PaymentSchedule(
-            investment=instance,
-            installment_number=i,
-            title=f"Installment {i}" if cycles > 1 else "Full Payment",
-            due_date=due,
-            amount=amt,
-            status='upcoming'
-        ))
-    
-    PaymentSchedule.objects.bulk_create(schedules, ignore_conflicts=True)
+    # One bulk insert from the pricing's cached schedule template. A new
+    # investment has no schedules yet, so there is nothing to check first;
+    # the rows are kept on the instance so the create response needs no query.
+    instance.created_schedules = PaymentSchedule.objects.bulk_create(instance.build_schedules())
 
 # --- SIGNAL 2: UPDATE BALANCE ON PAYMENT ---
 @receiver(post_save, sender=PaymentSchedule)
+@traced("signal.sync_investment_on_payment")
 def sync_investment_on_payment(sender, instance, **kwargs):
     """
     Consolidated Logic:
@@ -159,25 +140,81 @@ def sync_investment_on_payment(sender, instance, **kwargs):
     # We use a small epsilon for float comparison safety if needed, 
     # but Decimal handles equality well.
     if investment.amount_paid >= investment.agreed_amount:
-        investment.status = "completed"
+        # An investment already earning returns stays so
+        if investment.status != "earning":
+            investment.status = "completed"
         investment.next_payment_date = None
     elif investment.amount_paid > 0:
         investment.status = "paying"
         
     # 4. Save specifically these fields to prevent recursion
-    investment.save(update_fields=['amount_paid', 'status', 'next_payment_date'])
-
+    # (save() stamps completed_at when the investment becomes fully paid)
+    investment.save(update_fields=['amount_paid', 'status', 'next_payment_date', 'completed_at'])
 
 
+# --- SIGNAL 3: RESIZE PROJECT IMAGES ON UPLOAD ---
+@receiver(post_save, sender=InvestmentProject)
+def resize_project_image(sender, instance, **kwargs):
+    queue_derivatives(instance, "project_img", "project_img_sizes")
 
 
+# --- SIGNAL 4: PROJECT FUNDING COUNTERS ---
+@receiver(post_save, sender=ClientInvestment)
+def update_project_funding(sender, instance, created, raw=False, **kwargs):
+    # Same transaction as the save, so the counters never see a rolled-back row
+    if not raw:
+        funding.investment_saved(instance, created)
 
 
+@receiver(pre_delete, sender=ClientInvestment)
+def snapshot_project_funding(sender, instance, **kwargs):
+    funding.investment_deleting(instance)
 
 
+@receiver(post_delete, sender=ClientInvestment)
+def release_project_funding(sender, instance, origin=None, **kwargs):
+    funding.investment_deleted(instance, origin)
 
 
+# --- SIGNAL 5: KEEP SCHEDULE TEMPLATES IN STEP WITH THEIR PLAN ---
+@receiver(post_save, sender=InvestmentPlan)
+def refresh_schedule_templates(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    pricings = list(ProjectPricing.objects.filter(plan=instance))
+    for pricing in pricings:
+        pricing.plan = instance
+        pricing.build_schedule_template()
+    ProjectPricing.objects.bulk_update(pricings, ["schedule_template"])
 
 
+# --- SIGNAL 6: DATA VERSIONS FOR CONDITIONAL GETS ---
+@receiver(post_save, sender=ClientInvestment)
+@receiver(post_delete, sender=ClientInvestment)
+def bump_investment_version(sender, instance, **kwargs):
+    data_version.bump(instance.user_id)
 
 
+@receiver(post_save, sender=PaymentSchedule)
+@receiver(post_delete, sender=PaymentSchedule)
+def bump_schedule_version(sender, instance, **kwargs):
+    # The investment is usually loaded already (SIGNAL 2 reads it)
+    if PaymentSchedule.investment.is_cached(instance):
+        owner = instance.investment.user_id
+    else:
+        owner = (
+            ClientInvestment.objects.filter(pk=instance.investment_id)
+            .values_list("user_id", flat=True)
+            .first()
+        )
+    data_version.bump(owner)
+
+
+@receiver(post_save, sender=InvestmentProject)
+@receiver(post_delete, sender=InvestmentProject)
+@receiver(post_save, sender=InvestmentPlan)
+@receiver(post_delete, sender=InvestmentPlan)
+@receiver(post_save, sender=ProjectPricing)
+@receiver(post_delete, sender=ProjectPricing)
+def bump_catalogue_version(sender, **kwargs):
+    data_version.bump_shared()
@@ -1,3 +1,275 @@
-from django.test import TestCase
+import itertools
+import random
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient, APIRequestFactory
+
+from benchmarks import seed
+from payment.models import Transaction
+from .models import ClientInvestment, InvestmentProject, PaymentSchedule, ProjectPricing
+from .serializers import (
+    ClientInvestmentProjection,
+    ClientInvestmentSerializer,
+    InvestmentProjectSerializer,
+    PaymentScheduleProjection,
+    PaymentScheduleSerializer,
+    ProjectPricingProjection,
+    ProjectPricingSerializer,
+)
+
+# -------------------------------------------------------------------------
+# Read Projections vs Serializers
+# -------------------------------------------------------------------------
+# Randomised rows (benchmarks.seed with a fixed RNG seed) plus the edge cases
+# a projection has to get right, compared field by field and in order with
+# the serializer the projection replaces. Every ?fields= subset and ?expand=
+# combination is checked against the serializer output cut down / expanded
+# the same way.
+
+RNG_SEED = 7
+
+LOCAL_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+def seed_rows(rng_seed=RNG_SEED):
+    """
+    Seeds random investments, schedules, transactions and documents, then
+    turns some of them into edge cases:
+      - a project without an image, one with precomputed image sizes, one
+        whose size map belongs to an older file
+      - an investment with a zero agreed_amount
+      - an investment with every installment paid, one with no schedules
+      - a transaction without installment number or payment reference
+    Returns the RNG, for callers that add their own cases.
+    """
+    seed.seed(
+        users=4,
+        projects=4,
+        investments_per_user=3,
+        notifications_per_user=0,
+        documents_per_user=3,
+        rng_seed=rng_seed,
+    )
+    rng = random.Random(rng_seed)
+
+    # 1. Images, on projects that investments actually point at
+    project_ids = list(
+        dict.fromkeys(
+            ClientInvestment.objects.order_by("pk").values_list(
+                "selected_option__project_id", flat=True
+            )
+        )
+    )
+    rng.shuffle(project_ids)
+    no_image, precomputed, stale = project_ids[:3]
+    InvestmentProject.objects.filter(pk=no_image).update(project_img="", project_img_sizes={})
+    name = InvestmentProject.objects.get(pk=precomputed).project_img.name
+    InvestmentProject.objects.filter(pk=precomputed).update(
+        project_img_sizes={
+            "source": name,
+            "url": f"/media/precomputed/{name}",
+            "thumb": {"webp": "/media/precomputed/thumb.webp", "jpeg": "/media/precomputed/thumb.jpg"},
+        }
+    )
+    InvestmentProject.objects.filter(pk=stale).update(
+        project_img_sizes={"source": "project_img/old.png", "url": "/media/old.png"}
+    )
+
+    # 2. Investments
+    investments = list(ClientInvestment.objects.order_by("pk").values_list("pk", flat=True))
+    zero_amount, all_paid, no_schedules = rng.sample(investments, 3)
+    ClientInvestment.objects.filter(pk=zero_amount).update(agreed_amount=Decimal("0.00"))
+    PaymentSchedule.objects.filter(investment=all_paid).update(status="paid")
+    PaymentSchedule.objects.filter(investment=no_schedules).delete()
+
+    # 3. Transactions
+    transaction = rng.choice(list(Transaction.objects.order_by("pk").values_list("pk", flat=True)))
+    Transaction.objects.filter(pk=transaction).update(installment_number=None, payment_reference=None)
+    return rng
+
+
+def subsets(names):
+    """Every non-empty subset of names, each in a shuffled order."""
+    rng = random.Random(RNG_SEED)
+    for size in range(1, len(names) + 1):
+        for subset in itertools.combinations(names, size):
+            subset = list(subset)
+            rng.shuffle(subset)
+            yield subset
+
+
+class ProjectionTestCase(TestCase):
+    """Helpers shared by the projection tests of each app."""
+
+    def setUp(self):
+        # Storage URLs are memoized in the cache (core.media)
+        cache.clear()
+        self.request = APIRequestFactory().get("/api/")
+        self.context = {"request": self.request}
+
+    def assertSameOutput(self, expected, actual):
+        """Equal values of the same types, and the same key order at every level."""
+        self.assertEqual(expected, actual)
+        if isinstance(expected, dict):
+            self.assertEqual(list(expected), list(actual))
+            for name in expected:
+                self.assertSameOutput(expected[name], actual[name])
+        elif isinstance(expected, list):
+            for old, new in zip(expected, actual):
+                self.assertSameOutput(old, new)
+        else:
+            # 0 and 0.0 are equal but render differently
+            self.assertIs(type(actual), type(expected))
+
+    def assertMatchesSerializer(self, projection_class, serializer_class, queryset):
+        """Full output, then every ?fields= subset of it."""
+        expected = serializer_class(queryset, many=True, context=self.context).data
+        self.assertTrue(expected)
+        self.assertSameOutput(expected, projection_class(context=self.context).data(queryset))
+
+        names = list(expected[0])
+        for fields in subsets(names):
+            with self.subTest(fields=fields):
+                cut = [{name: row[name] for name in names if name in fields} for row in expected]
+                actual = projection_class(context=self.context, fields=fields).data(queryset)
+                self.assertSameOutput(cut, actual)
+
+
+@override_settings(STORAGES=LOCAL_STORAGES, MEDIA_URL="/media/")
+class InvestmentProjectionTests(ProjectionTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_rows()
+
+    def investments(self):
+        return ClientInvestment.objects.order_by("pk")
+
+    def test_client_investments_match_serializer(self):
+        self.assertMatchesSerializer(
+            ClientInvestmentProjection, ClientInvestmentSerializer, self.investments()
+        )
+
+    def test_edge_cases_are_covered(self):
+        data = ClientInvestmentProjection(context=self.context).data(self.investments())
+        self.assertIn(0, [row["percentage_completion"] for row in data])
+        self.assertIn(None, [row["next_payment_data"] for row in data])
+        self.assertIn(None, [row["project_image"] for row in data])
+        self.assertIn({}, [row["project_image_sizes"] for row in data])
+        self.assertTrue(any(row["project_image_sizes"] for row in data))
+
+    def test_schedules_match_serializer(self):
+        self.assertMatchesSerializer(
+            PaymentScheduleProjection,
+            PaymentScheduleSerializer,
+            PaymentSchedule.objects.order_by("investment", "installment_number"),
+        )
+
+    def test_pricing_matches_serializer(self):
+        self.assertMatchesSerializer(
+            ProjectPricingProjection,
+            ProjectPricingSerializer,
+            ProjectPricing.objects.select_related("project", "plan").order_by("pk"),
+        )
+
+    def test_every_expand_combination(self):
+        investments = list(
+            self.investments().select_related("selected_option__project", "selected_option__plan")
+        )
+        base = ClientInvestmentSerializer(investments, many=True, context=self.context).data
+        for expand in subsets(ClientInvestmentProjection.expandable):
+            with self.subTest(expand=expand):
+                expected = []
+                for investment, row in zip(investments, base):
+                    row = dict(row)
+                    # Replaced in place / appended, in ?expand= order
+                    for name in expand:
+                        if name == "selected_option":
+                            row[name] = ProjectPricingSerializer(
+                                investment.selected_option, context=self.context
+                            ).data
+                        else:
+                            row[name] = PaymentScheduleSerializer(
+                                investment.schedules.all(), many=True, context=self.context
+                            ).data
+                    expected.append(row)
+                actual = ClientInvestmentProjection(context=self.context, expand=expand).data(
+                    self.investments()
+                )
+                self.assertSameOutput(expected, actual)
+
+    def test_expand_with_fields(self):
+        data = ClientInvestmentProjection(
+            context=self.context, fields=["id"], expand=["schedules"]
+        ).data(self.investments())
+        self.assertEqual(list(data[0]), ["id", "schedules"])
+
+    def test_skipped_fields_leave_the_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            ClientInvestmentProjection(context=self.context, fields=["id", "status"]).data(
+                self.investments()
+            )
+        (query,) = queries.captured_queries
+        self.assertNotIn("JOIN", query["sql"])
+        self.assertNotIn("(SELECT", query["sql"])
+
+    def test_unknown_names_are_rejected(self):
+        for fields, expand in ((["nope"], None), (None, ["nope"]), (["id", "balance2"], None)):
+            with self.subTest(fields=fields, expand=expand), self.assertRaises(ValidationError):
+                ClientInvestmentProjection(context=self.context, fields=fields, expand=expand)
+
+
+@override_settings(STORAGES=LOCAL_STORAGES, MEDIA_URL="/media/")
+class InvestmentListFieldsTests(ProjectionTestCase):
+    """?fields= / ?expand= on the endpoints themselves."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_rows()
+        cls.user = ClientInvestment.objects.order_by("pk").first().user
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_project_list_fields(self):
+        full = self.client.get("/api/investments/").json()
+        names = list(InvestmentProjectSerializer().fields)
+        for fields in (["id", "name"], ["funding_investors", "id"], ["pricing_options"], names):
+            with self.subTest(fields=fields):
+                response = self.client.get("/api/investments/", {"fields": ",".join(fields)})
+                self.assertEqual(response.status_code, 200)
+                expected = [{name: row[name] for name in names if name in fields} for row in full]
+                self.assertEqual(response.json(), expected)
+
+    def test_project_list_skips_prefetch_and_subqueries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/investments/", {"fields": "id,name"})
+        sql = [query["sql"] for query in queries.captured_queries]
+        self.assertEqual(len([query for query in sql if "investment_projectpricing" in query]), 0)
+        self.assertFalse(any("(SELECT" in query for query in sql))
+
+    def test_client_investment_list(self):
+        response = self.client.get(
+            "/api/client-investments/", {"fields": "id,status", "expand": "selected_option"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()[0]), ["id", "status", "selected_option"])
+
+    def test_bad_names_are_400(self):
+        for path, params in (
+            ("/api/investments/", {"fields": "zzz"}),
+            ("/api/investments/", {"expand": "pricing_options"}),
+            ("/api/client-investments/", {"fields": "zzz"}),
+            ("/api/client-investments/", {"expand": "zzz"}),
+        ):
+            with self.subTest(path=path, params=params):
+                self.assertEqual(self.client.get(path, params).status_code, 400)
@@ -1,10 +1,13 @@
 from django.urls import path
 from .views import (
     ClientInvestmentDetailView,
+    ClientInvestmentExportView,
     ClientInvestmentListView,
+    ClientInvestmentRoiView,
     CreateInvestmentView,
     InvestmentProjectListView,
-    InvestorDashboardView
+    InvestorDashboardView,
+    PaymentScheduleExportView,
 )
 
 urlpatterns = [
@@ -23,6 +26,11 @@ urlpatterns = [
         ClientInvestmentDetailView.as_view(),
         name="investment-detail",
     ),
+    path(
+        "client-investments/<int:pk>/roi/",
+        ClientInvestmentRoiView.as_view(),
+        name="investment-roi",
+    ),
 
      path(
         "dashboard/summary/",
@@ -30,6 +38,17 @@ urlpatterns = [
         name="investment-detail",
     ),
 
+    # Staff exports (?from=YYYY-MM-DD&to=YYYY-MM-DD)
+    path(
+        "exports/client-investments.<str:fmt>",
+        ClientInvestmentExportView.as_view(),
+        name="client-investment-export",
+    ),
+    path(
+        "exports/payment-schedules.<str:fmt>",
+        PaymentScheduleExportView.as_view(),
+        name="payment-schedule-export",
+    ),
 ]
 
 
@@ -1,29 +1,68 @@
 from rest_framework import generics, permissions, status
-from .models import InvestmentProject, ClientInvestment
+from django.db import transaction
+from django.db.models import Prefetch
+from . import funding, roi
+from .models import InvestmentProject, ClientInvestment, ProjectPricing
 from .serializers import (
     ClientInvestmentDetailSerializer,
     CreateInvestmentSerializer,
     InvestmentProjectSerializer,
-    ClientInvestmentSerializer,
+    ClientInvestmentProjection,
+    PaymentScheduleSerializer,
 )
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from core.idempotency import idempotent
+from core.projections import check_names, query_list
 
 
 class InvestmentProjectListView(generics.ListAPIView):
     serializer_class = InvestmentProjectSerializer
-    queryset = InvestmentProject.objects.filter(active=True)
+
+    def get_fields(self):
+        """?fields= (None: all fields). Nothing here is expandable."""
+        fields = query_list(self.request, "fields")
+        check_names("fields", fields, list(InvestmentProjectSerializer().fields))
+        check_names("expand", query_list(self.request, "expand"), ())
+        return fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_fields()
+        return context
+
+    def get_queryset(self):
+        # Optimization: funding counters come from shard subqueries in the same
+        # query, and all pricing options (with their plans) from one more.
+        # The prefetch sets pricing.project, so roi_start_display doesn't query.
+        # Fields left out by ?fields= skip their prefetch/subqueries.
+        fields = self.get_fields()
+        projects = InvestmentProject.objects.filter(active=True)
+        if not fields or "pricing_options" in fields:
+            projects = projects.prefetch_related(
+                Prefetch("pricing_options", queryset=ProjectPricing.objects.select_related("plan"))
+            )
+        counters = [name for name in funding.ANNOTATIONS if not fields or name in fields]
+        return funding.annotate(projects, counters)
 
 
 class CreateInvestmentView(generics.CreateAPIView):
     serializer_class = CreateInvestmentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    # Mobile clients retry on timeouts: a repeated Idempotency-Key gets the
+    # first response back instead of creating a second investment
+    @idempotent("investment-create")
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        investment = serializer.save()
+
+        # One transaction: the investment, its schedules (post_save signal) and
+        # the funding counters are committed together or not at all
+        with transaction.atomic():
+            investment = serializer.save()
+        first_installment = investment.created_schedules[0]
 
         # Return a custom response structure matching your Frontend Interface
         return Response(
@@ -31,6 +70,7 @@ class CreateInvestmentView(generics.CreateAPIView):
                 "message": "Investment initiated successfully",
                 "investment_id": investment.id,
                 "status": investment.status,
+                "first_installment": PaymentScheduleSerializer(first_installment).data,
             },
             status=status.HTTP_201_CREATED,
         )
@@ -58,10 +98,16 @@ class ClientInvestmentListView(APIView):
             )
 
         # 3. Serialize
-        serializer = ClientInvestmentSerializer(
-            queryset, many=True, context={"request": request}
+        # Optimization: ClientInvestmentSerializer output from values() rows,
+        # next payment included, in one query (see ClientInvestmentProjection).
+        # ?fields= / ?expand= pick what is selected.
+        projection = ClientInvestmentProjection(
+            context={"request": request},
+            fields=query_list(request, "fields"),
+            expand=query_list(request, "expand"),
         )
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        data = projection.data(queryset)
+        return Response(data, status=status.HTTP_200_OK)
 
 
 class ClientInvestmentDetailView(APIView):
@@ -84,6 +130,33 @@ class ClientInvestmentDetailView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class ClientInvestmentRoiView(APIView):
+    """
+    GET: Projected ROI payouts (time series) of one of the user's
+    completed or earning investments. See investment.roi.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        # 1. Ownership check (404 for other users' investments)
+        investment = get_object_or_404(
+            ClientInvestment.objects.select_related(None).only("pk", "status"),
+            pk=pk,
+            user=request.user,
+        )
+
+        # 2. Only settled investments have an ROI timeline
+        if investment.status not in roi.PROJECTABLE_STATUSES:
+            return Response(
+                {"error": "ROI is projected once the investment is fully paid."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # 3. Cached projection (computed on a miss)
+        return Response(roi.projection_for(investment.pk), status=status.HTTP_200_OK)
+
+
 
 
 
@@ -166,4 +239,38 @@ class InvestorDashboardView(APIView):
 
         # Note: context={'request': request} is added to ensure ImageFields generate full URLs
         serializer = DashboardSummarySerializer(data, context={'request': request})
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+# -------------------------------------------------------------------------
+# Staff Exports
+# -------------------------------------------------------------------------
+from core.exports import StaffExportView
+from .exports import (
+    CLIENT_INVESTMENT_COLUMNS,
+    CLIENT_INVESTMENT_RELATED,
+    PAYMENT_SCHEDULE_COLUMNS,
+    PAYMENT_SCHEDULE_RELATED,
+)
+
+
+class ClientInvestmentExportView(StaffExportView):
+    """Staff only: every client investment as CSV/XLSX (?from=/?to= on start date)."""
+    columns = CLIENT_INVESTMENT_COLUMNS
+    basename = "client-investments"
+    date_lookup = "start_date"
+
+    def get_queryset(self):
+        return ClientInvestment.objects.select_related(*CLIENT_INVESTMENT_RELATED).order_by("pk")
+
+
+class PaymentScheduleExportView(StaffExportView):
+    """Staff only: every payment schedule as CSV/XLSX (?from=/?to= on due date)."""
+    columns = PAYMENT_SCHEDULE_COLUMNS
+    basename = "payment-schedules"
+    date_lookup = "due_date"
+
+    def get_queryset(self):
+        return PaymentSchedule.objects.select_related(*PAYMENT_SCHEDULE_RELATED).order_by(
+            "investment_id", "installment_number"
+        )
@@ -13,6 +13,8 @@ class NotificationAdmin(admin.ModelAdmin):
 
     # Improve readability in list view
     list_per_page = 20
+    # The "user" column renders user.__str__ on every row
+    list_select_related = ("user",)
 
     # Coloring the status in the list view (Optional visual flair)
     def notification_type_colored(self, obj):
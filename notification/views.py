@@ -8,6 +8,8 @@ from django.shortcuts import get_object_or_404
 from .models import Notification
 from account.models import Profile
 from .serializers import NotificationSerializer
+from core import data_version
+from core.media import file_url, size_urls
 
 
 class NotificationListView(generics.ListAPIView):
@@ -33,9 +35,11 @@ class MarkAllReadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
-        Notification.objects.filter(user=request.user, is_read=False).update(
+        if Notification.objects.filter(user=request.user, is_read=False).update(
             is_read=True
-        )
+        ):
+            # No save() signals for update()
+            data_version.bump(request.user.pk)
         return Response({"status": "all marked as read"}, status=status.HTTP_200_OK)
 
 
@@ -51,12 +55,20 @@ class HeaderDataView(APIView):
     def get(self, request):
         user = request.user
 
-        # 1. Get Profile Image
+        # 1. Get Profile Image (+ resized copies so the 40px avatar stays small)
         profile_img_url = None
+        profile_img_sizes = {}
         try:
             if hasattr(user, "profile") and user.profile.profile_picture:
-                profile_img_url = request.build_absolute_uri(
-                    user.profile.profile_picture.url
+                profile_img_url = file_url(
+                    user.profile.profile_picture,
+                    user.profile.profile_picture_sizes,
+                    request,
+                )
+                profile_img_sizes = size_urls(
+                    user.profile.profile_picture,
+                    user.profile.profile_picture_sizes,
+                    request,
                 )
         except Profile.DoesNotExist:
             pass
@@ -70,6 +82,7 @@ class HeaderDataView(APIView):
         return Response(
             {
                 "profile_image": profile_img_url,
+                "profile_image_sizes": profile_img_sizes,
                 "has_notifications": has_unread,
                 "unread_count": unread_count,
             }
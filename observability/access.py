@@ -0,0 +1,19 @@
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+def is_staff_request(request):
+    """
+    True for an admin session or a staff JWT.
+    Safe to call from middleware: DRF has not authenticated the request yet,
+    so the bearer token is checked here directly.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return True
+
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return bool(result and result[0].is_staff)
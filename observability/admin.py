@@ -0,0 +1,166 @@
+from django.contrib import admin
+from django.db.models import Avg, Count, Max, Sum
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .models import RequestProfile, SlowQuery
+from .profiling import artifact_path
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    # 1. Columns shown in the list view
+    list_display = (
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "formatted_duration",
+        "queries",
+        "memory_delta_kb",
+        "reason",
+        "user",
+    )
+    list_select_related = ("user",)
+
+    # 2. Filters and search
+    list_filter = ("reason", "method", "created_at")
+    search_fields = ("path", "route", "user__email")
+
+    # 3. Profiles are written by the middleware only
+    readonly_fields = (
+        "created_at",
+        "user",
+        "reason",
+        "method",
+        "path",
+        "route",
+        "status_code",
+        "duration_ms",
+        "queries",
+        "memory_delta_kb",
+        "memory_peak_kb",
+        "download_link",
+        "formatted_report",
+    )
+    exclude = ("artifact", "report")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    # --- Artifact download ---
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="observability_requestprofile_download",
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise Http404
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        try:
+            handle = open(artifact_path(profile.artifact), "rb")
+        except (OSError, ValueError):
+            raise Http404("Profile dump is no longer on disk.")
+        return FileResponse(handle, as_attachment=True, filename=profile.artifact)
+
+    # --- Helper Methods ---
+
+    @admin.display(description="Duration", ordering="duration_ms")
+    def formatted_duration(self, obj):
+        return f"{obj.duration_ms:,.1f} ms"
+
+    @admin.display(description="cProfile dump")
+    def download_link(self, obj):
+        url = reverse("admin:observability_requestprofile_download", args=[obj.pk])
+        return format_html('<a href="{}">{}</a>', url, obj.artifact)
+
+    @admin.display(description="Report")
+    def formatted_report(self, obj):
+        return format_html(
+            '<pre style="font-size: 12px; white-space: pre; overflow-x: auto;">{}</pre>',
+            obj.report,
+        )
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """
+    The changelist groups captures by SQL fingerprint; following a group's
+    link (?fingerprint=...) shows the individual captures.
+    """
+
+    # 1. Columns shown in the per-capture list
+    list_display = ("captured_at", "formatted_duration", "view", "frame", "params_shape")
+    list_filter = ("captured_at", "view")
+    search_fields = ("normalized_sql", "view", "frame")
+
+    # 2. Captures are written by the query wrapper only
+    readonly_fields = (
+        "captured_at",
+        "fingerprint",
+        "duration_ms",
+        "many",
+        "view",
+        "frame",
+        "params_shape",
+        "formatted_sql",
+        "normalized_sql",
+    )
+    exclude = ("sql",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        if "fingerprint" in request.GET:
+            return super().changelist_view(request, extra_context)
+
+        groups = (
+            SlowQuery.objects.values("fingerprint")
+            .annotate(
+                count=Count("id"),
+                total_ms=Sum("duration_ms"),
+                avg_ms=Avg("duration_ms"),
+                max_ms=Max("duration_ms"),
+                last_seen=Max("captured_at"),
+                sql=Max("normalized_sql"),
+            )
+            .order_by("-total_ms")[:200]
+        )
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Slow queries by fingerprint",
+            "groups": groups,
+            **(extra_context or {}),
+        }
+        return TemplateResponse(
+            request, "admin/observability/slowquery/fingerprints.html", context
+        )
+
+    # --- Helper Methods ---
+
+    @admin.display(description="Duration", ordering="duration_ms")
+    def formatted_duration(self, obj):
+        return f"{obj.duration_ms:,.1f} ms"
+
+    @admin.display(description="SQL")
+    def formatted_sql(self, obj):
+        return format_html(
+            '<pre style="font-size: 12px; white-space: pre-wrap;">{}</pre>', obj.sql
+        )
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class ObservabilityConfig(AppConfig):
+    name = "observability"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from .instrumentation import install_query_wrapper
+
+        # Every new DB connection (one per thread) gets the query wrapper
+        connection_created.connect(install_query_wrapper)
+
+        import observability.signals
@@ -0,0 +1,54 @@
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from . import slow_queries, tracing
+
+# -------------------------------------------------------------------------
+# Per-request DB Instrumentation
+# -------------------------------------------------------------------------
+# A single execute wrapper is attached to every DB connection when it is
+# created. It times every statement: the total is added to the current
+# request's RequestStats (set by the middleware), and statements over
+# SLOW_QUERY_THRESHOLD_MS are handed to the slow query buffer, inside or
+# outside a request. Sampled traces also get a "db.query" span per statement.
+
+
+class RequestStats:
+    __slots__ = ("queries", "sql_time", "view")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.view = None
+
+
+current_stats = ContextVar("request_stats", default=None)
+
+
+def query_wrapper(execute, sql, params, many, context):
+    span = tracing.start_span("db.query", **{"db.statement": sql[:2000]})
+    started = time.perf_counter()
+    error = None
+    try:
+        return execute(sql, params, many, context)
+    except Exception as exc:
+        error = exc
+        raise
+    finally:
+        tracing.end_span(span, error)
+        duration = time.perf_counter() - started
+        stats = current_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.sql_time += duration
+        if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            slow_queries.capture(
+                sql, params, many, duration, stats.view if stats else None
+            )
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    if query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_wrapper)
@@ -0,0 +1,128 @@
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from contextvars import ContextVar
+
+from . import tracing
+
+# -------------------------------------------------------------------------
+# Logging Pipeline
+# -------------------------------------------------------------------------
+# Request threads only do two things per record:
+#   1. RequestContextFilter stamps request_id / trace_id / span_id on it
+#      (they live in context vars, so this must happen in the caller's thread)
+#   2. QueuedHandler merges the message args and puts the record on a queue
+# A QueueListener thread then does the JSON formatting and the actual write.
+
+current_request_id = ContextVar("current_request_id", default=None)
+
+
+class RequestContextFilter(logging.Filter):
+    """Adds request_id, trace_id and span_id ("-" outside a request)."""
+
+    def filter(self, record):
+        record.request_id = current_request_id.get() or "-"
+        record.trace_id = tracing.trace_id() or "-"
+        record.span_id = tracing.span_id() or "-"
+        return True
+
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RESERVED = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None))
+) | {"message", "asctime", "request_id", "trace_id", "span_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; `extra=` fields are included as keys."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+            .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "trace_id": getattr(record, "trace_id", "-"),
+            "span_id": getattr(record, "span_id", "-"),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class QueuedHandler(logging.handlers.QueueHandler):
+    """
+    Non-blocking handler: records are queued and written to `stream` by a
+    QueueListener thread. The formatter configured for this handler is used
+    by that thread. When the queue is full, records are dropped rather than
+    making the request wait.
+    """
+
+    def __init__(self, stream=None, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.dropped = 0
+        self.listener = logging.handlers.QueueListener(
+            self.queue, self.target, respect_handler_level=False
+        )
+        self.listener.start()
+        atexit.register(self._stop_listener)
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Merge args and render the traceback now (both may reference objects
+        # that change after this call); leave the formatting to the listener.
+        message = record.getMessage()
+        # Shallow copy without re-running LogRecord.__init__: other handlers
+        # still get the original record
+        copy = logging.LogRecord.__new__(logging.LogRecord)
+        copy.__dict__.update(record.__dict__)
+        record = copy
+        record.msg = message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _stop_listener(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def close(self):
+        self._stop_listener()
+        atexit.unregister(self._stop_listener)
+        self.target.close()
+        super().close()
+
+
+def make_queued_handler(stream=None, queue_size=10000):
+    """
+    LOGGING entry point ("()": ...) for QueuedHandler. Since Python 3.12,
+    dictConfig treats a "class" that subclasses QueueHandler specially (it
+    wants a "handlers" list and passes in its own queue), which a handler
+    that owns its queue and target can't accept; a factory skips that path.
+    """
+    return QueuedHandler(stream=stream, queue_size=queue_size)
+
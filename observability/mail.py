@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .tracing import span
+
+
+class TracedEmailBackend(BaseEmailBackend):
+    """
+    EMAIL_BACKEND wrapper: delivers through TRACED_EMAIL_BACKEND inside a
+    "mail.send" span.
+    """
+
+    def __init__(self, fail_silently=False, **kwargs):
+        super().__init__(fail_silently=fail_silently)
+        self.backend = get_connection(
+            settings.TRACED_EMAIL_BACKEND, fail_silently=fail_silently, **kwargs
+        )
+
+    def open(self):
+        with span("mail.connect"):
+            return self.backend.open()
+
+    def close(self):
+        return self.backend.close()
+
+    def send_messages(self, email_messages):
+        recipients = sum(len(message.recipients()) for message in email_messages)
+        with span(
+            "mail.send",
+            **{"mail.messages": len(email_messages), "mail.recipients": recipients},
+        ):
+            return self.backend.send_messages(email_messages)
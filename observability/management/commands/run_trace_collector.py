@@ -0,0 +1,102 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+def _attribute_value(value):
+    for key in ("stringValue", "boolValue", "doubleValue"):
+        if key in value:
+            return value[key]
+    if "intValue" in value:
+        return int(value["intValue"])
+    return None
+
+
+def flatten(payload):
+    """Yields one plain dict per span from an OTLP/JSON export request."""
+    for resource_spans in payload.get("resourceSpans", []):
+        resource = {
+            a["key"]: _attribute_value(a["value"])
+            for a in resource_spans.get("resource", {}).get("attributes", [])
+        }
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                start, end = int(span["startTimeUnixNano"]), int(span["endTimeUnixNano"])
+                yield {
+                    "service": resource.get("service.name"),
+                    "trace_id": span["traceId"],
+                    "span_id": span["spanId"],
+                    "parent_span_id": span.get("parentSpanId"),
+                    "name": span["name"],
+                    "duration_ms": round((end - start) / 1e6, 3),
+                    "attributes": {
+                        a["key"]: _attribute_value(a["value"])
+                        for a in span.get("attributes", [])
+                    },
+                    "status": span.get("status", {}),
+                }
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a minimal OTLP/HTTP (JSON) trace receiver for local development. "
+        "Point TRACING_OTLP_ENDPOINT at it and set TRACING_EXPORTER=otlp."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=4318)
+        parser.add_argument(
+            "--output",
+            help="Append received spans to this JSON-lines file instead of printing them.",
+        )
+
+    def handle(self, *args, **options):
+        command = self
+        output = options["output"]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path != "/v1/traces":
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    spans = list(flatten(json.loads(self.rfile.read(length))))
+                except (ValueError, KeyError) as exc:
+                    self.send_error(400, str(exc))
+                    return
+
+                if output:
+                    with open(output, "a", encoding="utf-8") as handle:
+                        for span in spans:
+                            handle.write(json.dumps(span) + "\n")
+                else:
+                    for span in spans:
+                        indent = "  " if span["parent_span_id"] else ""
+                        command.stdout.write(
+                            f"{span['trace_id'][:8]} {indent}{span['name']:<40} "
+                            f"{span['duration_ms']:>9.2f} ms"
+                        )
+
+                body = b"{}"
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((options["host"], options["port"]), Handler)
+        self.stdout.write(
+            f"Collecting traces on http://{options['host']}:{options['port']}/v1/traces"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
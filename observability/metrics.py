@@ -0,0 +1,131 @@
+import threading
+from bisect import bisect_left
+
+# -------------------------------------------------------------------------
+# In-process Metrics Registry (Prometheus text format)
+# -------------------------------------------------------------------------
+# Deliberately tiny: counters and fixed-bucket histograms kept in dicts behind
+# one lock. Each request takes the lock once (see record_request), so the
+# overhead is a handful of dict updates. Values are per process; Prometheus
+# sums across workers when scraping each one.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+WEBHOOK_OUTCOMES = ("processed", "duplicate", "unmatched", "failed")
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf; cumulated only when rendering
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+
+    def describe(self, name, kind, text):
+        self._help[name] = (kind, text)
+
+    def _inc(self, name, labels, value=1):
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def _observe(self, name, labels, value, buckets=LATENCY_BUCKETS):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+
+    def inc(self, name, labels=(), value=1):
+        with self._lock:
+            self._inc(name, labels, value)
+
+    def record_request(self, route, method, status, duration, queries, sql_time):
+        request_labels = (("route", route), ("method", method))
+        with self._lock:
+            self._inc("http_requests_total", request_labels + (("status", str(status)),))
+            self._observe("http_request_duration_seconds", request_labels, duration)
+            self._inc("db_queries_total", request_labels, queries)
+            self._inc("db_query_duration_seconds_total", request_labels, sql_time)
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                key: (list(h.counts), h.total, h.count, h.buckets)
+                for key, h in self._histograms.items()
+            }
+        return counters, histograms
+
+    def render(self):
+        counters, histograms = self.snapshot()
+        lines = []
+        names = sorted({name for name, _ in counters} | {name for name, _ in histograms})
+
+        for name in names:
+            metric = f"bugaking_{name}"
+            kind, text = self._help.get(name, ("untyped", ""))
+            lines.append(f"# HELP {metric} {text}")
+            lines.append(f"# TYPE {metric} {kind}")
+
+            for (key_name, labels), value in sorted(counters.items()):
+                if key_name == name:
+                    lines.append(f"{metric}{_labels(labels)} {_number(value)}")
+
+            for (key_name, labels), (counts, total, count, buckets) in sorted(histograms.items()):
+                if key_name != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else _number(bound)
+                    lines.append(
+                        f"{metric}_bucket{_labels(labels + (('le', le),))} {cumulative}"
+                    )
+                lines.append(f"{metric}_sum{_labels(labels)} {_number(total)}")
+                lines.append(f"{metric}_count{_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+registry = Registry()
+registry.describe("http_requests_total", "counter", "HTTP requests by route, method and status.")
+registry.describe("http_request_duration_seconds", "histogram", "Request latency by route.")
+registry.describe("db_queries_total", "counter", "SQL statements executed, by route.")
+registry.describe("db_query_duration_seconds_total", "counter", "Time spent in SQL, by route.")
+registry.describe("webhook_events_total", "counter", "Paystack webhook outcomes.")
+
+
+def webhook_outcome(outcome):
+    registry.inc("webhook_events_total", (("outcome", outcome),))
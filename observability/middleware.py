@@ -0,0 +1,158 @@
+import logging
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import slow_queries, tracing
+from .instrumentation import RequestStats, current_stats
+from .log import current_request_id
+from .metrics import registry
+from .profiling import RequestProfiler, profile_reason, save_profile
+
+logger = logging.getLogger(__name__)
+
+# Accept a caller's request ID only if it is short and harmless to log
+REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware:
+    """
+    Gives every request an ID (the incoming X-Request-Id when valid), makes it
+    available to log records and echoes it back in the response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.headers.get("X-Request-Id", "")
+        if not REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+
+        token = current_request_id.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_id.reset(token)
+        response["X-Request-Id"] = request_id
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and SQL count/time per route.
+    Routes are labelled by URL pattern (e.g. "api/client-investments/<int:pk>/"),
+    never the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match else "<unmatched>"
+        registry.record_request(
+            route,
+            request.method,
+            response.status_code,
+            time.perf_counter() - started,
+            stats.queries,
+            stats.sql_time,
+        )
+
+        if slow_queries.flush_due():
+            slow_queries.flush()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Lets slow queries be attributed to the view that ran them
+        stats = current_stats.get()
+        if stats is not None:
+            view_class = getattr(view_func, "view_class", None) or getattr(
+                view_func, "cls", None
+            )
+            target = view_class or view_func
+            stats.view = f"{target.__module__}.{target.__qualname__}"
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in cProfile + tracemalloc capture of a single request (see
+    observability.profiling). Removed from the stack entirely when
+    PROFILING_ENABLED is off.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reason = profile_reason(request)
+        if reason is None:
+            return self.get_response(request)
+
+        profiler = RequestProfiler()
+        if not profiler.start():
+            # Another request in this process is being profiled
+            return self.get_response(request)
+
+        stats = current_stats.get()
+        queries_before = stats.queries if stats else 0
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+        duration = time.perf_counter() - started
+
+        try:
+            record = save_profile(
+                profiler,
+                request,
+                response,
+                reason,
+                duration,
+                (stats.queries if stats else 0) - queries_before,
+            )
+        except Exception:
+            logger.exception("Could not store request profile for %s", request.path)
+        else:
+            response["X-Profile-Id"] = str(record.pk)
+        return response
+
+
+class TracingMiddleware:
+    """
+    Opens the root span of each request and returns the trace ID in
+    X-Trace-Id so a client report can be matched to logs and spans.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with tracing.request_trace(
+            "http.request",
+            traceparent=request.headers.get("traceparent"),
+            **{"http.method": request.method, "http.target": request.path},
+        ) as root:
+            response = self.get_response(request)
+            if root is not None:
+                match = getattr(request, "resolver_match", None)
+                root.set("http.route", match.route if match else "<unmatched>")
+                root.set("http.status_code", response.status_code)
+            response["X-Trace-Id"] = tracing.trace_id()
+        return response
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('observability', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('captured_at', models.DateTimeField(db_index=True)),
+                ('fingerprint', models.CharField(db_index=True, max_length=16)),
+                ('normalized_sql', models.TextField()),
+                ('sql', models.TextField()),
+                ('params_shape', models.CharField(blank=True, max_length=255)),
+                ('duration_ms', models.FloatField()),
+                ('many', models.BooleanField(default=False)),
+                ('view', models.CharField(blank=True, max_length=255)),
+                ('frame', models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                'verbose_name_plural': 'slow queries',
+                'ordering': ['-captured_at'],
+            },
+        ),
+    ]
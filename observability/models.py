@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db import models
+
+
+class RequestProfile(models.Model):
+    """
+    Index row for one profiled request. The cProfile dump itself lives on
+    local disk under PROFILING_DIR; `report` keeps a readable summary.
+    """
+
+    REASONS = (
+        ("flag", "Requested by staff"),
+        ("sample", "Random sample"),
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    reason = models.CharField(max_length=10, choices=REASONS)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    route = models.CharField(max_length=255, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    queries = models.PositiveIntegerField(default=0)
+    memory_delta_kb = models.IntegerField(default=0)
+    memory_peak_kb = models.PositiveIntegerField(default=0)
+    artifact = models.CharField(max_length=255)
+    report = models.TextField()
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+class SlowQuery(models.Model):
+    """
+    One SQL statement that took longer than SLOW_QUERY_THRESHOLD_MS.
+    Written in batches from the in-process ring buffer (see
+    observability.slow_queries); `fingerprint` groups rows by statement shape.
+    """
+
+    captured_at = models.DateTimeField(db_index=True)
+    fingerprint = models.CharField(max_length=16, db_index=True)
+    normalized_sql = models.TextField()
+    sql = models.TextField()
+    params_shape = models.CharField(max_length=255, blank=True)
+    duration_ms = models.FloatField()
+    many = models.BooleanField(default=False)
+    view = models.CharField(max_length=255, blank=True)
+    frame = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ["-captured_at"]
+        verbose_name_plural = "slow queries"
+
+    def __str__(self):
+        return f"{self.fingerprint} ({self.duration_ms:.0f} ms)"
@@ -0,0 +1,172 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import tracemalloc
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
+
+from .access import is_staff_request
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------------------------
+# On-demand Request Profiling
+# -------------------------------------------------------------------------
+# A request is profiled when a staff user asks for it (PROFILING_HEADER or
+# ?PROFILING_QUERY_PARAM=1) or when it falls in the PROFILING_SAMPLE_RATE
+# fraction. Profiling captures:
+#   1. a cProfile call graph (saved as a .prof file, loadable by pstats/snakeviz)
+#   2. a tracemalloc diff between the start and the end of the request
+# Only one request per process is profiled at a time: cProfile cannot nest
+# and tracemalloc is process-wide, so overlapping captures would be garbage.
+
+_busy = threading.Lock()
+
+# tracemalloc's own bookkeeping and the import machinery only add noise
+_MEMORY_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def profile_reason(request):
+    """
+    "flag", "sample" or None. The staff check (which may decode a JWT) only
+    runs when the flag is present, so unflagged requests cost a dict lookup
+    and one random() call.
+    """
+    flagged = (
+        request.headers.get(settings.PROFILING_HEADER)
+        or request.GET.get(settings.PROFILING_QUERY_PARAM)
+    )
+    if flagged and is_staff_request(request):
+        return "flag"
+    rate = settings.PROFILING_SAMPLE_RATE
+    if rate and random.random() < rate:
+        return "sample"
+    return None
+
+
+class RequestProfiler:
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self._owns_tracemalloc = False
+        self._before = None
+        self.memory_diff = []
+        self.memory_delta = 0
+        self.memory_peak = 0
+
+    def start(self):
+        """Returns False when another request is already being profiled."""
+        if not _busy.acquire(blocking=False):
+            return False
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(settings.PROFILING_TRACEMALLOC_FRAMES)
+                self._owns_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._before = tracemalloc.take_snapshot()
+            self.profile.enable()
+        except Exception:
+            self._release()
+            raise
+        return True
+
+    def stop(self):
+        try:
+            self.profile.disable()
+            after = tracemalloc.take_snapshot()
+            _, self.memory_peak = tracemalloc.get_traced_memory()
+            self.memory_diff = after.filter_traces(_MEMORY_FILTERS).compare_to(
+                self._before.filter_traces(_MEMORY_FILTERS), "lineno"
+            )
+            self.memory_delta = sum(stat.size_diff for stat in self.memory_diff)
+        finally:
+            self._release()
+
+    def _release(self):
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        self._before = None
+        _busy.release()
+
+    def report(self, limit):
+        out = io.StringIO()
+        out.write("== CPU (cumulative) ==\n")
+        stats = pstats.Stats(self.profile, stream=out)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+
+        out.write("\n== Memory (allocated during request, by line) ==\n")
+        for stat in self.memory_diff[:limit]:
+            out.write(f"{stat}\n")
+        return out.getvalue()
+
+
+def _artifact_dir():
+    path = settings.PROFILING_DIR
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def artifact_path(name):
+    """Absolute path of a stored artifact; refuses anything outside PROFILING_DIR."""
+    root = os.path.realpath(settings.PROFILING_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.dirname(path) != root:
+        raise ValueError(f"Invalid profile artifact name: {name}")
+    return path
+
+
+def save_profile(profiler, request, response, reason, duration, queries):
+    from .models import RequestProfile
+
+    name = f"{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}.prof"
+    profiler.profile.dump_stats(os.path.join(_artifact_dir(), name))
+
+    match = getattr(request, "resolver_match", None)
+    user = getattr(request, "user", None)
+    record = RequestProfile.objects.create(
+        user=user if user is not None and user.is_authenticated else None,
+        reason=reason,
+        method=request.method,
+        path=request.get_full_path()[:500],
+        route=match.route if match else "",
+        status_code=response.status_code,
+        duration_ms=duration * 1000,
+        queries=queries,
+        memory_delta_kb=profiler.memory_delta // 1024,
+        memory_peak_kb=profiler.memory_peak // 1024,
+        artifact=name,
+        report=profiler.report(settings.PROFILING_REPORT_LINES),
+    )
+    _prune()
+    return record
+
+
+def _prune():
+    """Keeps only the newest PROFILING_MAX_ARTIFACTS profiles."""
+    from .models import RequestProfile
+
+    stale = RequestProfile.objects.order_by("-created_at", "-pk")[
+        settings.PROFILING_MAX_ARTIFACTS:
+    ]
+    # post_delete removes the files
+    for record in stale:
+        record.delete()
+
+
+def delete_artifact(name):
+    try:
+        os.remove(artifact_path(name))
+    except (OSError, ValueError):
+        logger.warning("Could not remove profile artifact %s", name)
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import RequestProfile
+from .profiling import delete_artifact
+
+
+# --- SIGNAL 1: REMOVE PROFILE DUMPS FROM DISK ---
+@receiver(post_delete, sender=RequestProfile)
+def remove_profile_artifact(sender, instance, **kwargs):
+    delete_artifact(instance.artifact)
@@ -0,0 +1,114 @@
+import datetime
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.db import app_frame, caller_frame, fingerprint, normalize_sql
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------------------------
+# Slow Query Capture
+# -------------------------------------------------------------------------
+# The query wrapper calls capture() for statements slower than
+# SLOW_QUERY_THRESHOLD_MS. Captures go into a bounded deque (oldest dropped
+# first when full), and the request middleware flushes it to the SlowQuery
+# table at most every SLOW_QUERY_FLUSH_INTERVAL seconds, in one bulk insert.
+# Statement text is normalized at flush time, off the query's hot path.
+
+_buffer = deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+_lock = threading.Lock()
+_state = threading.local()
+_last_flush = time.monotonic()
+
+MAX_SQL_LENGTH = 10_000
+
+# Entry points are in the project too but say nothing about who queried
+IGNORED_FRAMES = ("observability", "manage.py", "core/wsgi.py", "core/asgi.py")
+
+
+def _shape(value):
+    """Type (and size for containers/strings) of a parameter, never its value."""
+    name = type(value).__name__
+    if isinstance(value, (str, bytes)):
+        return f"{name}[{len(value)}]"
+    if isinstance(value, (list, tuple)):
+        return f"{name}[{len(value)}]"
+    return name
+
+
+def params_shape(params, many):
+    if params is None:
+        return ""
+    if many:
+        params = list(params)
+        first = params[0] if params else ()
+        return f"{len(params)} x ({', '.join(_shape(p) for p in first)})"
+    if isinstance(params, dict):
+        return ", ".join(f"{key}: {_shape(value)}" for key, value in params.items())
+    return ", ".join(_shape(p) for p in params)
+
+
+def capture(sql, params, many, duration, view):
+    if getattr(_state, "flushing", False):
+        return
+    _buffer.append(
+        {
+            "captured_at": timezone.now(),
+            "sql": sql[:MAX_SQL_LENGTH],
+            "params_shape": params_shape(params, many)[:255],
+            "duration_ms": duration * 1000,
+            "many": many,
+            "view": (view or "")[:255],
+            # Skip the wrapper itself and this module
+            "frame": (app_frame(3, ignore=IGNORED_FRAMES) or caller_frame(3) or "")[:255],
+        }
+    )
+
+
+def flush_due():
+    return bool(_buffer) and (
+        time.monotonic() - _last_flush >= settings.SLOW_QUERY_FLUSH_INTERVAL
+    )
+
+
+def flush():
+    """Moves everything buffered so far into the SlowQuery table."""
+    global _last_flush
+    from .models import SlowQuery
+
+    with _lock:
+        _last_flush = time.monotonic()
+        items = []
+        while _buffer:
+            items.append(_buffer.popleft())
+    if not items:
+        return 0
+
+    rows = []
+    for item in items:
+        normalized = normalize_sql(item["sql"])
+        rows.append(
+            SlowQuery(
+                fingerprint=fingerprint(normalized),
+                normalized_sql=normalized,
+                **item,
+            )
+        )
+
+    # The flush's own queries must not be captured (or re-flushed)
+    _state.flushing = True
+    try:
+        SlowQuery.objects.bulk_create(rows)
+        cutoff = timezone.now() - datetime.timedelta(days=settings.SLOW_QUERY_RETENTION_DAYS)
+        SlowQuery.objects.filter(captured_at__lt=cutoff).delete()
+    except Exception:
+        logger.exception("Could not store %d slow queries", len(rows))
+    finally:
+        _state.flushing = False
+    return len(rows)
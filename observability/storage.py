@@ -0,0 +1,37 @@
+from cloudinary_storage.storage import MediaCloudinaryStorage
+
+from .tracing import span
+
+
+class TracedStorageMixin:
+    """
+    Wraps the storage calls that go over the network in "storage.*" spans.
+    """
+
+    def _open(self, name, mode="rb"):
+        with span("storage.open", **{"storage.name": name}):
+            return super()._open(name, mode)
+
+    def _save(self, name, content):
+        with span("storage.save", **{"storage.name": name}):
+            return super()._save(name, content)
+
+    def delete(self, name):
+        with span("storage.delete", **{"storage.name": name}):
+            return super().delete(name)
+
+    def exists(self, name):
+        with span("storage.exists", **{"storage.name": name}):
+            return super().exists(name)
+
+    def size(self, name):
+        with span("storage.size", **{"storage.name": name}):
+            return super().size(name)
+
+    def url(self, name, *args, **kwargs):
+        with span("storage.url", **{"storage.name": name}):
+            return super().url(name, *args, **kwargs)
+
+
+class TracedMediaCloudinaryStorage(TracedStorageMixin, MediaCloudinaryStorage):
+    pass
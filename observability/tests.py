@@ -0,0 +1,47 @@
+import copy
+import io
+import json
+import logging
+import logging.config
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from .log import QueuedHandler, current_request_id
+
+
+class LoggingConfigTests(SimpleTestCase):
+    """settings.LOGGING, configured the way Django does at startup."""
+
+    def configure(self, stream):
+        config = copy.deepcopy(settings.LOGGING)
+        config["handlers"]["queue"]["stream"] = stream
+        config["formatters"]["json"] = {"()": "observability.log.JsonFormatter"}
+        config["handlers"]["queue"]["formatter"] = "json"
+        logging.config.dictConfig(config)
+        # Back to the real configuration afterwards
+        self.addCleanup(logging.config.dictConfig, settings.LOGGING)
+        return logging.getLogger("django").handlers[0]
+
+    def test_records_reach_the_stream_as_json(self):
+        stream = io.StringIO()
+        handler = self.configure(stream)
+        self.assertIsInstance(handler, QueuedHandler)
+
+        token = current_request_id.set("req-1")
+        try:
+            logging.getLogger("payment").warning(
+                "Charged %s", "PSK-1", extra={"reference": "PSK-1"}
+            )
+        finally:
+            current_request_id.reset(token)
+        # Stopping the listener writes out whatever is still queued
+        handler.close()
+
+        (line,) = stream.getvalue().splitlines()
+        entry = json.loads(line)
+        self.assertEqual(entry["level"], "WARNING")
+        self.assertEqual(entry["logger"], "payment")
+        self.assertEqual(entry["message"], "Charged PSK-1")
+        self.assertEqual(entry["request_id"], "req-1")
+        self.assertEqual(entry["reference"], "PSK-1")
@@ -0,0 +1,363 @@
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------------------------
+# Request Tracing
+# -------------------------------------------------------------------------
+# Every request gets a trace ID (taken from an incoming W3C "traceparent"
+# header when there is one), so log lines can always be correlated. Spans are
+# only recorded for the TRACING_SAMPLE_RATE fraction of requests; for the rest
+# span() is a no-op apart from a ContextVar read. The sampled flag of an
+# incoming traceparent is ignored: any client can set it, and honouring it
+# would let them have every request traced.
+#
+# Finished traces are handed to a background thread through a bounded queue
+# (dropped, never blocking, when it is full) and exported as:
+#   "jsonl": one span per line in TRACING_FILE, rotated at
+#            TRACING_FILE_MAX_BYTES (TRACING_FILE_BACKUPS old files kept)
+#   "otlp":  OTLP/JSON POSTed to TRACING_OTLP_ENDPOINT (an OpenTelemetry
+#            collector, or `manage.py run_trace_collector` locally)
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "start", "end", "error")
+
+    def __init__(self, trace, name, parent_id, attributes):
+        self.trace = trace
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = time.time_ns()
+        self.end = None
+        self.error = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def finish(self, error=None):
+        self.end = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.trace.spans.append(self)
+
+
+class Trace:
+    __slots__ = ("trace_id", "sampled", "spans")
+
+    def __init__(self, trace_id, sampled):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans = []
+
+
+current_trace = ContextVar("current_trace", default=None)
+current_span = ContextVar("current_span", default=None)
+
+_random = random.Random()
+
+
+def _new_id(size):
+    return f"{_random.getrandbits(size * 8):0{size * 2}x}"
+
+
+def _parse_traceparent(header):
+    """(trace_id, parent_span_id, sampled) from "00-<32 hex>-<16 hex>-<flags>"."""
+    parts = (header or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+def trace_id():
+    trace = current_trace.get()
+    return trace.trace_id if trace else None
+
+
+def span_id():
+    span = current_span.get()
+    return span.span_id if span else None
+
+
+# --- Span API ---
+
+
+def start_span(name, **attributes):
+    """
+    Opens a child of the current span. Returns None when the current trace is
+    not sampled; pass the result to end_span() either way.
+    """
+    trace = current_trace.get()
+    if trace is None or not trace.sampled:
+        return None
+    parent = current_span.get()
+    span = Span(trace, name, parent.span_id if parent else None, attributes)
+    return span, current_span.set(span)
+
+
+def end_span(handle, error=None):
+    if handle is None:
+        return
+    span, token = handle
+    current_span.reset(token)
+    span.finish(error)
+
+
+@contextmanager
+def span(name, **attributes):
+    handle = start_span(name, **attributes)
+    try:
+        yield handle[0] if handle else None
+    except BaseException as exc:
+        end_span(handle, exc)
+        raise
+    else:
+        end_span(handle)
+
+
+def traced(name):
+    """Decorator form of span()."""
+
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def request_trace(name, traceparent=None, **attributes):
+    """
+    Root of a trace. Yields the root span (None if not sampled); the trace is
+    exported when the block exits.
+    """
+    incoming = _parse_traceparent(traceparent)
+    if incoming:
+        trace_id_, parent_id, _ = incoming
+    else:
+        trace_id_, parent_id = _new_id(16), None
+    # Always the local sampler (see the top of this module)
+    rate = settings.TRACING_SAMPLE_RATE
+    sampled = bool(settings.TRACING_EXPORTER) and rate > 0 and _random.random() < rate
+
+    trace = Trace(trace_id_, sampled)
+    trace_token = current_trace.set(trace)
+    root = None
+    span_token = None
+    if sampled:
+        root = Span(trace, name, parent_id, attributes)
+        span_token = current_span.set(root)
+
+    error = None
+    try:
+        yield root
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        if root is not None:
+            current_span.reset(span_token)
+            root.finish(error)
+            _exporter.submit(trace)
+        current_trace.reset(trace_token)
+
+
+# --- Export ---
+
+
+def _span_record(span):
+    return {
+        "trace_id": span.trace.trace_id,
+        "span_id": span.span_id,
+        "parent_span_id": span.parent_id,
+        "name": span.name,
+        "start_time_unix_nano": span.start,
+        "end_time_unix_nano": span.end,
+        "duration_ms": round((span.end - span.start) / 1e6, 3),
+        "attributes": span.attributes,
+        "status": "error" if span.error else "ok",
+        "error": span.error,
+    }
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(span):
+    body = {
+        "traceId": span.trace.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 2 if span.parent_id is None else 1,  # SERVER / INTERNAL
+        "startTimeUnixNano": str(span.start),
+        "endTimeUnixNano": str(span.end),
+        "attributes": [
+            {"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()
+        ],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        body["parentSpanId"] = span.parent_id
+    return body
+
+
+def otlp_payload(traces):
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {
+                            "key": "service.name",
+                            "value": {"stringValue": settings.TRACING_SERVICE_NAME},
+                        }
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "bugaking.observability"},
+                        "spans": [_otlp_span(s) for trace in traces for s in trace.spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+_jsonl_handler = None
+
+
+def _write_jsonl(traces):
+    # One handler per process; handle() takes its lock (flush() may run in
+    # another thread than the exporter)
+    global _jsonl_handler
+    if _jsonl_handler is None:
+        path = settings.TRACING_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _jsonl_handler = RotatingFileHandler(
+            path,
+            maxBytes=settings.TRACING_FILE_MAX_BYTES,
+            backupCount=settings.TRACING_FILE_BACKUPS,
+            encoding="utf-8",
+        )
+        _jsonl_handler.setFormatter(logging.Formatter("%(message)s"))
+    for trace in traces:
+        for s in trace.spans:
+            _jsonl_handler.handle(
+                logging.makeLogRecord({"msg": json.dumps(_span_record(s), default=str)})
+            )
+
+
+def _post_otlp(traces):
+    request = urllib.request.Request(
+        settings.TRACING_OTLP_ENDPOINT,
+        data=json.dumps(otlp_payload(traces), default=str).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        response.read()
+
+
+EXPORTERS = {"jsonl": _write_jsonl, "otlp": _post_otlp}
+
+
+class _Exporter:
+    """Background thread that exports finished traces in batches."""
+
+    BATCH_SIZE = 64
+    FLUSH_SECONDS = 1.0
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=settings.TRACING_QUEUE_SIZE)
+        self.dropped = 0
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, trace):
+        self._ensure_thread()
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-exporter", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.FLUSH_SECONDS
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.export(batch)
+
+    def export(self, batch):
+        exporter = EXPORTERS.get(settings.TRACING_EXPORTER)
+        if exporter is None:
+            return
+        try:
+            exporter(batch)
+        except Exception:
+            logger.warning("Could not export %d traces", len(batch), exc_info=True)
+
+    def flush(self):
+        """Exports whatever is queued, in the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self.export(batch)
+
+
+_exporter = _Exporter()
+
+
+def flush():
+    _exporter.flush()
@@ -0,0 +1,29 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from .access import is_staff_request
+from .metrics import registry
+
+
+def _is_authorized(request):
+    """
+    Staff only: an admin session, a staff JWT, or the scraper token
+    (METRICS_TOKEN) sent as "Authorization: Bearer <token>".
+    """
+    header = request.headers.get("Authorization", "")
+    token = header[7:] if header.startswith("Bearer ") else ""
+    if settings.METRICS_TOKEN and token:
+        if hmac.compare_digest(token, settings.METRICS_TOKEN):
+            return True
+
+    return is_staff_request(request)
+
+
+def metrics_view(request):
+    if not _is_authorized(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
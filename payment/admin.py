@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Transaction
+from core.exports import export_actions
+from .exports import TRANSACTION_COLUMNS
+from django.db.models import Sum
+from .models import MonthlyCollection, Transaction
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
@@ -30,10 +33,16 @@ class TransactionAdmin(admin.ModelAdmin):
         "investment__selected_option__project__name"
     )
 
-    # 4. Read-only fields
+    # 4. Joined into the list query: user_email and project_name read these per row
+    list_select_related = ("user", "investment__selected_option__project")
+
+    # 5. Read-only fields
     readonly_fields = ("timestamp", "location", "user", "investment", "amount", "payment_reference")
 
-    # 5. Organization of the detail page
+    # 6. Streaming CSV/XLSX download of the selected rows
+    actions = export_actions(TRANSACTION_COLUMNS, "transactions")
+
+    # 7. Organization of the detail page
     fieldsets = (
         ("Payment Info", {
             "fields": ("timestamp", "payment_reference", "amount")
@@ -79,4 +88,58 @@ class TransactionAdmin(admin.ModelAdmin):
         return "-"
 
     def has_add_permission(self, request):
-        return False
\ No newline at end of file
+        return False
+
+
+@admin.register(MonthlyCollection)
+class MonthlyCollectionAdmin(admin.ModelAdmin):
+    """Read-only view of the monthly rollups (never touches Transaction)."""
+
+    # 1. Columns shown in the list view
+    list_display = (
+        "month_label",
+        "project",
+        "investment_type",
+        "location",
+        "formatted_amount",
+        "transaction_count",
+        "payer_count",
+        "updated_at",
+    )
+
+    # 2. Filters and drill-down by month
+    list_filter = ("investment_type", "project", "location")
+    date_hierarchy = "month"
+    search_fields = ("project__name", "location")
+    list_select_related = ("project",)
+
+    # --- Helper Methods ---
+
+    @admin.display(description="Month", ordering="month")
+    def month_label(self, obj):
+        return f"{obj.month:%b %Y}"
+
+    @admin.display(description="Collected", ordering="amount_collected")
+    def formatted_amount(self, obj):
+        return f"₦{obj.amount_collected:,.2f}"
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        # Totals for the current filters, shown under the title
+        changelist = getattr(response, "context_data", {}).get("cl")
+        if changelist is not None:
+            totals = changelist.queryset.aggregate(
+                amount=Sum("amount_collected"), transactions=Sum("transaction_count")
+            )
+            response.context_data["subtitle"] = (
+                f"Total collected: ₦{totals['amount'] or 0:,.2f} "
+                f"in {totals['transactions'] or 0:,} transactions"
+            )
+        return response
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
@@ -0,0 +1,19 @@
+from core.exports import Column
+
+# Columns of the transaction CSV/XLSX export (admin action and staff API)
+TRANSACTION_COLUMNS = (
+    Column("Date", "timestamp"),
+    Column("Reference", "payment_reference"),
+    Column("Email", "user.email"),
+    Column("First Name", "user.first_name"),
+    Column("Last Name", "user.last_name"),
+    Column("Project", "investment.selected_option.project.name"),
+    Column("Investment Type", "investment.selected_option.project.investment_type"),
+    Column("Location", "location"),
+    Column("Installment", "installment_number"),
+    Column("Amount (NGN)", "amount"),
+    Column("Investment ID", "investment_id"),
+)
+
+# Every relation the columns above read, joined into the export query
+TRANSACTION_RELATED = ("user", "investment__selected_option__project")
@@ -0,0 +1,35 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payment import rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the monthly collection rollups (amount, transactions, payers "
+        "per month / project / investment type / location) from the Transaction table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Only rebuild months from this one on (YYYY-MM). Default: everything.",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            try:
+                since = datetime.datetime.strptime(options["since"], "%Y-%m").date()
+            except ValueError:
+                raise CommandError("--since must look like YYYY-MM")
+
+        started = time.monotonic()
+        written = rollups.rebuild(since)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {written} rollup row(s) in {time.monotonic() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,132 @@
+import csv
+import json
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payment import reconciliation
+
+REPORT_FIELDS = (
+    "investment_id",
+    "user_id",
+    "status",
+    "kinds",
+    "amount_paid",
+    "schedules_paid",
+    "charged",
+    "paid_installments",
+    "transactions",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconcile Transaction amounts, paid PaymentSchedule amounts and "
+        "ClientInvestment.amount_paid, partition by partition in parallel, "
+        "and report the investments that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Worker processes (default: one per CPU; 1 = run in this process).",
+        )
+        parser.add_argument(
+            "--partition-size",
+            type=int,
+            default=reconciliation.DEFAULT_PARTITION_SIZE,
+            help=f"Investment ids per partition (default: {reconciliation.DEFAULT_PARTITION_SIZE}).",
+        )
+        parser.add_argument(
+            "--kind",
+            action="append",
+            choices=reconciliation.DRIFT_KINDS,
+            help="Only report this kind of drift (repeatable).",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the drift report to this .json or .csv file.",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help='Recalculate investments with "aggregate" drift from their paid schedules. '
+            "Charged/count drift is only reported.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Drift rows printed to the console (default: 20; the file gets all).",
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options["output"]) if options["output"] else None
+        if output and output.suffix not in (".json", ".csv"):
+            raise CommandError("--output must end in .json or .csv")
+        if options["partition_size"] < 1:
+            raise CommandError("--partition-size must be positive")
+        kinds = set(options["kind"] or reconciliation.DRIFT_KINDS)
+
+        # 1. Reconcile every partition, keeping only the drift rows
+        started = time.monotonic()
+        totals = Counter()
+        drift = []
+        partitions = 0
+        for partition_totals, partition_drift in reconciliation.reconcile(
+            partition_size=options["partition_size"], workers=options["workers"]
+        ):
+            partitions += 1
+            totals.update(partition_totals)
+            drift.extend(row for row in partition_drift if kinds.intersection(row["kinds"]))
+        elapsed = time.monotonic() - started
+
+        # 2. Summary
+        self.stdout.write(
+            f"Reconciled {totals['investments']} investment(s) in {partitions} partition(s) "
+            f"in {elapsed:.1f}s"
+        )
+        self.stdout.write(f"  amount_paid total:    {totals['amount_paid']}")
+        self.stdout.write(f"  paid schedules total: {totals['schedules_paid']}")
+        self.stdout.write(f"  transactions total:   {totals['charged']}")
+        for kind in reconciliation.DRIFT_KINDS:
+            count = totals[f"drift_{kind}"]
+            style = self.style.WARNING if count else self.style.SUCCESS
+            self.stdout.write(style(f"  {kind} drift: {count}"))
+
+        for row in drift[: options["limit"]]:
+            self.stdout.write(
+                f"  #{row['investment_id']:<7} {','.join(row['kinds']):<24} "
+                f"amount_paid={row['amount_paid']} schedules={row['schedules_paid']} "
+                f"charged={row['charged']} "
+                f"({row['paid_installments']} paid / {row['transactions']} txn)"
+            )
+        if len(drift) > options["limit"]:
+            self.stdout.write(f"  ... {len(drift) - options['limit']} more")
+
+        # 3. Report file
+        if output:
+            self._write_report(output, drift)
+            self.stdout.write(f"Report written to {output}")
+
+        # 4. Optional fixes (only what the schedules can prove)
+        if options["fix"]:
+            fixable = [row["investment_id"] for row in drift if "aggregate" in row["kinds"]]
+            changed = reconciliation.fix_aggregates(fixable) if fixable else 0
+            self.stdout.write(self.style.SUCCESS(f"Fixed: {changed} investment(s) recalculated."))
+
+    def _write_report(self, path, drift):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump(drift, handle, indent=2, default=str)
+            return
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            for row in drift:
+                writer.writerow({**row, "kinds": ";".join(row["kinds"])})
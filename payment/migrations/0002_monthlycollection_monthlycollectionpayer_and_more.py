@@ -0,0 +1,52 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment', '0008_investmentproject_project_img_sizes'),
+        ('payment', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyCollection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(db_index=True)),
+                ('investment_type', models.CharField(db_index=True, max_length=20)),
+                ('location', models.CharField(max_length=255)),
+                ('amount_collected', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('transaction_count', models.PositiveIntegerField(default=0)),
+                ('payer_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_collections', to='investment.investmentproject')),
+            ],
+            options={
+                'verbose_name': 'Monthly Collection',
+                'verbose_name_plural': 'Monthly Collections',
+                'ordering': ['-month', 'project'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyCollectionPayer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rollup', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payers', to='payment.monthlycollection')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='monthlycollection',
+            constraint=models.UniqueConstraint(fields=('month', 'project', 'investment_type', 'location'), name='unique_monthly_collection'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlycollectionpayer',
+            constraint=models.UniqueConstraint(fields=('rollup', 'user'), name='unique_monthly_collection_payer'),
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.db import models
 
 from account.models import User
-from investment.models import ClientInvestment
+from investment.models import ClientInvestment, InvestmentProject
 from django.utils.timezone import now
 
 
@@ -53,4 +53,63 @@ class Transaction(models.Model):
         if not self.location and self.investment:
             self.location = self.investment.selected_option.project.location
         super().save(*args, **kwargs)
- 
\ No newline at end of file
+
+
+# -------------------------------------------------------------------------
+# Monthly Collection Rollups
+# -------------------------------------------------------------------------
+# Reporting reads these instead of aggregating the Transaction table. They are
+# kept up to date as transactions are inserted (see payment.rollups) and can
+# be recomputed with `manage.py rebuild_collection_rollups`.
+
+
+class MonthlyCollection(models.Model):
+    """
+    Money collected in one month for one (project, investment type, location).
+    """
+
+    # 1. Rollup key (month is the first day of the month, in TIME_ZONE)
+    month = models.DateField(db_index=True)
+    project = models.ForeignKey(
+        InvestmentProject, on_delete=models.CASCADE, related_name="monthly_collections"
+    )
+    investment_type = models.CharField(max_length=20, db_index=True)
+    location = models.CharField(max_length=255)
+
+    # 2. Measures
+    amount_collected = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    transaction_count = models.PositiveIntegerField(default=0)
+    payer_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-month", "project"]
+        verbose_name = "Monthly Collection"
+        verbose_name_plural = "Monthly Collections"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["month", "project", "investment_type", "location"],
+                name="unique_monthly_collection",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.project_id} {self.location}: ₦{self.amount_collected}"
+
+
+class MonthlyCollectionPayer(models.Model):
+    """
+    One row per user who paid into a MonthlyCollection, so payer_count can be
+    maintained incrementally and distinct payers can be counted across rollups.
+    """
+
+    rollup = models.ForeignKey(
+        MonthlyCollection, on_delete=models.CASCADE, related_name="payers"
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["rollup", "user"], name="unique_monthly_collection_payer")
+        ]
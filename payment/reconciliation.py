@@ -0,0 +1,157 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+import django
+from django.db import connections
+from django.db.models import Count, Max, Min, Sum
+
+from investment import services
+from investment.models import ClientInvestment, PaymentSchedule
+from .models import Transaction
+
+# -------------------------------------------------------------------------
+# Payment Reconciliation
+# -------------------------------------------------------------------------
+# Three sources describe how much was paid on an investment:
+#   1. Transaction.amount         what Paystack actually charged
+#   2. PaymentSchedule.amount     installments marked "paid"
+#   3. ClientInvestment.amount_paid   aggregate maintained by the payment signal
+#
+# Investments are split into id ranges; each range is reconciled in a worker
+# process with three GROUP BY queries (one per source) and compared in
+# dicts, so the cost is O(rows) in the database and O(range) in Python.
+#
+# Drift kinds:
+#   "aggregate"  amount_paid != sum of paid schedules (fixable: recalculate)
+#   "charged"    sum of transactions != sum of paid schedules (needs a human)
+#   "count"      paid schedules != number of transactions (missing/duplicate
+#                transaction records; needs a human)
+
+CENTS = Decimal("0.01")
+DRIFT_KINDS = ("aggregate", "charged", "count")
+DEFAULT_PARTITION_SIZE = 5000
+
+
+def _money(value):
+    # SQLite sums decimals as floats
+    return Decimal(value or 0).quantize(CENTS)
+
+
+def partitions(size):
+    """[(first_id, last_id), ...] covering every investment id, `size` ids each."""
+    bounds = ClientInvestment.objects.select_related(None).aggregate(low=Min("pk"), high=Max("pk"))
+    if bounds["low"] is None:
+        return []
+    return [
+        (start, min(start + size - 1, bounds["high"]))
+        for start in range(bounds["low"], bounds["high"] + 1, size)
+    ]
+
+
+def reconcile_range(bounds):
+    """
+    Compares the three sources for investments with id in [low, high].
+    Returns (per-partition totals, [drift rows]).
+    """
+    low, high = bounds
+
+    investments = (
+        ClientInvestment.objects.select_related(None)
+        .filter(pk__gte=low, pk__lte=high)
+        .order_by("pk")
+        .values_list("pk", "user_id", "amount_paid", "status")
+    )
+    schedules = {
+        row["investment_id"]: row
+        for row in PaymentSchedule.objects.filter(
+            investment_id__gte=low, investment_id__lte=high, status="paid"
+        )
+        .order_by()
+        .values("investment_id")
+        .annotate(total=Sum("amount"), count=Count("pk"))
+    }
+    transactions = {
+        row["investment_id"]: row
+        for row in Transaction.objects.filter(investment_id__gte=low, investment_id__lte=high)
+        .order_by()
+        .values("investment_id")
+        .annotate(total=Sum("amount"), count=Count("pk"))
+    }
+
+    totals = Counter()
+    drift = []
+    for pk, user_id, amount_paid, status in investments:
+        scheduled = schedules.get(pk, {})
+        charged = transactions.get(pk, {})
+        paid_total = _money(scheduled.get("total"))
+        charged_total = _money(charged.get("total"))
+        paid_count = scheduled.get("count", 0)
+        charged_count = charged.get("count", 0)
+        recorded = _money(amount_paid)
+
+        totals["investments"] += 1
+        totals["amount_paid"] += recorded
+        totals["schedules_paid"] += paid_total
+        totals["charged"] += charged_total
+
+        kinds = []
+        if recorded != paid_total:
+            kinds.append("aggregate")
+        if charged_total != paid_total:
+            kinds.append("charged")
+        if charged_count != paid_count:
+            kinds.append("count")
+        if not kinds:
+            continue
+
+        for kind in kinds:
+            totals[f"drift_{kind}"] += 1
+        drift.append(
+            {
+                "investment_id": pk,
+                "user_id": user_id,
+                "status": status,
+                "kinds": kinds,
+                "amount_paid": recorded,
+                "schedules_paid": paid_total,
+                "charged": charged_total,
+                "paid_installments": paid_count,
+                "transactions": charged_count,
+            }
+        )
+    return totals, drift
+
+
+def _init_worker():
+    # Forked children must not share the parent's DB connections
+    django.setup()
+    for conn in connections.all(initialized_only=True):
+        conn.close()
+
+
+def reconcile(partition_size=DEFAULT_PARTITION_SIZE, workers=None):
+    """
+    Reconciles every investment. Yields (totals, drift) per partition, in id
+    order. workers=1 runs in-process; None uses one process per CPU.
+    """
+    ranges = partitions(partition_size)
+    if not ranges:
+        return
+    if workers == 1 or len(ranges) == 1:
+        for bounds in ranges:
+            yield reconcile_range(bounds)
+        return
+
+    # Close ours first so the children never inherit an open connection
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        yield from pool.map(reconcile_range, ranges)
+
+
+def fix_aggregates(investment_ids, chunk_size=services.DEFAULT_CHUNK_SIZE):
+    """Repairs "aggregate" drift from the paid schedules (set-based)."""
+    return services.recalculate(
+        ClientInvestment.objects.filter(pk__in=investment_ids), chunk_size=chunk_size
+    )
+
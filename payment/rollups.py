@@ -0,0 +1,131 @@
+import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DateField, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import MonthlyCollection, MonthlyCollectionPayer, Transaction
+
+# -------------------------------------------------------------------------
+# Monthly Collection Rollups
+# -------------------------------------------------------------------------
+# Key: (month, project, investment_type, location). Measures: amount
+# collected, transaction count and distinct payers.
+#
+# record() is called for every inserted Transaction, inside the same database
+# transaction, and touches one rollup row with F() increments (safe under
+# concurrent webhooks). Payers are tracked in MonthlyCollectionPayer: the
+# count only goes up when that (rollup, user) row is new.
+#
+# Deleting or editing transactions is not tracked incrementally;
+# rebuild() recomputes the rollups from the Transaction table.
+
+BATCH_SIZE = 1000
+CENTS = Decimal("0.01")
+
+KEY_FIELDS = ("month", "project_id", "investment_type", "location")
+
+
+def month_of(moment):
+    """First day of the month `moment` falls in (local time, like TruncMonth)."""
+    if timezone.is_aware(moment):
+        moment = timezone.localtime(moment)
+    return moment.date().replace(day=1)
+
+
+def _month_start(month):
+    moment = datetime.datetime(month.year, month.month, 1)
+    return timezone.make_aware(moment) if settings.USE_TZ else moment
+
+
+def record(txn):
+    """Adds one new transaction to its monthly rollup."""
+    project = txn.investment.selected_option.project
+    with transaction.atomic():
+        rollup, _ = MonthlyCollection.objects.get_or_create(
+            month=month_of(txn.timestamp),
+            project=project,
+            investment_type=project.investment_type,
+            location=txn.location,
+        )
+        _, new_payer = MonthlyCollectionPayer.objects.get_or_create(
+            rollup=rollup, user_id=txn.user_id
+        )
+        MonthlyCollection.objects.filter(pk=rollup.pk).update(
+            amount_collected=F("amount_collected") + txn.amount,
+            transaction_count=F("transaction_count") + 1,
+            payer_count=F("payer_count") + int(new_payer),
+            updated_at=timezone.now(),
+        )
+
+
+def _grouped(since):
+    queryset = Transaction.objects.order_by()
+    if since is not None:
+        queryset = queryset.filter(timestamp__gte=since)
+    return queryset.annotate(
+        month=TruncMonth("timestamp", output_field=DateField()),
+        project_id=F("investment__selected_option__project_id"),
+        investment_type=F("investment__selected_option__project__investment_type"),
+    )
+
+
+def rebuild(since=None):
+    """
+    Recomputes the rollups from the Transaction table (only months from
+    `since`, a first-of-month date, when given). Returns the number of rollup
+    rows written.
+    """
+    since_moment = _month_start(since) if since is not None else None
+    with transaction.atomic():
+        stale = MonthlyCollection.objects.all()
+        if since is not None:
+            stale = stale.filter(month__gte=since)
+        stale.delete()
+
+        # 1. One GROUP BY over the transactions for the measures
+        totals = (
+            _grouped(since_moment)
+            .values(*KEY_FIELDS)
+            .annotate(
+                amount=Sum("amount"),
+                transactions=Count("pk"),
+                payers=Count("user", distinct=True),
+            )
+        )
+        rollups = MonthlyCollection.objects.bulk_create(
+            [
+                MonthlyCollection(
+                    month=row["month"],
+                    project_id=row["project_id"],
+                    investment_type=row["investment_type"],
+                    location=row["location"],
+                    # SQLite sums decimals as floats
+                    amount_collected=Decimal(row["amount"]).quantize(CENTS),
+                    transaction_count=row["transactions"],
+                    payer_count=row["payers"],
+                )
+                for row in totals
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        ids = {tuple(getattr(r, field) for field in KEY_FIELDS): r.pk for r in rollups}
+
+        # 2. The distinct payers of each rollup
+        payers = (
+            _grouped(since_moment)
+            .values_list(*KEY_FIELDS, "user_id")
+            .distinct()
+            .iterator(chunk_size=BATCH_SIZE)
+        )
+        batch = []
+        for *key, user_id in payers:
+            batch.append(MonthlyCollectionPayer(rollup_id=ids[tuple(key)], user_id=user_id))
+            if len(batch) >= BATCH_SIZE:
+                MonthlyCollectionPayer.objects.bulk_create(batch)
+                batch = []
+        MonthlyCollectionPayer.objects.bulk_create(batch)
+    return len(rollups)
@@ -1,4 +1,8 @@
 from rest_framework import serializers
+from core.media import MediaURLField
+from core.projections import Projection
+from investment.models import ClientInvestment
+from investment.serializers import ClientInvestmentProjection
 from .models import Transaction
 
 class TransactionSerializer(serializers.ModelSerializer):
@@ -9,8 +13,9 @@ class TransactionSerializer(serializers.ModelSerializer):
     investment_type = serializers.CharField(
         source="investment.selected_option.project.investment_type", read_only=True
     )
-    project_image = serializers.ImageField(
-        source="investment.selected_option.project.project_img", read_only=True
+    project_image = MediaURLField(
+        source="investment.selected_option.project.project_img",
+        sizes_source="investment.selected_option.project.project_img_sizes",
     )
     
     # Format the timestamp for display if you prefer backend formatting, 
@@ -38,4 +43,31 @@ class TransactionSerializer(serializers.ModelSerializer):
         return obj.timestamp.strftime("%b %d, %Y")
 
     def get_formatted_time(self, obj):
-        return obj.timestamp.strftime("%H:%M:%S GMT")
\ No newline at end of file
+        return obj.timestamp.strftime("%H:%M:%S GMT")
+
+
+class TransactionProjection(Projection):
+    """
+    TransactionSerializer output from values() rows (list endpoint).
+    ?expand=investment adds the investment, as in the investment list.
+    """
+
+    serializer_class = TransactionSerializer
+    requires = {
+        "formatted_date": ("timestamp",),
+        "formatted_time": ("timestamp",),
+        "investment": ("investment",),
+    }
+    expandable = ("investment",)
+
+    def get_formatted_date(self, row):
+        return row["timestamp"].strftime("%b %d, %Y")
+
+    def get_formatted_time(self, row):
+        return row["timestamp"].strftime("%H:%M:%S GMT")
+
+    def expand_investment(self, rows):
+        investments = ClientInvestmentProjection(context=self.context).by(
+            ClientInvestment.objects.filter(pk__in={row["investment"] for row in rows}), "pk"
+        )
+        return [investments.get(row["investment"]) for row in rows]
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import data_version
+from . import rollups
+from .models import Transaction
+
+
+# --- SIGNAL 1: KEEP MONTHLY ROLLUPS CURRENT ---
+@receiver(post_save, sender=Transaction)
+def update_monthly_rollup(sender, instance, created, raw=False, **kwargs):
+    # Runs in the inserting transaction, so a rolled-back payment never counts
+    if created and not raw:
+        rollups.record(instance)
+
+
+# --- SIGNAL 2: DATA VERSIONS FOR CONDITIONAL GETS ---
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def bump_transaction_version(sender, instance, **kwargs):
+    data_version.bump(instance.user_id)
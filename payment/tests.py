@@ -1,3 +1,177 @@
-from django.test import TestCase
+import hashlib
+import hmac
+import json
+import os
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from benchmarks import seed
+from core import idempotency
+from core.models import IdempotencyKey
+from investment.models import ClientInvestment, PaymentSchedule
+from investment.serializers import ClientInvestmentSerializer
+from investment.services import recalculate
+from investment.tests import LOCAL_STORAGES, ProjectionTestCase, seed_rows
+from .models import Transaction
+from .serializers import TransactionProjection, TransactionSerializer
+from .views import WEBHOOK_SCOPE
+
+
+@override_settings(STORAGES=LOCAL_STORAGES, MEDIA_URL="/media/")
+class TransactionProjectionTests(ProjectionTestCase):
+    """TransactionProjection against TransactionSerializer (see investment.tests)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_rows()
+
+    def transactions(self):
+        return Transaction.objects.select_related(
+            "investment__selected_option__project"
+        ).order_by("pk")
+
+    def test_matches_serializer(self):
+        self.assertMatchesSerializer(TransactionProjection, TransactionSerializer, self.transactions())
+
+    def test_edge_cases_are_covered(self):
+        data = TransactionProjection(context=self.context).data(self.transactions())
+        self.assertIn(None, [row["payment_reference"] for row in data])
+        self.assertIn(None, [row["installment_number"] for row in data])
+        self.assertIn(None, [row["project_image"] for row in data])
+
+    def test_expand_investment(self):
+        transactions = list(self.transactions())
+        for fields in (None, ["id"], ["amount", "project_name"]):
+            with self.subTest(fields=fields):
+                expected = []
+                for transaction, row in zip(
+                    transactions,
+                    TransactionSerializer(transactions, many=True, context=self.context).data,
+                ):
+                    row = {name: value for name, value in row.items() if not fields or name in fields}
+                    row["investment"] = ClientInvestmentSerializer(
+                        transaction.investment, context=self.context
+                    ).data
+                    expected.append(row)
+                actual = TransactionProjection(
+                    context=self.context, fields=fields, expand=["investment"]
+                ).data(self.transactions())
+                self.assertSameOutput(expected, actual)
+
+    def test_unknown_names_are_rejected(self):
+        for fields, expand in ((["investment"], None), (None, ["user"])):
+            with self.subTest(fields=fields, expand=expand), self.assertRaises(ValidationError):
+                TransactionProjection(context=self.context, fields=fields, expand=expand)
+
+    def test_list_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(Transaction.objects.order_by("pk").first().user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/api/transactions/", {"fields": "id,amount"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()[0]), ["id", "amount"])
+        self.assertFalse(any("JOIN" in query["sql"] for query in queries.captured_queries))
+
+        response = client.get("/api/transactions/", {"fields": "id", "expand": "investment"})
+        self.assertEqual(list(response.json()[0]), ["id", "investment"])
+        self.assertEqual(client.get("/api/transactions/", {"expand": "user"}).status_code, 400)
+
+
+WEBHOOK_SECRET = "test-paystack-secret"
+
+
+@override_settings(STORAGES=LOCAL_STORAGES)
+@mock.patch.dict(os.environ, {"PAYSTACK_SECRET_KEY": WEBHOOK_SECRET})
+class PaystackWebhookTests(TestCase):
+    """charge.success deliveries are processed once per Paystack reference."""
+
+    path = "/api/webhooks/paystack/"
+
+    @classmethod
+    def setUpTestData(cls):
+        seed.seed(
+            users=1, projects=1, investments_per_user=3, notifications_per_user=0, documents_per_user=0
+        )
+        # An investment with at least two installments, none of them paid yet
+        cls.investment = (
+            ClientInvestment.objects.annotate(installments=Count("schedules"))
+            .filter(installments__gte=2)
+            .order_by("pk")
+            .first()
+        )
+        Transaction.objects.filter(investment=cls.investment).delete()
+        PaymentSchedule.objects.filter(investment=cls.investment).update(status="upcoming", date_paid=None)
+        recalculate(ClientInvestment.objects.filter(pk=cls.investment.pk))
+
+    def deliver(self, reference):
+        payload = json.dumps(
+            {
+                "event": "charge.success",
+                "data": {
+                    "reference": reference,
+                    "amount": 10_000_000,
+                    "metadata": {"investment_id": self.investment.pk},
+                    "customer": {"email": self.investment.user.email},
+                },
+            }
+        ).encode()
+        signature = hmac.new(WEBHOOK_SECRET.encode(), payload, hashlib.sha512).hexdigest()
+        return self.client.post(
+            self.path,
+            payload,
+            content_type="application/json",
+            HTTP_X_PAYSTACK_SIGNATURE=signature,
+        )
+
+    def paid(self):
+        return PaymentSchedule.objects.filter(investment=self.investment, status="paid").count()
+
+    def test_resent_event_pays_one_installment(self):
+        paid = self.paid()
+        for _ in range(3):
+            self.assertEqual(self.deliver("PSK-1").status_code, 200)
+
+        self.assertEqual(self.paid(), paid + 1)
+        self.assertEqual(Transaction.objects.filter(payment_reference="PSK-1").count(), 1)
+        record = IdempotencyKey.objects.get(scope=WEBHOOK_SCOPE, key="PSK-1")
+        self.assertEqual(record.response_body, {"outcome": "processed"})
+
+    def test_new_reference_pays_the_next_installment(self):
+        paid = self.paid()
+        self.deliver("PSK-1")
+        self.deliver("PSK-2")
+        self.assertEqual(self.paid(), paid + 2)
+
+    def test_delivery_in_progress_gets_409(self):
+        # The first delivery of PSK-1 holds the claim and hasn't finished
+        idempotency.begin(WEBHOOK_SCOPE, "PSK-1")
+        paid = self.paid()
+        self.assertEqual(self.deliver("PSK-1").status_code, 409)
+        self.assertEqual(self.paid(), paid)
+
+    def test_failed_event_releases_its_claim(self):
+        paid = self.paid()
+        with mock.patch.object(Transaction.objects, "create", side_effect=RuntimeError("db down")):
+            self.assertEqual(self.deliver("PSK-1").status_code, 200)
+        # Rolled back, and the reference is free for Paystack's retry
+        self.assertEqual(self.paid(), paid)
+        self.assertFalse(IdempotencyKey.objects.filter(scope=WEBHOOK_SCOPE, key="PSK-1").exists())
+
+        self.assertEqual(self.deliver("PSK-1").status_code, 200)
+        self.assertEqual(self.paid(), paid + 1)
+        self.assertEqual(Transaction.objects.filter(payment_reference="PSK-1").count(), 1)
+
+    def test_bad_signature_is_rejected(self):
+        paid = self.paid()
+        response = self.client.post(
+            self.path, b"{}", content_type="application/json", HTTP_X_PAYSTACK_SIGNATURE="0" * 128
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.paid(), paid)
@@ -1,6 +1,6 @@
 from django.urls import path
 from . import views
-from .views import TransactionListView, TransactionStatsView
+from .views import CollectionSummaryView, TransactionExportView, TransactionListView, TransactionStatsView
 
 # urls.py
 urlpatterns = [
@@ -9,4 +9,14 @@ urlpatterns = [
     path(
         "transactions/stats/", TransactionStatsView.as_view(), name="transaction-stats"
     ),
+    path(
+        "reports/collections/",
+        CollectionSummaryView.as_view(),
+        name="collection-summary",
+    ),
+    path(
+        "exports/transactions.<str:fmt>",
+        TransactionExportView.as_view(),
+        name="transaction-export",
+    ),
 ]
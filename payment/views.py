@@ -1,20 +1,34 @@
+import datetime
 import json
 import hmac
 import hashlib
+import logging
 from decimal import Decimal 
 from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils.timezone import now
-from .models import ClientInvestment, Transaction
+from .models import ClientInvestment, MonthlyCollection, MonthlyCollectionPayer, Transaction
 from core.settings import get_env_variable
+from observability.metrics import webhook_outcome
+from observability.tracing import span
 from rest_framework import generics, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Sum
+from django.db.models import Count, Sum
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
-from .serializers import TransactionSerializer
+from .serializers import TransactionProjection, TransactionSerializer
+from .exports import TRANSACTION_COLUMNS, TRANSACTION_RELATED
+from core import idempotency
+from core.exports import StaffExportView
+from core.projections import ProjectedListMixin
+
+logger = logging.getLogger(__name__)
+
+# Webhook events are deduplicated by their Paystack reference
+WEBHOOK_SCOPE = "paystack:charge.success"
 
 
 
@@ -27,27 +41,60 @@ def paystack_webhook(request):
     if not sig_header: 
         return HttpResponse(status=400)
 
-    secret = get_env_variable("PAYSTACK_SECRET_KEY", "fallback-secret")
-    hash_obj = hmac.new(secret.encode('utf-8'), payload, hashlib.sha512)
-    
-    if hash_obj.hexdigest() != sig_header:
+    with span("webhook.verify_signature"):
+        secret = get_env_variable("PAYSTACK_SECRET_KEY", "fallback-secret")
+        hash_obj = hmac.new(secret.encode('utf-8'), payload, hashlib.sha512)
+        valid = hash_obj.hexdigest() == sig_header
+
+    if not valid:
         return HttpResponse(status=400)
 
     event = json.loads(payload)
 
     if event['event'] == 'charge.success':
-        data = event['data']
-        reference = data['reference']
-        
-        # Paystack sends amount in Kobo. Convert to Decimal.
-        amount_paid = Decimal(data['amount']) / Decimal(100)
-        
-        metadata = data.get('metadata', {})
-        investment_id = metadata.get('investment_id')
-        
+        reference = event['data']['reference']
+
+        # Paystack re-sends events it isn't sure we received: the reference is
+        # claimed before anything is paid, so a repeat is one lookup
         try:
-            with transaction.atomic():
-                # 1. Fetch Investment
+            record, replay = idempotency.begin(WEBHOOK_SCOPE, reference)
+        except idempotency.InProgress:
+            # The first delivery is still being processed; ask for a retry later
+            return HttpResponse(status=409)
+        if replay:
+            webhook_outcome("duplicate")
+            logger.info("Duplicate Paystack webhook ignored", extra={"reference": reference})
+            return HttpResponse(status=200)
+
+        outcome = record_charge(event)
+        if outcome == "failed":
+            # Let a re-sent event try again
+            idempotency.abandon(record)
+        else:
+            idempotency.finish(record, 200, {"outcome": outcome})
+
+    return HttpResponse(status=200)
+
+
+def record_charge(event):
+    """
+    Pays the next open installment for a charge.success event and records
+    the Transaction. Returns the outcome counted in webhook_events_total.
+    """
+    data = event['data']
+    reference = data['reference']
+
+    # Paystack sends amount in Kobo. Convert to Decimal.
+    amount_paid = Decimal(data['amount']) / Decimal(100)
+
+    metadata = data.get('metadata', {})
+    investment_id = metadata.get('investment_id')
+
+    outcome = "unmatched"
+    try:
+        with transaction.atomic():
+            # 1. Fetch Investment
+            with span("webhook.lookup_investment", **{"webhook.reference": reference}):
                 if investment_id:
                     investment = ClientInvestment.objects.select_related(
                         'user', 'selected_option__project'
@@ -58,24 +105,31 @@ def paystack_webhook(request):
                         user__email=customer_email, 
                         status__in=["pending", "paying"]
                     ).first()
-                
-                if not investment:
-                    return HttpResponse(status=200)
-
-                # 2. Find the schedule to pay
-                next_schedule = investment.schedules.filter(
-                    status__in=["upcoming", "pending", "overdue"]
-                ).order_by("installment_number").first()
-                
-                if next_schedule:
-                    # 3. Mark Schedule as Paid
-                    # We ONLY update the schedule here. The signal will catch this save()
-                    # and automatically update the parent Investment's totals.
+
+            if not investment:
+                logger.warning(
+                    "Paystack webhook matched no open investment",
+                    extra={"reference": reference},
+                )
+                webhook_outcome(outcome)
+                return outcome
+
+            # 2. Find the schedule to pay
+            next_schedule = investment.schedules.filter(
+                status__in=["upcoming", "pending", "overdue"]
+            ).order_by("installment_number").first()
+
+            if next_schedule:
+                # 3. Mark Schedule as Paid
+                # We ONLY update the schedule here. The signal will catch this save()
+                # and automatically update the parent Investment's totals.
+                with span("webhook.pay_schedule", **{"schedule.id": next_schedule.pk}):
                     next_schedule.status = "paid"
                     next_schedule.date_paid = now().date()
                     next_schedule.save() 
-                    
-                    # 4. Record Transaction History
+
+                # 4. Record Transaction History
+                with span("webhook.record_transaction"):
                     Transaction.objects.create(
                         user=investment.user,
                         investment=investment,
@@ -84,22 +138,48 @@ def paystack_webhook(request):
                         location=investment.selected_option.project.location,
                         payment_reference=reference
                     )
-                    
-        except Exception as e:
-            print(f"Error processing webhook: {e}")
+                outcome = "processed"
+            # else: nothing left to pay on this investment
 
-    return HttpResponse(status=200)
+    except ClientInvestment.DoesNotExist:
+        logger.warning(
+            "Paystack webhook for unknown investment",
+            extra={"reference": reference, "investment_id": investment_id},
+        )
+    except IntegrityError:
+        # payment_reference is unique: an event recorded before its key was
+        # (e.g. older than IDEMPOTENCY_KEY_TTL) rolls back here
+        outcome = "duplicate"
+        logger.info(
+            "Duplicate Paystack webhook ignored",
+            extra={"reference": reference, "investment_id": investment_id},
+        )
+    except Exception:
+        outcome = "failed"
+        logger.exception(
+            "Error processing Paystack webhook",
+            extra={
+                "event": event["event"],
+                "reference": reference,
+                "investment_id": investment_id,
+            },
+        )
+
+    webhook_outcome(outcome)
+    return outcome
 
 
 
 
 
-class TransactionListView(generics.ListAPIView):
+class TransactionListView(ProjectedListMixin, generics.ListAPIView):
     """
     Returns a paginated list of transactions for the logged-in user.
     Supports search and filtering.
     """
     serializer_class = TransactionSerializer
+    # Optimization: rows are read with values() (see TransactionProjection)
+    projection_class = TransactionProjection
     permission_classes = [permissions.IsAuthenticated]
     
     # Enable Search and Filtering
@@ -122,10 +202,8 @@ class TransactionListView(generics.ListAPIView):
 
     def get_queryset(self):
         # Only show transactions belonging to the logged-in user
-        return Transaction.objects.filter(user=self.request.user).select_related(
-            'investment', 
-            'investment__selected_option__project'
-        )
+        # (the projection joins the project columns it needs)
+        return Transaction.objects.filter(user=self.request.user)
 
 class TransactionStatsView(APIView):
     """
@@ -147,4 +225,102 @@ class TransactionStatsView(APIView):
         return Response({
             "total_invested": total_invested,
             "currency": "NGN"
-        })
\ No newline at end of file
+        })
+
+
+class CollectionSummaryView(APIView):
+    """
+    Staff only: money collected, transaction count and distinct payers,
+    read from the monthly rollups (never the Transaction table).
+
+    ?group_by= any of month, project, investment_type, location (comma
+    separated, default "month"); ?from= / ?to= (YYYY-MM) limit the months;
+    ?project=, ?investment_type=, ?location= filter.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    DIMENSIONS = {
+        "month": "month",
+        "project": "project_id",
+        "investment_type": "investment_type",
+        "location": "location",
+    }
+
+    def _month(self, param):
+        value = self.request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            return datetime.datetime.strptime(value, "%Y-%m").date()
+        except ValueError:
+            raise ValidationError({param: "Use YYYY-MM."})
+
+    def _project(self):
+        value = self.request.query_params.get("project")
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({"project": "Use a project id."})
+
+    def get(self, request):
+        params = request.query_params
+        group_by = [name for name in params.get("group_by", "month").split(",") if name] or ["month"]
+        unknown = set(group_by) - set(self.DIMENSIONS)
+        if unknown:
+            raise ValidationError({"group_by": f"Unknown: {', '.join(sorted(unknown))}"})
+        fields = [self.DIMENSIONS[name] for name in group_by]
+
+        # 1. Filter the rollup rows
+        rollups = MonthlyCollection.objects.all()
+        start, end = self._month("from"), self._month("to")
+        if start:
+            rollups = rollups.filter(month__gte=start)
+        if end:
+            rollups = rollups.filter(month__lte=end)
+        project = self._project()
+        if project is not None:
+            rollups = rollups.filter(project_id=project)
+        for param in ("investment_type", "location"):
+            if params.get(param):
+                rollups = rollups.filter(**{self.DIMENSIONS[param]: params[param]})
+
+        # 2. Sum the measures per group. Payers are counted distinct across the
+        # grouped rollups (a user paying in two months is one payer per quarter)
+        rows = list(
+            rollups.order_by(*fields)
+            .values(*fields)
+            .annotate(
+                amount_collected=Sum("amount_collected"),
+                transaction_count=Sum("transaction_count"),
+            )
+        )
+        payer_fields = {f"rollup__{field}": field for field in fields}
+        payers = {
+            tuple(row[key] for key in payer_fields): row["payers"]
+            for row in MonthlyCollectionPayer.objects.filter(rollup__in=rollups)
+            .order_by()
+            .values(*payer_fields)
+            .annotate(payers=Count("user", distinct=True))
+        }
+        for row in rows:
+            row["payer_count"] = payers.get(tuple(row[field] for field in fields), 0)
+            row["amount_collected"] = Decimal(row["amount_collected"]).quantize(Decimal("0.01"))
+            if "project_id" in row:
+                row["project"] = row.pop("project_id")
+
+        return Response({"group_by": group_by, "currency": "NGN", "results": rows})
+
+
+class TransactionExportView(StaffExportView):
+    """
+    Staff only: streams every transaction as CSV or XLSX.
+    ?from= / ?to= (YYYY-MM-DD) limit the payment date range.
+    """
+    columns = TRANSACTION_COLUMNS
+    basename = "transactions"
+    date_lookup = "timestamp__date"
+
+    def get_queryset(self):
+        return Transaction.objects.select_related(*TRANSACTION_RELATED).order_by("timestamp", "pk")